@@ -0,0 +1,161 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Benchmarks of the header-only archive scan against opening each file, and 
+of the archive index.
+
+Run with ``python benchmarks/bench_archive.py``.
+"""
+import gzip
+import os
+import shutil
+import warnings
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+from astropy.coordinates import SkyCoord
+from astropy.io.fits.verify import VerifyWarning
+
+from gdt.missions.swift.bat.archive import ArchiveIndex, scan_headers
+from gdt.missions.swift.poshist import SwiftSao
+from synthetic import write_sao
+
+warnings.simplefilter('ignore', VerifyWarning)
+
+_keywords = ('OBS_ID', 'TSTART', 'TSTOP', 'TRIGTIME', 'RA_OBJ', 'DEC_OBJ', 
+             'PA_PNT')
+
+
+def write_archive(tmp_dir, num_files=200, num_rows=20000):
+    paths = []
+    for i in range(num_files):
+        path = write_sao(Path(tmp_dir) / 'sw{:011d}sao.fits'.format(i), 
+                         tstart=612353536.6006 + i * num_rows, 
+                         num_rows=num_rows)
+        with open(path, 'rb') as fin, gzip.open(str(path) + '.gz', 'wb',
+                                                compresslevel=1) as fout:
+            shutil.copyfileobj(fin, fout)
+        os.remove(path)
+        paths.append(str(path) + '.gz')
+    return paths
+
+
+def bench_scan(paths):
+    t0 = perf_counter()
+    for path in paths:
+        with SwiftSao.open(path) as sao:
+            values = [sao.headers['PRIMARY'][key] for key in _keywords]
+    t_open = perf_counter() - t0
+    
+    t0 = perf_counter()
+    scan_headers(paths, keywords=_keywords, processes=1)
+    t_serial = perf_counter() - t0
+    
+    t0 = perf_counter()
+    scan_headers(paths, keywords=_keywords)
+    t_pool = perf_counter() - t0
+
+    print('PRIMARY keywords of {} gzipped SAO files:'.format(len(paths)))
+    print('  SwiftSao.open              : {:8.1f} files/s'.format(
+          len(paths) / t_open))
+    print('  scan_headers, 1 process    : {:8.1f} files/s  ({:.0f}x)'.format(
+          len(paths) / t_serial, t_open / t_serial))
+    print('  scan_headers, {:2d} processes: {:8.1f} files/s  ({:.0f}x)'.format(
+          os.cpu_count(), len(paths) / t_pool, t_open / t_pool))
+
+
+def bench_index(tmp_dir, paths, num_records=100000):
+    index = ArchiveIndex.open(Path(tmp_dir) / 'index.db')
+    t0 = perf_counter()
+    index.update(paths)
+    t_first = perf_counter() - t0
+    t0 = perf_counter()
+    index.update(paths)
+    t_second = perf_counter() - t0
+    print('ArchiveIndex.update of {} files:'.format(len(paths)))
+    print('  first update           : {:8.3f} s'.format(t_first))
+    print('  unchanged files        : {:8.3f} s'.format(t_second))
+    
+    # synthetic records of 1-day lightcurves pointed all over the sky
+    rng = np.random.default_rng(0)
+    tstart = rng.uniform(1.0e8, 7.0e8, num_records)
+    ra = rng.uniform(0.0, 360.0, num_records)
+    dec = np.rad2deg(np.arcsin(rng.uniform(-1.0, 1.0, num_records)))
+    with index._conn:
+        for i in range(num_records):
+            row = ('lc{:06d}.lc'.format(i), 'lightcurve', '', tstart[i], 
+                   tstart[i] + 86400.0, None, None, None, ra[i], dec[i], 0.0)
+            index._replace(row, (0, 0))
+    
+    def query():
+        return index.query(tstart=4.0e8, tstop=4.1e8, ra=120.0, dec=-30.0,
+                           radius=30.0, filetype='lightcurve')
+    
+    def glob_and_filter():
+        # the exact conditions over every record, without the R-tree
+        rows = index._conn.execute(
+            'SELECT tstart, tstop, ra_pnt, dec_pnt FROM files').fetchall()
+        rows = np.array(rows, dtype=float)
+        center = SkyCoord(120.0, -30.0, unit='deg')
+        sep = center.separation(SkyCoord(rows[:, 2], rows[:, 3], unit='deg'))
+        return (rows[:, 0] <= 4.1e8) & (rows[:, 1] >= 4.0e8) & \
+               (sep.deg <= 30.0)
+
+    t0 = perf_counter()
+    for i in range(10):
+        num = len(query())
+    t_query = (perf_counter() - t0) / 10
+    t0 = perf_counter()
+    num_all = glob_and_filter().sum()
+    t_all = perf_counter() - t0
+    print('time range + pointing query over {} records ({} found):'.format(
+          index.num_files, num))
+    print('  filter every record    : {:8.1f} ms'.format(t_all * 1000.0))
+    print('  ArchiveIndex.query     : {:8.1f} ms'.format(t_query * 1000.0))
+    index.close()
+
+
+if __name__ == '__main__':
+    with TemporaryDirectory() as tmp_dir:
+        paths = write_archive(tmp_dir)
+        bench_scan(paths)
+        bench_index(tmp_dir, paths)
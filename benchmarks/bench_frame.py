@@ -0,0 +1,145 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Benchmarks for Swift frame coordinate transforms.
+
+Run with ``python benchmarks/bench_frame.py``.
+"""
+from timeit import repeat
+
+import numpy as np
+from astropy.coordinates import SkyCoord
+
+from gdt.core.coords import Quaternion
+from gdt.core.coords import SpacecraftFrame
+from gdt.missions.swift.frame import SwiftFrame, radec_to_azel
+
+
+def _random_quaternions(num, seed=0):
+    quat = np.random.default_rng(seed).normal(size=(num, 4))
+    return quat / np.linalg.norm(quat, axis=1, keepdims=True)
+
+
+def bench_radec_to_azel(num_quats=100, num_srcs=1000, number=3):
+    quats = _random_quaternions(num_quats)
+    ra = np.random.default_rng(1).uniform(0.0, 360.0, num_srcs)
+    dec = np.rad2deg(np.arcsin(np.random.default_rng(2).uniform(-1.0, 1.0, 
+                                                                num_srcs)))
+    coord = SkyCoord(ra, dec, unit='deg')
+    
+    def per_frame():
+        for quat in quats:
+            coord.transform_to(SwiftFrame(quaternion=Quaternion(quat)))
+    
+    def batch():
+        radec_to_azel(ra, dec, quats)
+
+    t_graph = min(repeat(per_frame, number=number, repeat=3)) / number
+    t_batch = min(repeat(batch, number=number, repeat=3)) / number
+    print('radec_to_azel ({} attitudes x {} sources):'.format(num_quats, 
+                                                              num_srcs))
+    print('  SkyCoord.transform_to : {:10.3f} ms'.format(1e3 * t_graph))
+    print('  radec_to_azel         : {:10.3f} ms  ({:.0f}x)'.format(
+          1e3 * t_batch, t_graph / t_batch))
+
+
+def bench_repeated_transform(num_quats=10000, num_calls=20, number=3):
+    # one position for each attitude sample, e.g. a source tracked over an
+    # observation, transformed repeatedly with the same frame
+    quats = _random_quaternions(num_quats)
+    frame = SwiftFrame(quaternion=Quaternion(quats))
+    sc_frame = SpacecraftFrame(quaternion=Quaternion(quats))
+    coords = [SkyCoord(10.0 * i, 5.0, unit='deg') for i in range(num_calls)]
+
+    def generic():
+        # the generic spacecraft frame builds a scipy Rotation from the 
+        # quaternions on every call
+        for coord in coords:
+            coord.transform_to(sc_frame)
+    
+    def swift():
+        # the Swift frame applies the rotation matrices directly
+        for coord in coords:
+            coord.transform_to(frame)
+    
+    swift()
+    t_generic = min(repeat(generic, number=number, repeat=3)) / number
+    t_swift = min(repeat(swift, number=number, repeat=3)) / number
+    print('{} transform_to calls with {} attitudes:'.format(num_calls, 
+                                                           num_quats))
+    print('  SpacecraftFrame   : {:10.3f} ms'.format(1e3 * t_generic))
+    print('  SwiftFrame        : {:10.3f} ms  ({:.1f}x)'.format(
+          1e3 * t_swift, t_generic / t_swift))
+
+
+def bench_cached_matrices(num_quats=10000, num_calls=20, number=3):
+    # the same frame is reused for several sources, e.g. the track of each 
+    # source in a catalog over an observation, so only the first call 
+    # computes the matrices
+    quats = _random_quaternions(num_quats)
+    frame = SwiftFrame(quaternion=Quaternion(quats))
+    rng = np.random.default_rng(1)
+    radecs = [(rng.uniform(0.0, 360.0), rng.uniform(-90.0, 90.0))
+              for i in range(num_calls)]
+    
+    def uncached():
+        # a new frame for each call, so the matrices are recomputed
+        for ra, dec in radecs:
+            radec_to_azel(ra, dec, 
+                          SwiftFrame(quaternion=Quaternion(quats)))
+    
+    def cached():
+        for ra, dec in radecs:
+            radec_to_azel(ra, dec, frame)
+    
+    cached()
+    t_uncached = min(repeat(uncached, number=number, repeat=3)) / number
+    t_cached = min(repeat(cached, number=number, repeat=3)) / number
+    print('{} radec_to_azel calls with {} attitudes:'.format(num_calls, 
+                                                             num_quats))
+    print('  new frame per call : {:10.3f} ms'.format(1e3 * t_uncached))
+    print('  same frame         : {:10.3f} ms  ({:.1f}x)'.format(
+          1e3 * t_cached, t_uncached / t_cached))
+
+
+if __name__ == '__main__':
+    bench_radec_to_azel()
+    bench_repeated_transform()
+    bench_cached_matrices()
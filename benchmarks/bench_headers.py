@@ -0,0 +1,156 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Benchmarks for building BAT headers.
+
+Run with ``python benchmarks/bench_headers.py``.
+"""
+from timeit import repeat
+
+import numpy as np
+
+from gdt.core.headers import Header, FileHeaders
+from gdt.missions.swift.bat.headers import PhaHeaders
+from gdt.missions.swift.time import Time
+
+
+def _setitem_time(hdr, key, val):
+    # the previous BatHeader.__setitem__: a Time object for TSTART/TSTOP
+    if key == 'TSTART':
+        Header.__setitem__(hdr, 'DATE-OBS', Time(val, format='swift').iso)
+    elif key == 'TSTOP':
+        Header.__setitem__(hdr, 'DATE-END', Time(val, format='swift').iso)
+    Header.__setitem__(hdr, key, val)
+
+
+def _set_times_time(headers, tstart, tstop):
+    # the previous behavior: a Time object per assignment
+    for hdr in headers:
+        Header.__setitem__(hdr, 'DATE-OBS', Time(tstart, format='swift').iso)
+        Header.__setitem__(hdr, 'TSTART', tstart)
+        Header.__setitem__(hdr, 'DATE-END', Time(tstop, format='swift').iso)
+        Header.__setitem__(hdr, 'TSTOP', tstop)
+
+
+def _set_times(headers, tstart, tstop):
+    for hdr in headers:
+        hdr['TSTART'] = tstart
+        hdr['TSTOP'] = tstop
+
+
+def bench_time_assignment(num_files=500):
+    tstart = 612353536.6006 + 10.0 * np.arange(num_files)
+    headers = PhaHeaders()
+
+    def with_time():
+        for t in tstart:
+            _set_times_time(headers, t, t + 10.0)
+
+    def fast():
+        for t in tstart:
+            _set_times(headers, t, t + 10.0)
+
+    t_time = min(repeat(with_time, number=1, repeat=3))
+    t_fast = min(repeat(fast, number=1, repeat=3))
+    print('TSTART/TSTOP assignment, {} files x 4 headers:'.format(num_files))
+    print('  Time(...).iso  : {:10.1f} files/s'.format(num_files / t_time))
+    print('  met_to_iso     : {:10.1f} files/s  ({:.1f}x)'.format(
+          num_files / t_fast, t_time / t_fast))
+
+
+def _new_headers_deepcopy(cls):
+    # the previous behavior: deep copy the templates
+    obj = cls.__new__(cls)
+    FileHeaders.__init__(obj)
+    return obj
+
+
+def bench_construction(num_files=500):
+    tstart = 612353536.6006 + 10.0 * np.arange(num_files)
+    
+    def with_deepcopy():
+        for t in tstart:
+            headers = _new_headers_deepcopy(PhaHeaders)
+            hdrs = [headers[i] for i in range(headers.num_headers)]
+            _set_times_time(hdrs, t, t + 10.0)
+            for hdr in hdrs[:2]:
+                Header.__setitem__(hdr, 'TRIGTIME', t)
+            Header.__setitem__(hdrs[1], 'EXPOSURE', 10.0)
+
+    def fast():
+        for t in tstart:
+            headers = PhaHeaders()
+            hdrs = [headers[i] for i in range(headers.num_headers)]
+            _set_times(hdrs, t, t + 10.0)
+            for hdr in hdrs[:2]:
+                hdr['TRIGTIME'] = t
+            hdrs[1]['EXPOSURE'] = 10.0
+
+    headers = PhaHeaders()
+    hdrs = [headers[i] for i in range(headers.num_headers)]
+    
+    def copy_deepcopy():
+        obj = _new_headers_deepcopy(PhaHeaders)
+        for i in range(obj.num_headers):
+            for key in obj[i].keys():
+                _setitem_time(obj[i], key, hdrs[i][key])
+    
+    def copy_fast():
+        PhaHeaders.from_headers(hdrs)
+
+    t_old = min(repeat(with_deepcopy, number=1, repeat=3))
+    t_new = min(repeat(fast, number=1, repeat=3))
+    print('PhaHeaders() + dynamic cards, {} files:'.format(num_files))
+    print('  deepcopy       : {:10.1f} files/s'.format(num_files / t_old))
+    print('  clone          : {:10.1f} files/s  ({:.1f}x)'.format(
+          num_files / t_new, t_old / t_new))
+    
+    num = num_files // 5
+    t_old = min(repeat(copy_deepcopy, number=num, repeat=3))
+    t_new = min(repeat(copy_fast, number=num, repeat=3))
+    print('PhaHeaders.from_headers, {} files:'.format(num))
+    print('  deepcopy       : {:10.1f} files/s'.format(num / t_old))
+    print('  clone          : {:10.1f} files/s  ({:.1f}x)'.format(
+          num / t_new, t_old / t_new))
+
+
+if __name__ == '__main__':
+    bench_time_assignment()
+    bench_construction()
@@ -0,0 +1,95 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Benchmark of opening many BAT PHA and SAO files in parallel.
+
+Run with ``python benchmarks/bench_parallel.py [num_files] [workers]``.
+"""
+import os
+import sys
+import warnings
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from astropy.io.fits.verify import VerifyWarning
+
+from gdt.missions.swift.bat.pha import BatPha
+from gdt.missions.swift.parallel import open_many
+from gdt.missions.swift.poshist import SwiftSao
+from synthetic import write_pha, write_sao
+
+warnings.simplefilter('ignore', VerifyWarning)
+
+
+def bench_open(cls, paths, workers, **kwargs):
+    t0 = perf_counter()
+    objs = [cls.open(path, **kwargs) for path in paths]
+    t_loop = perf_counter() - t0
+    del objs
+
+    print('{}.open of {} files, {} workers:'.format(cls.__name__, len(paths),
+                                                     workers))
+    print('  loop                   : {:8.1f} files/s'.format(
+          len(paths) / t_loop))
+    for executor in ('thread', 'process'):
+        t0 = perf_counter()
+        objs = open_many(cls, paths, workers=workers, executor=executor, 
+                         **kwargs)
+        t = perf_counter() - t0
+        assert all(obj is not None for obj in objs)
+        del objs
+        print('  {:23s}: {:8.1f} files/s  ({:.2f}x)'.format(
+              'open_many({!r})'.format(executor), len(paths) / t, t_loop / t))
+
+
+if __name__ == '__main__':
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    with TemporaryDirectory() as tmp_dir:
+        paths = [write_pha(Path(tmp_dir) / 'sw{:011d}.pha.gz'.format(i), 
+                           tstart=612353536.6006 + 10.0 * i, seed=i) \
+                 for i in range(num_files)]
+        bench_open(BatPha, paths, workers)
+        
+        paths = [write_sao(Path(tmp_dir) / 'sw{:011d}sao.fits.gz'.format(i), 
+                           tstart=612353536.6006 + 86400.0 * i) \
+                 for i in range(max(num_files // 100, 2))]
+        bench_open(SwiftSao, paths, workers)
@@ -0,0 +1,124 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Benchmark of opening many BAT PHA files.
+
+Run with ``python benchmarks/bench_pha.py [num_files]``.
+"""
+import sys
+import warnings
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+from astropy.io.fits.verify import VerifyWarning
+
+from gdt.core.data_primitives import Ebounds, EnergyBins, Gti
+from gdt.core.pha import Pha
+from gdt.missions.swift.bat.headers import PhaHeaders
+from gdt.missions.swift.bat.pha import BatPha
+from synthetic import write_pha
+
+warnings.simplefilter('ignore', VerifyWarning)
+
+
+def _open_previous(file_path):
+    # the previous behavior: RATE and E_MIN/E_MAX are read twice, the
+    # CHANNEL, STAT_ERR and SYS_ERR columns are read but not used, and the 
+    # file is left open
+    obj = super(Pha, BatPha).open(file_path)
+    trigtime = None
+    hdrs = [hdu.header for hdu in obj.hdulist]
+    headers = PhaHeaders.from_headers(hdrs)
+    if 'TRIGTIME' in hdrs[0].keys():
+        trigtime = float(headers['PRIMARY']['TRIGTIME'])
+    ebounds = Ebounds.from_bounds(obj.column(2, 'E_MIN'),
+                                  obj.column(2, 'E_MAX'))
+    channel = obj.column(1,'CHANNEL')
+    rate = obj.column(1, 'RATE')
+    stat_err = obj.column(1, 'STAT_ERR')
+    sys_err = obj.column(1, 'SYS_ERR')
+    stdgti_start = obj.column(3, 'START')
+    stdgti_stop = obj.column(3, 'STOP')
+    if trigtime is not None:
+        stdgti_start -= trigtime
+        stdgti_stop -= trigtime
+    stdgti = Gti.from_bounds(stdgti_start, stdgti_stop)
+    exposure = headers['SPECTRUM']['EXPOSURE']
+    counts = obj.column(1, 'RATE') * exposure
+    data = EnergyBins(counts, obj.column(2, 'E_MIN'), obj.column(2, 'E_MAX'), 
+                      exposure)
+    return BatPha.from_data(data, gti=stdgti, trigger_time=trigtime,
+                            filename=obj.filename, headers=headers)
+
+
+def bench_open(paths):
+    t0 = perf_counter()
+    for path in paths:
+        pha = _open_previous(path)
+    t_prev = perf_counter() - t0
+
+    t0 = perf_counter()
+    for path in paths:
+        pha = BatPha.open(path)
+    t_open = perf_counter() - t0
+
+    t0 = perf_counter()
+    for path in paths:
+        pha = BatPha.open(path, read_errors=True)
+    t_errors = perf_counter() - t0
+
+    print('BatPha.open of {} files:'.format(len(paths)))
+    print('  previous               : {:8.1f} files/s'.format(
+          len(paths) / t_prev))
+    print('  BatPha.open            : {:8.1f} files/s  ({:.2f}x)'.format(
+          len(paths) / t_open, t_prev / t_open))
+    print('  read_errors=True       : {:8.1f} files/s  ({:.2f}x)'.format(
+          len(paths) / t_errors, t_prev / t_errors))
+
+
+if __name__ == '__main__':
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with TemporaryDirectory() as tmp_dir:
+        paths = [write_pha(Path(tmp_dir) / 'sw{:011d}.pha'.format(i), 
+                           tstart=612353536.6006 + 10.0 * i, seed=i) \
+                 for i in range(num_files)]
+        bench_open(paths)
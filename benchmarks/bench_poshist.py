@@ -0,0 +1,192 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Benchmarks for reading Swift SAO files.
+
+Run with ``python benchmarks/bench_poshist.py``.
+"""
+import warnings
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from timeit import repeat
+
+import numpy as np
+from astropy.io.fits.verify import VerifyWarning
+
+from gdt.missions.swift.poshist import SwiftSao, SwiftSaoCache
+from gdt.missions.swift.time import Time
+from synthetic import write_sao
+
+warnings.simplefilter('ignore', VerifyWarning)
+
+
+def _per_row(sao, col_name, arr_num):
+    # the original row-by-row extraction, kept here as the reference
+    new_array = []
+    for item in sao.column(1, col_name):
+        new_array += [item[arr_num]]
+    return np.array(new_array)
+
+
+def bench_vector_columns(sao, number=5):
+    def per_row():
+        for col_name in ('POSITION', 'VELOCITY'):
+            for i in range(3):
+                _per_row(sao, col_name, i)
+        sao.column(1, 'QUATERNION')
+
+    def sliced():
+        for col_name in ('POSITION', 'VELOCITY', 'QUATERNION'):
+            sao.ndim_column(1, col_name)
+
+    t_row = min(repeat(per_row, number=number, repeat=3)) / number
+    t_slice = min(repeat(sliced, number=number, repeat=3)) / number
+    print('POSITION/VELOCITY/QUATERNION extraction')
+    print('  per-row loop : {:10.3f} ms'.format(1e3 * t_row))
+    print('  column slice : {:10.3f} ms  ({:.0f}x)'.format(1e3 * t_slice,
+                                                         t_row / t_slice))
+
+
+def bench_spacecraft_frame(sao, number=3):
+    t = min(repeat(sao.get_spacecraft_frame, number=number, repeat=3)) / number
+    print('get_spacecraft_frame : {:10.3f} ms'.format(1e3 * t))
+
+
+def bench_frame_at(sao, num_times=5000, number=3):
+    time = sao.column(1, 'TIME')
+    met = np.sort(np.random.uniform(time[0], time[-1], num_times))
+
+    def full_frame():
+        sao.get_spacecraft_frame().at(Time(met, format='swift'))
+
+    def frame_at():
+        sao.frame_at(met)
+
+    t_full = min(repeat(full_frame, number=number, repeat=3)) / number
+    t_at = min(repeat(frame_at, number=number, repeat=3)) / number
+    print('Frames at {} times'.format(num_times))
+    print('  full frame + at : {:10.3f} ms'.format(1e3 * t_full))
+    print('  frame_at        : {:10.3f} ms  ({:.0f}x)'.format(1e3 * t_at,
+                                                            t_full / t_at))
+
+
+def bench_lazy_states(path, number=5):
+    def scan(lazy):
+        with SwiftSao.open(path, lazy=lazy) as sao:
+            sao.get_spacecraft_states()
+            return sao.bytes_read
+
+    t_eager = min(repeat(lambda: scan(False), number=number, repeat=3)) / number
+    t_lazy = min(repeat(lambda: scan(True), number=number, repeat=3)) / number
+    print('Open + get_spacecraft_states')
+    print('  eager : {:10.3f} ms'.format(1e3 * t_eager))
+    print('  lazy  : {:10.3f} ms  ({} bytes decoded)'.format(1e3 * t_lazy, 
+                                                            scan(True)))
+
+
+def bench_state_queries(sao, num_windows=50000, number=3):
+    time = sao.column(1, 'TIME')
+    tstart = np.random.uniform(time[0], time[-1] - 100.0, num_windows)
+    tstop = tstart + 100.0
+
+    def scan(num=500):
+        # scan the per-row states for each window (on a subset of windows)
+        states = sao.get_spacecraft_states()
+        t = states['time'].value
+        saa = states['saa'].value.astype(bool)
+        for t0, t1 in zip(tstart[:num], tstop[:num]):
+            saa[(t >= t0) & (t <= t1)].any()
+
+    def indexed():
+        sao.saa_during(tstart, tstop)
+
+    t_scan = min(repeat(scan, number=1, repeat=3)) * num_windows / 500
+    t_index = min(repeat(indexed, number=number, repeat=3)) / number
+    print('SAA check for {} windows'.format(num_windows))
+    print('  per-window scan : {:10.3f} ms (extrapolated)'.format(1e3 * t_scan))
+    print('  interval index  : {:10.3f} ms  ({:.0f}x)'.format(1e3 * t_index,
+                                                            t_scan / t_index))
+
+
+def bench_cache(path, cache_dir, number=5):
+    cache = SwiftSaoCache(cache_dir)
+    SwiftSao.open(path, cache=cache).close()
+
+    def uncached():
+        with SwiftSao.open(path) as sao:
+            sao.ndim_column(1, 'POSITION')
+
+    def cached():
+        with SwiftSao.open(path, cache=cache) as sao:
+            sao._sao_column('POSITION')
+
+    t_file = min(repeat(uncached, number=number, repeat=3)) / number
+    t_cache = min(repeat(cached, number=number, repeat=3)) / number
+    print('Open .fits.gz and decode POSITION')
+    print('  from file  : {:10.3f} ms'.format(1e3 * t_file))
+    print('  from cache : {:10.3f} ms  ({:.0f}x)'.format(1e3 * t_cache,
+                                                       t_file / t_cache))
+
+
+def bench_open_many(paths, number=3):
+    t = min(repeat(lambda: SwiftSao.open_many(paths), number=number, 
+                   repeat=3)) / number
+    print('open_many ({} files) : {:10.3f} ms'.format(len(paths), 1e3 * t))
+
+
+if __name__ == '__main__':
+    with TemporaryDirectory() as tmp_dir:
+        path = write_sao(Path(tmp_dir) / 'sw00000000000sao.fits')
+        with SwiftSao.open(path) as sao:
+            print('{} rows'.format(sao.column(1, 'TIME').size))
+            bench_vector_columns(sao)
+            bench_spacecraft_frame(sao)
+            bench_frame_at(sao)
+            bench_state_queries(sao)
+        bench_lazy_states(path)
+
+        gz_path = write_sao(Path(tmp_dir) / 'sw00000000000sao.fits.gz')
+        bench_cache(gz_path, Path(tmp_dir) / 'cache')
+
+        # ten overlapping 3-hour files
+        paths = [write_sao(Path(tmp_dir) / 'sw0000000001{}sao.fits'.format(i),
+                           tstart=612353536.6006 + i * 9000.0, num_rows=10800)
+                 for i in range(10)]
+        bench_open_many(paths)
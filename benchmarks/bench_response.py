@@ -0,0 +1,399 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Benchmark of the dense and sparse BAT response matrices, of folding many
+spectra at once, of folding a time-resolved sequence through a response
+series, of serving many directions from a response grid, of writing many
+responses, and of the memory used by worker processes opening a large 
+response.
+
+Run with ``python benchmarks/bench_response.py``.
+"""
+import multiprocessing
+import warnings
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+from astropy.io import fits
+from astropy.io.fits.verify import VerifyWarning
+
+from gdt.core.spectra.functions import PowerLaw
+from gdt.core.data_primitives import ResponseMatrix
+from gdt.missions.swift.bat.response import (BatRsp, BatRspGrid, 
+                                           BatRspSeries, SparseResponseMatrix)
+from synthetic import response_matrix, write_rsp
+
+warnings.simplefilter('ignore', VerifyWarning)
+
+
+def _time(func, number):
+    t0 = perf_counter()
+    for i in range(number):
+        func()
+    return (perf_counter() - t0) / number
+
+
+def bench_sparse(num_ebins, num_chans, tail=0.01, number=1000):
+    dense = response_matrix(num_ebins, num_chans, tail=tail)
+    sparse = SparseResponseMatrix(dense.matrix, dense.photon_bins.low_edges(),
+                                  dense.photon_bins.high_edges(), 
+                                  dense.ebounds.low_edges(), 
+                                  dense.ebounds.high_edges())
+    csr = sparse.sparse_matrix
+    dense_bytes = dense.matrix.nbytes
+    sparse_bytes = csr.data.nbytes + csr.indices.nbytes + csr.indptr.nbytes
+    
+    func = PowerLaw().fit_eval
+    params = (0.01, -2.2)
+    t_dense = _time(lambda: dense.fold_spectrum(func, params), number)
+    t_sparse = _time(lambda: sparse.fold_spectrum(func, params), number)
+    num = max(number // 100, 1)
+    t_dense_rs = _time(lambda: dense.resample(num_photon_bins=num_ebins // 2),
+                       num)
+    t_sparse_rs = _time(lambda: sparse.resample(num_photon_bins=num_ebins // 2),
+                        num)
+    
+    print('{} photon bins x {} channels, tail {}, {:.0%} nonzero:'.format(
+          num_ebins, num_chans, tail, sparse.nnz / dense.matrix.size))
+    print('  memory        : {:10.1f} kB dense  {:10.1f} kB sparse'.format(
+          dense_bytes / 1024, sparse_bytes / 1024))
+    print('  fold_spectrum : {:10.1f} us dense  {:10.1f} us sparse  '
+          '({:.2f}x)'.format(t_dense * 1e6, t_sparse * 1e6, t_dense / t_sparse))
+    print('  resample      : {:10.1f} ms dense  {:10.1f} ms sparse  '
+          '({:.2f}x)'.format(t_dense_rs * 1e3, t_sparse_rs * 1e3, 
+                             t_dense_rs / t_sparse_rs))
+
+
+def bench_batched_fold(num_ebins, num_chans, num_models=1000):
+    rsp = BatRsp.from_data(response_matrix(num_ebins, num_chans))
+    func = PowerLaw().fit_eval
+    amps, indices = np.meshgrid(np.geomspace(1e-3, 1.0, num_models // 50), 
+                                np.linspace(-3.0, -1.0, 50))
+    params = np.stack((amps.ravel(), indices.ravel()), axis=1)
+    photon_flux = np.array([func(p, rsp.drm.photon_bin_centroids) \
+                            for p in params])
+    
+    t0 = perf_counter()
+    counts_loop = np.array([rsp.fold_spectrum(func, p, exposure=2.0).counts \
+                            for p in params])
+    t_loop = perf_counter() - t0
+    
+    rsp.fold_spectra(photon_flux[:1])
+    t0 = perf_counter()
+    counts = rsp.fold_model(func, params, exposure=2.0)
+    t_model = perf_counter() - t0
+    assert np.allclose(counts, counts_loop)
+    
+    t0 = perf_counter()
+    counts = rsp.fold_spectra(photon_flux, exposure=2.0)
+    t_spectra = perf_counter() - t0
+    assert np.allclose(counts, counts_loop)
+    
+    print('Folding {} models, {} photon bins x {} channels:'.format(
+          len(params), num_ebins, num_chans))
+    print('  fold_spectrum loop     : {:8.2f} ms'.format(t_loop * 1e3))
+    print('  fold_model             : {:8.2f} ms  ({:.1f}x)'.format(
+          t_model * 1e3, t_loop / t_model))
+    print('  fold_spectra           : {:8.2f} ms  ({:.1f}x)'.format(
+          t_spectra * 1e3, t_loop / t_spectra))
+
+
+def bench_series(num_drms=20, num_intervals=200):
+    drm = response_matrix()
+    edges = (drm.photon_bins.low_edges(), drm.photon_bins.high_edges(),
+             drm.ebounds.low_edges(), drm.ebounds.high_edges())
+    rsps = [BatRsp.from_data(ResponseMatrix(drm.matrix * (1.0 + 0.01 * i), 
+                                            *edges),
+                             start_time=10.0 * i, stop_time=10.0 * (i + 1)) \
+            for i in range(num_drms)]
+    func = PowerLaw().fit_eval
+    time_ranges = np.linspace(0.0, 10.0 * num_drms, num_intervals + 1)
+    time_ranges = np.stack((time_ranges[:-1], time_ranges[1:]), axis=1)
+    params = np.stack((np.full(num_intervals, 0.01), 
+                       np.linspace(-3.0, -1.0, num_intervals)), axis=1)
+    
+    # the previous approach: a response per interval, folded one at a time
+    t0 = perf_counter()
+    counts_loop = []
+    for (tstart, tstop), p in zip(time_ranges, params):
+        tcent = (tstart + tstop) / 2.0
+        idx = min(int(tcent // 10.0), num_drms - 1)
+        counts_loop.append(rsps[idx].fold_spectrum(func, p).counts)
+    t_loop = perf_counter() - t0
+    
+    t0 = perf_counter()
+    series = BatRspSeries.from_rsps(rsps)
+    t_build = perf_counter() - t0
+    
+    t0 = perf_counter()
+    counts = series.fold_model(func, params, time_ranges)
+    t_avg = perf_counter() - t0
+    t0 = perf_counter()
+    counts = series.fold_model(func, params, time_ranges, interpolate=True)
+    t_interp = perf_counter() - t0
+    
+    print('Folding {} intervals through {} responses:'.format(num_intervals,
+                                                              num_drms))
+    print('  nearest-DRM loop       : {:8.2f} ms'.format(t_loop * 1e3))
+    print('  BatRspSeries.from_rsps : {:8.2f} ms'.format(t_build * 1e3))
+    print('  fold_model (average)   : {:8.2f} ms  ({:.1f}x)'.format(
+          t_avg * 1e3, t_loop / t_avg))
+    print('  fold_model (interp)    : {:8.2f} ms  ({:.1f}x)'.format(
+          t_interp * 1e3, t_loop / t_interp))
+
+
+def bench_grid(step=10.0, num_directions=200):
+    drm = response_matrix()
+    edges = (drm.photon_bins.low_edges(), drm.photon_bins.high_edges(),
+             drm.ebounds.low_edges(), drm.ebounds.high_edges())
+    az = np.arange(-60.0, 60.0 + step, step)
+    el = np.arange(-60.0, 60.0 + step, step)
+    rng = np.random.default_rng(0)
+    dir_az = rng.uniform(-60.0, 60.0, num_directions)
+    dir_el = rng.uniform(-60.0, 60.0, num_directions)
+    func = PowerLaw().fit_eval
+    params = (0.01, -2.0)
+    
+    with TemporaryDirectory() as tmp_dir:
+        # a response file for each grid point
+        paths = {}
+        rsps = []
+        for a in az:
+            for e in el:
+                scale = np.cos(np.deg2rad(a)) * np.cos(np.deg2rad(e))
+                matrix = ResponseMatrix(drm.matrix * scale, *edges)
+                path = Path(tmp_dir) / 'az{:+.0f}_el{:+.0f}.rsp'.format(a, e)
+                paths[(a, e)] = write_rsp(path, drm=matrix)
+                rsps.append(BatRsp.from_data(matrix))
+        grid = BatRspGrid.from_rsps(rsps, az, el)
+        grid.write(tmp_dir, 'grid.fits', overwrite=True)
+        grid_path = Path(tmp_dir) / 'grid.fits'
+        
+        # the previous approach: open the nearest response for each direction
+        t0 = perf_counter()
+        counts_loop = []
+        for a, e in zip(dir_az, dir_el):
+            near = (az[np.abs(az - a).argmin()], el[np.abs(el - e).argmin()])
+            rsp = BatRsp.open(paths[near])
+            counts_loop.append(rsp.fold_spectrum(func, params).counts)
+        t_loop = perf_counter() - t0
+        
+        t0 = perf_counter()
+        grid = BatRspGrid.open(grid_path)
+        t_open = perf_counter() - t0
+        
+        t0 = perf_counter()
+        counts = grid.fold_model(func, params, dir_az, dir_el)
+        t_fold = perf_counter() - t0
+        
+        t0 = perf_counter()
+        grid.interpolate(dir_az, dir_el)
+        t_interp = perf_counter() - t0
+        t_cached = _time(lambda: grid.interpolate(dir_az[-100:], 
+                                                  dir_el[-100:]), 20)
+    
+    print('Serving {} directions from a {} x {} response grid:'.format(
+          num_directions, az.size, el.size))
+    print('  BatRsp.open + fold loop : {:8.2f} ms'.format(t_loop * 1e3))
+    print('  BatRspGrid.open         : {:8.2f} ms'.format(t_open * 1e3))
+    print('  fold_model              : {:8.2f} ms  ({:.1f}x)'.format(
+          t_fold * 1e3, t_loop / t_fold))
+    print('  interpolate             : {:8.2f} ms'.format(t_interp * 1e3))
+    print('  interpolate (100 cached): {:8.2f} ms'.format(t_cached * 1e3))
+
+
+def _baseline_hdulist(rsp):
+    # the previous BatRsp._build_hdulist: a fits.Column for each column, and
+    # each header copied again card by card
+    hdulist = fits.HDUList()
+    primary_hdu = fits.PrimaryHDU(header=rsp.headers['PRIMARY'])
+    for key, val in rsp.headers['PRIMARY'].items():
+        primary_hdu.header[key] = val
+    hdulist.append(primary_hdu)
+    
+    drm = rsp.drm
+    cols = [fits.Column(name='ENERG_LO', format='E', unit='keV', 
+                        array=drm.photon_bins.low_edges()),
+            fits.Column(name='ENERG_HI', format='E', unit='keV',
+                        array=drm.photon_bins.high_edges()),
+            fits.Column(name='N_GRP', format='I', array=rsp._ngrp),
+            fits.Column(name='F_CHAN', format='I', array=rsp._fchan),
+            fits.Column(name='N_CHAN', format='I', array=rsp._nchan),
+            fits.Column(name='MATRIX', format='{}E'.format(rsp.num_chans),
+                        array=drm.matrix)]
+    hdu = fits.BinTableHDU.from_columns(cols, 
+                                        header=rsp.headers['SPECRESP MATRIX'])
+    for key, val in rsp.headers['SPECRESP MATRIX'].items():
+        hdu.header[key] = val
+    hdulist.append(hdu)
+    
+    cols = [fits.Column(name='CHANNEL', format='I', 
+                        array=np.arange(rsp.num_chans, dtype=int)),
+            fits.Column(name='E_MIN', format='E', unit='keV', 
+                        array=rsp.ebounds.low_edges()),
+            fits.Column(name='E_MAX', format='E', unit='keV',
+                        array=rsp.ebounds.high_edges())]
+    hdu = fits.BinTableHDU.from_columns(cols, header=rsp.headers['EBOUNDS'])
+    for key, val in rsp.headers['EBOUNDS'].items():
+        hdu.header[key] = val
+    hdulist.append(hdu)
+    return hdulist
+
+
+def _baseline_write(rsp, directory, filename, overwrite=False):
+    # the previous write: FitsFileContextManager.write on the hdulist above
+    for key, val in (('FILENAME', filename), 
+                     ('CREATOR', rsp.headers.creator()[1])):
+        try:
+            rsp.headers['PRIMARY'][key] = val
+        except KeyError:
+            pass
+    rsp.headers.update()
+    _baseline_hdulist(rsp).writeto(Path(directory) / filename, checksum=True, 
+                                   overwrite=overwrite)
+
+
+def bench_write(num_responses=1000):
+    with TemporaryDirectory() as tmp_dir:
+        rsp = BatRsp.open(write_rsp(Path(tmp_dir) / 'base.rsp'))
+        drm = rsp.drm
+        edges = (drm.photon_bins.low_edges(), drm.photon_bins.high_edges(),
+                 drm.ebounds.low_edges(), drm.ebounds.high_edges())
+        rsps = []
+        for i in range(num_responses):
+            new_rsp = BatRsp.from_data(ResponseMatrix(drm.matrix * \
+                                                      (1.0 + 1e-4 * i), 
+                                                      *edges),
+                                       headers=rsp.headers.copy())
+            new_rsp._ngrp, new_rsp._fchan, new_rsp._nchan = \
+                                                rsp._ngrp, rsp._fchan, rsp._nchan
+            rsps.append(new_rsp)
+        
+        def write_all(write, suffix='', **kwargs):
+            t0 = perf_counter()
+            for i, new_rsp in enumerate(rsps):
+                write(new_rsp, tmp_dir, 'rsp{}.rsp{}'.format(i, suffix), 
+                      overwrite=True, **kwargs)
+            elapsed = perf_counter() - t0
+            size = sum((Path(tmp_dir) / 'rsp{}.rsp{}'.format(i, suffix)).stat(
+                       ).st_size for i in range(num_responses))
+            return elapsed, size
+        
+        t_astropy, size = write_all(_baseline_write)
+        t_write, size = write_all(BatRsp.write)
+        t_noverify, size = write_all(BatRsp.write, output_verify='ignore')
+        t_gzip1, size_gzip1 = write_all(BatRsp.write, '.gz', compresslevel=1)
+        t_gzip6, size_gzip6 = write_all(BatRsp.write, '.gz')
+    
+    print('Writing {} responses ({} x {}):'.format(num_responses, 
+                                                   drm.num_ebins, 
+                                                   drm.num_chans))
+    for label, elapsed, nbytes in [('previous write', t_astropy, size),
+                                   ('BatRsp.write', t_write, size),
+                                   ('BatRsp.write, no verify', t_noverify,
+                                    size),
+                                   ('BatRsp.write, gzip 1', t_gzip1, 
+                                    size_gzip1),
+                                   ('BatRsp.write, gzip 6', t_gzip6, 
+                                    size_gzip6)]:
+        print('  {:24s}: {:8.2f} s  {:7.1f} rsp/s  {:6.1f} MB  ({:.1f}x)'.format(
+              label, elapsed, num_responses / elapsed, nbytes / 1e6, 
+              t_astropy / elapsed))
+
+
+def _memory():
+    # the resident, proportional (shared pages split between processes) and
+    # anonymous memory of this process, in MB
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            fields = line.split()
+            if fields[0] in ('Rss:', 'Pss:', 'Anonymous:'):
+                values[fields[0][:-1]] = int(fields[1]) / 1024.0
+    return values
+
+
+def _open_worker(path, zero_copy, barrier, queue):
+    before = _memory()
+    rsp = BatRsp.open(path, zero_copy=zero_copy)
+    effarea = rsp.drm.photon_effective_area()
+    # measure while all of the workers hold the response
+    barrier.wait()
+    after = _memory()
+    queue.put({key: after[key] - before[key] for key in after})
+    barrier.wait()
+
+
+def bench_zero_copy(num_ebins=8192, num_chans=2048, num_workers=4):
+    ctx = multiprocessing.get_context('fork')
+    with TemporaryDirectory() as tmp_dir:
+        path = write_rsp(Path(tmp_dir) / 'large.rsp', num_ebins, num_chans)
+        print('{} forked workers opening a {:.0f} MB response:'.format(
+              num_workers, num_ebins * num_chans * 4 / 1024**2))
+        for zero_copy in (False, True):
+            barrier = ctx.Barrier(num_workers)
+            queue = ctx.Queue()
+            procs = [ctx.Process(target=_open_worker, 
+                                 args=(path, zero_copy, barrier, queue)) \
+                     for i in range(num_workers)]
+            for proc in procs:
+                proc.start()
+            results = [queue.get() for proc in procs]
+            for proc in procs:
+                proc.join()
+            print('  zero_copy={!s:5}: total RSS {:7.1f} MB, PSS {:7.1f} MB, '
+                  'anonymous {:7.1f} MB'.format(zero_copy,
+                  *[sum(r[key] for r in results) \
+                    for key in ('Rss', 'Pss', 'Anonymous')]))
+
+
+if __name__ == '__main__':
+    bench_write()
+    bench_grid()
+    bench_zero_copy()
+    bench_series()
+    bench_batched_fold(204, 80)
+    bench_batched_fold(2000, 80)
+    for tail in (0.01, 0.0):
+        bench_sparse(204, 80, tail=tail)
+        bench_sparse(2000, 80, tail=tail)
+        bench_sparse(4000, 400, tail=tail, number=200)
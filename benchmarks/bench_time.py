@@ -0,0 +1,84 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Benchmarks for Swift MET/UTC conversions.
+
+Run with ``python benchmarks/bench_time.py``.
+"""
+from pathlib import Path
+from timeit import repeat
+
+import numpy as np
+
+from gdt.missions.swift.time import Time, met_to_datetime64, met_to_unix, \
+                                    utc_to_met
+
+
+def _trigger_mets():
+    test_file = Path(__file__).parent.parent / 'tests' / 'missions' / \
+                'swift' / 'data' / 'trigger_data.csv'
+    return np.loadtxt(test_file, delimiter=',', usecols=0)
+
+
+def _bench(label, reference, fast, number=3):
+    t_ref = min(repeat(reference, number=number, repeat=3)) / number
+    t_fast = min(repeat(fast, number=number, repeat=3)) / number
+    print(label)
+    print('  astropy Time : {:10.3f} ms'.format(1e3 * t_ref))
+    print('  function     : {:10.3f} ms  ({:.0f}x)'.format(1e3 * t_fast, 
+                                                         t_ref / t_fast))
+
+
+if __name__ == '__main__':
+    met = _trigger_mets()
+    _bench('MET -> UTC datetime ({} triggers):'.format(met.size),
+           lambda: Time(met, format='swift').utc.datetime,
+           lambda: met_to_datetime64(met))
+    
+    iso = met_to_datetime64(met)
+    _bench('UTC -> MET ({} triggers):'.format(met.size),
+           lambda: Time(iso, scale='utc').swift,
+           lambda: utc_to_met(iso))
+    
+    events = np.sort(np.random.default_rng(0).uniform(met.min(), met.max(), 
+                                                      1000000))
+    _bench('MET -> Unix ({} events):'.format(events.size),
+           lambda: Time(events, format='swift').utc.unix,
+           lambda: met_to_unix(events), number=1)
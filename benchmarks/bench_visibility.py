@@ -0,0 +1,93 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Benchmark of the BAT visibility engine over a day of SAO data.
+
+Run with ``python benchmarks/bench_visibility.py``.
+"""
+import warnings
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import numpy as np
+from astropy.coordinates import SkyCoord
+from astropy.io.fits.verify import VerifyWarning
+
+from gdt.missions.swift.bat.visibility import BatVisibility
+from gdt.missions.swift.frame import SwiftFrame
+from gdt.missions.swift.poshist import SwiftSao
+from synthetic import write_sao
+
+warnings.simplefilter('ignore', VerifyWarning)
+
+
+def bench_visibility(sao, num_srcs=2000):
+    rng = np.random.default_rng(0)
+    ra = rng.uniform(0.0, 360.0, num_srcs)
+    dec = np.rad2deg(np.arcsin(rng.uniform(-1.0, 1.0, num_srcs)))
+    
+    t0 = perf_counter()
+    vis = BatVisibility.from_sao(sao)
+    gtis = vis.intervals(ra, dec)
+    t_vis = perf_counter() - t0
+    
+    # the per-source SkyCoord loop, for a few sources only
+    num_loop = 5
+    frame = sao.get_spacecraft_frame()
+    frame = SwiftFrame(quaternion=frame.quaternion, obstime=frame.obstime)
+    t0 = perf_counter()
+    for i in range(num_loop):
+        coord = SkyCoord(ra[i], dec[i], unit='deg').transform_to(frame)
+    t_loop = (perf_counter() - t0) * num_srcs / num_loop
+    
+    print('visibility of {} sources over {} samples:'.format(num_srcs, 
+                                                             vis.num_samples))
+    print('  SkyCoord loop (FOV only, extrapolated) : {:8.2f} s'.format(t_loop))
+    print('  BatVisibility.intervals                : {:8.2f} s'.format(t_vis))
+    print('  {} intervals'.format(sum(gti.num_intervals for gti in gtis \
+                                      if gti is not None)))
+
+
+if __name__ == '__main__':
+    with TemporaryDirectory() as tmp_dir:
+        path = write_sao(Path(tmp_dir) / 'sw00000000000sao.fits')
+        with SwiftSao.open(path) as sao:
+            bench_visibility(sao)
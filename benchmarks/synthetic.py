@@ -0,0 +1,214 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Writers for synthetic Swift files used by the benchmarks.  The files carry
+the same header templates and column layout as the HEASARC products, so the
+benchmarks run without downloading any data.
+"""
+from pathlib import Path
+
+import numpy as np
+import astropy.io.fits as fits
+
+from gdt.core.data_primitives import ResponseMatrix
+from gdt.missions.swift.bat.headers import PhaHeaders, RspHeaders, SaoHeaders
+from gdt.missions.swift.bat.response import BatRsp
+
+
+def write_sao(path, tstart=612353536.6006, num_rows=86400):
+    """Write a synthetic SAO file with 1-s sampling.
+
+    Args:
+        path (str): The output file path
+        tstart (float, optional): The MET of the first row
+        num_rows (int, optional): The number of rows. Default is one day.
+
+    Returns:
+        (str)
+    """
+    time = tstart + np.arange(num_rows, dtype=float)
+    # the orbit and attitude depend only on time, so overlapping files agree
+    dt = time - 612353536.6006
+    phase = 2.0 * np.pi * dt / 5760.0
+    pos = 6921.0 * np.stack((np.cos(phase), np.sin(phase),
+                             np.zeros(num_rows)), axis=1)
+    vel = 7.59 * np.stack((-np.sin(phase), np.cos(phase),
+                           np.zeros(num_rows)), axis=1)
+    angle = 0.5 * np.deg2rad(0.01) * dt
+    quat = np.stack((np.zeros(num_rows), np.zeros(num_rows), np.sin(angle),
+                     np.cos(angle)), axis=1)
+    saa = (dt % 5760.0 < 600.0).astype(np.int16)
+    sun = (dt % 5760.0 > 2000.0).astype(np.int16)
+
+    headers = SaoHeaders()
+    for hdr in headers:
+        hdr['TSTART'] = time[0]
+        hdr['TSTOP'] = time[-1]
+    cols = [fits.Column(name='TIME', format='D', unit='s', array=time),
+            fits.Column(name='POSITION', format='3E', unit='km', array=pos),
+            fits.Column(name='VELOCITY', format='3E', unit='km/s', array=vel),
+            fits.Column(name='QUATERNION', format='4E', array=quat),
+            fits.Column(name='SUNSHINE', format='I', array=sun),
+            fits.Column(name='SAA', format='I', array=saa)]
+    hdulist = fits.HDUList([fits.PrimaryHDU(header=headers['PRIMARY']),
+                            fits.BinTableHDU.from_columns(
+                                cols, header=headers['PREFILTER'])])
+    hdulist.writeto(path, overwrite=True)
+    return path
+
+
+def write_pha(path, tstart=612353536.6006, exposure=10.0, num_chans=80, 
+              seed=0):
+    """Write a synthetic BAT PHA file with the layout of the HEASARC spectra.
+
+    Args:
+        path (str): The output file path
+        tstart (float, optional): The start time (and trigger time) in MET
+        exposure (float, optional): The exposure of the spectrum
+        num_chans (int, optional): The number of energy channels
+        seed (int, optional): The seed for the random counts
+
+    Returns:
+        (str)
+    """
+    edges = np.geomspace(15.0, 350.0, num_chans + 1)
+    counts = np.random.default_rng(seed).poisson(100.0, num_chans)
+    rate = counts / exposure
+    rate_err = np.sqrt(counts) / exposure
+    
+    headers = PhaHeaders()
+    for hdr in headers:
+        hdr['TSTART'] = tstart
+        hdr['TSTOP'] = tstart + exposure
+        hdr['TRIGTIME'] = tstart
+    headers['SPECTRUM']['EXPOSURE'] = exposure
+
+    chans = np.arange(num_chans, dtype=int)
+    spec_cols = [fits.Column(name='CHANNEL', format='1I', array=chans),
+                 fits.Column(name='RATE', format='1D', unit='count/s', 
+                             array=rate),
+                 fits.Column(name='STAT_ERR', format='1D', unit='count/s', 
+                             array=rate_err),
+                 fits.Column(name='SYS_ERR', format='1D', unit='count/s', 
+                             array=np.zeros(num_chans))]
+    ebounds_cols = [fits.Column(name='CHANNEL', format='1I', array=chans),
+                    fits.Column(name='E_MIN', format='1E', unit='keV', 
+                                array=edges[:-1]),
+                    fits.Column(name='E_MAX', format='1E', unit='keV', 
+                                array=edges[1:])]
+    gti_cols = [fits.Column(name='START', format='1D', unit='s', 
+                            array=[tstart]),
+                fits.Column(name='STOP', format='1D', unit='s', 
+                            array=[tstart + exposure])]
+    hdulist = fits.HDUList([
+        fits.PrimaryHDU(header=headers['PRIMARY']),
+        fits.BinTableHDU.from_columns(spec_cols, header=headers['SPECTRUM']),
+        fits.BinTableHDU.from_columns(ebounds_cols, header=headers['EBOUNDS']),
+        fits.BinTableHDU.from_columns(gti_cols, header=headers['STDGTI'])])
+    hdulist.writeto(path, overwrite=True)
+    return path
+
+
+def response_matrix(num_ebins=204, num_chans=80, tail=0.01):
+    """Make a synthetic BAT-like DRM: a photopeak with 10% FWHM and a 
+    downscatter tail to lower channels.  Channels above the photopeak, and
+    elements below 1e-4 of the peak, are zero.
+
+    Args:
+        num_ebins (int, optional): The number of photon bins
+        num_chans (int, optional): The number of energy channels
+        tail (float, optional): The height of the downscatter tail relative 
+                                to the photopeak. Default is 0.01.
+
+    Returns:
+        (:class:`~gdt.core.data_primitives.ResponseMatrix`)
+    """
+    edges = np.geomspace(10.0, 500.0, num_ebins + 1)
+    chan_edges = np.geomspace(15.0, 350.0, num_chans + 1)
+    energy = np.sqrt(edges[:-1] * edges[1:])[:, np.newaxis]
+    chan_energy = np.sqrt(chan_edges[:-1] * chan_edges[1:])[np.newaxis, :]
+    
+    sigma = 0.1 * energy / 2.355
+    peak = np.exp(-0.5 * ((chan_energy - energy) / sigma)**2)
+    tail = tail * np.exp((chan_energy - energy) / (0.2 * energy))
+    tail[chan_energy > energy] = 0.0
+    matrix = peak + tail
+    matrix[matrix < 1e-4] = 0.0
+    # 1000 cm^2 in each photon bin
+    matrix *= 1000.0 / matrix.sum(axis=1, keepdims=True).clip(1e-30)
+    return ResponseMatrix(matrix.astype(np.float32), edges[:-1], edges[1:],
+                          chan_edges[:-1], chan_edges[1:])
+
+
+def write_rsp(path, num_ebins=204, num_chans=80, tstart=612353536.6006, 
+              duration=10.0, drm=None):
+    """Write a synthetic BAT response file, with a full row of channels in 
+    each MATRIX row like the HEASARC responses.
+
+    Args:
+        path (str): The output file path
+        num_ebins (int, optional): The number of photon bins
+        num_chans (int, optional): The number of energy channels
+        tstart (float, optional): The start time (and trigger time) in MET
+        duration (float, optional): The duration of the response
+        drm (:class:`~gdt.core.data_primitives.ResponseMatrix`, optional):
+            The DRM. If omitted, uses :func:`response_matrix`.
+
+    Returns:
+        (str)
+    """
+    if drm is None:
+        drm = response_matrix(num_ebins, num_chans)
+    headers = RspHeaders()
+    headers['PRIMARY']['TRIGTIME'] = tstart
+    for hdr in headers:
+        if 'TSTART' in hdr:
+            hdr['TSTART'] = tstart
+            hdr['TSTOP'] = tstart + duration
+    headers['SPECRESP MATRIX']['DETCHANS'] = drm.num_chans
+    headers['SPECRESP MATRIX']['NUMGRP'] = drm.num_ebins
+    headers['EBOUNDS']['DETCHANS'] = drm.num_chans
+    
+    rsp = BatRsp.from_data(drm, headers=headers)
+    rsp._ngrp = np.ones(drm.num_ebins, dtype=int)
+    rsp._fchan = np.zeros(drm.num_ebins, dtype=int)
+    rsp._nchan = np.full(drm.num_ebins, drm.num_chans)
+    rsp.write(str(Path(path).parent), filename=Path(path).name, overwrite=True)
+    return path
@@ -0,0 +1,482 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+import gzip
+import os
+import sqlite3
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import astropy.io.fits as fits
+from astropy.table import Table, MaskedColumn
+
+from .headers import (AttHeaders, LightcurveHeaders, PhaHeaders, RspHeaders, 
+                      SaoHeaders)
+
+__all__ = ['ArchiveIndex', 'scan_headers']
+
+# the file types, identified by the name of the first extension
+_file_types = {'pha': PhaHeaders, 'lightcurve': LightcurveHeaders, 
+               'response': RspHeaders, 'sao': SaoHeaders, 
+               'attitude': AttHeaders}
+_extnames = {cls._header_templates[1].name: file_type \
+             for file_type, cls in _file_types.items()}
+
+# the keyword types, as defined by the PRIMARY header templates
+_kw_types = {}
+for _cls in _file_types.values():
+    _kw_types.update(_cls._header_templates[0]._kw_types)
+
+_default_keywords = ('OBS_ID', 'TSTART', 'TSTOP', 'TRIGTIME', 'RA_OBJ', 
+                     'DEC_OBJ', 'RA_PNT', 'DEC_PNT', 'PA_PNT')
+_block_size = 2880
+_card_size = 80
+_max_header_blocks = 1000
+# the largest value stored in an R-tree (32-bit float) column
+_rtree_max = 3.0e38
+
+
+def scan_headers(paths, keywords=None, processes=None, chunksize=16):
+    """Read the PRIMARY header keywords of many BAT and SAO files.
+    
+    Only the header blocks are read from each file, and gzipped files are 
+    decompressed only as far as the end of the headers.  The files are scanned
+    across a pool of processes.  Files that cannot be read are skipped with a
+    warning.
+    
+    The returned table has a ``FILENAME`` column, a ``FILETYPE`` column (one of
+    'pha', 'lightcurve', 'response', 'sao', 'attitude', or '' if the first 
+    extension is not recognized), and one column for each keyword.  A keyword
+    that is missing from a file is masked.
+    
+    Args:
+        paths (list of str): The file paths
+        keywords (list of str, optional): The PRIMARY header keywords to read.
+            If omitted, reads OBS_ID, TSTART, TSTOP, TRIGTIME, RA_OBJ, DEC_OBJ,
+            RA_PNT, DEC_PNT, and PA_PNT.
+        processes (int, optional): The number of worker processes.  If 
+                                   omitted, uses the number of CPUs. If 1, 
+                                   the files are scanned in this process.
+        chunksize (int, optional): The number of files sent to a worker at a
+                                   time. Default is 16.
+    
+    Returns:
+        (astropy.table.Table)
+    """
+    if keywords is None:
+        keywords = _default_keywords
+    keywords = tuple(keyword.upper() for keyword in keywords)
+    for keyword in keywords:
+        if keyword not in _kw_types:
+            raise ValueError('{} is not a PRIMARY header keyword'.format(keyword))
+    if processes is not None and processes < 1:
+        raise ValueError('processes must be >= 1')
+    
+    paths = [str(path) for path in paths]
+    scan = partial(_scan_file, keywords=keywords)
+    if processes == 1 or len(paths) < 2:
+        results = list(map(scan, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(scan, paths, chunksize=chunksize))
+    
+    rows = []
+    for path, result in zip(paths, results):
+        if isinstance(result, str):
+            warnings.warn('Could not scan {}: {}'.format(path, result), 
+                          RuntimeWarning, stacklevel=2)
+            continue
+        rows.append((path, result[0]) + result[1])
+    return _make_table(rows, keywords)
+
+
+class ArchiveIndex():
+    """A persistent index of local BAT and SAO files, stored in a SQLite 
+    database.
+    
+    Each file is recorded with its file type and the OBS_ID, TSTART, TSTOP, 
+    TRIGTIME, RA_OBJ, DEC_OBJ, RA_PNT, DEC_PNT, and PA_PNT keywords of its 
+    PRIMARY header, read by :func:`scan_headers`.  The time range and the 
+    pointing of each file are also stored in an R-tree, so that queries on 
+    time range and pointing do not have to look at every file.
+    
+    The modification time and size of each file is recorded, and only new or
+    changed files are read when the index is updated.
+    
+    The index can be used as a context manager, which closes the database on 
+    exit.
+    """
+    _keywords = _default_keywords
+    _columns = ('filename', 'filetype') + tuple(kw.lower() for kw in \
+                                                _default_keywords)
+    _schema = """
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY, filename TEXT UNIQUE NOT NULL, 
+            mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, filetype TEXT, 
+            obs_id TEXT, tstart REAL, tstop REAL, trigtime REAL, ra_obj REAL, 
+            dec_obj REAL, ra_pnt REAL, dec_pnt REAL, pa_pnt REAL, 
+            x_pnt REAL, y_pnt REAL, z_pnt REAL);
+        CREATE INDEX IF NOT EXISTS files_obs_id ON files (obs_id);
+        CREATE VIRTUAL TABLE IF NOT EXISTS files_rtree USING rtree(
+            id, tmin, tmax, xmin, xmax, ymin, ymax, zmin, zmax);
+    """
+    
+    def __init__(self):
+        self._conn = None
+        self._filename = None
+    
+    @property
+    def filename(self):
+        """(str): The filename of the database"""
+        return self._filename
+    
+    @property
+    def num_files(self):
+        """(int): The number of files in the index"""
+        return self._conn.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+    
+    def close(self):
+        """Close the database"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def prune(self):
+        """Remove the files that no longer exist from the index.
+        
+        Returns:
+            (int): The number of files removed
+        """
+        ids = [(id,) for id, filename in \
+               self._conn.execute('SELECT id, filename FROM files') \
+               if not os.path.exists(filename)]
+        with self._conn:
+            self._conn.executemany('DELETE FROM files WHERE id = ?', ids)
+            self._conn.executemany('DELETE FROM files_rtree WHERE id = ?', ids)
+        return len(ids)
+    
+    def query(self, tstart=None, tstop=None, ra=None, dec=None, radius=None, 
+              filetype=None, obs_id=None):
+        """Query the index.  All of the given conditions must be met.
+        
+        Args:
+            tstart (float, optional): Files that end at or after this MET
+            tstop (float, optional): Files that start at or before this MET
+            ra (float, optional): The RA of a position, in degrees
+            dec (float, optional): The Dec of a position, in degrees
+            radius (float, optional): Files pointed (RA_PNT, DEC_PNT) within
+                                      this many degrees of (ra, dec)
+            filetype (str, optional): The file type: 'pha', 'lightcurve', 
+                                      'response', 'sao', or 'attitude'
+            obs_id (str, optional): The observation ID
+        
+        Returns:
+            (astropy.table.Table): A table with the same columns as 
+                                   :func:`scan_headers`, sorted by filename
+        """
+        position = (ra, dec, radius)
+        if any(val is not None for val in position) and \
+           any(val is None for val in position):
+            raise ValueError('ra, dec, and radius must be given together')
+        
+        joins = ''
+        where = []
+        params = []
+        if tstart is not None or tstop is not None:
+            tstart = -np.inf if tstart is None else float(tstart)
+            tstop = np.inf if tstop is None else float(tstop)
+            joins = ' JOIN files_rtree r ON f.id = r.id'
+            where += ['r.tmin <= ?', 'r.tmax >= ?', 'f.tstart <= ?', 
+                      'f.tstop >= ?']
+            params += [tstop, tstart, tstop, tstart]
+        
+        if radius is not None:
+            center = _unit_vector(ra, dec)
+            # bounding box of the cap, then the exact angular distance
+            chord = 2.0 * np.sin(np.deg2rad(min(radius, 180.0)) / 2.0)
+            if not joins:
+                joins = ' JOIN files_rtree r ON f.id = r.id'
+            for axis, value in zip('xyz', center):
+                where += ['r.{}min <= ?'.format(axis), 
+                          'r.{}max >= ?'.format(axis)]
+                params += [value + chord, value - chord]
+            where.append('f.x_pnt * ? + f.y_pnt * ? + f.z_pnt * ? >= ?')
+            params += list(center) + [np.cos(np.deg2rad(radius)) - 1e-12]
+        
+        if filetype is not None:
+            where.append('f.filetype = ?')
+            params.append(filetype)
+        if obs_id is not None:
+            where.append('f.obs_id = ?')
+            params.append(obs_id)
+        
+        sql = 'SELECT {} FROM files f{}'.format(
+              ', '.join('f.' + col for col in self._columns), joins)
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY f.filename'
+        rows = self._conn.execute(sql, params).fetchall()
+        return _make_table(rows, self._keywords)
+    
+    def update(self, paths, processes=None):
+        """Add files to the index.  Files already in the index are only read 
+        again if their modification time or size has changed.
+        
+        Args:
+            paths (list of str): The file paths
+            processes (int, optional): The number of worker processes used to
+                                       read the files. If omitted, uses the 
+                                       number of CPUs.
+        
+        Returns:
+            (int): The number of files that were read
+        """
+        known = {filename: (mtime_ns, size) for filename, mtime_ns, size in \
+                 self._conn.execute('SELECT filename, mtime_ns, size FROM files')}
+        
+        stats = {}
+        for path in paths:
+            path = os.path.abspath(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            stat = (stat.st_mtime_ns, stat.st_size)
+            if known.get(path) != stat:
+                stats[path] = stat
+        if not stats:
+            return 0
+        
+        table = scan_headers(list(stats.keys()), keywords=self._keywords, 
+                             processes=processes)
+        with self._conn:
+            for row in table.iterrows():
+                self._replace(row, stats[row[0]])
+        return len(stats)
+    
+    @classmethod
+    def open(cls, file_path):
+        """Open an index, creating it if it does not exist.
+        
+        Args:
+            file_path (str): The file path of the SQLite database
+        
+        Returns:
+            (:class:`ArchiveIndex`)
+        """
+        obj = cls()
+        obj._filename = str(file_path)
+        obj._conn = sqlite3.connect(obj._filename)
+        obj._conn.executescript(cls._schema)
+        return obj
+    
+    def _replace(self, row, stat):
+        """Insert a file, or replace the record of a file that has changed"""
+        row = tuple(None if val is np.ma.masked else val.item() \
+                    if isinstance(val, np.generic) else val for val in row)
+        values = dict(zip(self._columns, row))
+        
+        old = self._conn.execute('SELECT id FROM files WHERE filename = ?', 
+                                 (values['filename'],)).fetchone()
+        if old is not None:
+            self._conn.execute('DELETE FROM files WHERE id = ?', old)
+            self._conn.execute('DELETE FROM files_rtree WHERE id = ?', old)
+        
+        if values['ra_pnt'] is None or values['dec_pnt'] is None:
+            pointing = (None, None, None)
+        else:
+            pointing = tuple(_unit_vector(values['ra_pnt'], values['dec_pnt']))
+        cur = self._conn.execute(
+            'INSERT INTO files ({}, mtime_ns, size, x_pnt, y_pnt, z_pnt) '
+            'VALUES ({})'.format(', '.join(self._columns), 
+                                 ', '.join('?' * (len(self._columns) + 5))),
+            row + stat + pointing)
+        
+        # files with no time range or pointing span the whole R-tree axis, and
+        # are excluded by the exact conditions on the files table
+        tmin = -_rtree_max if values['tstart'] is None else values['tstart']
+        tmax = _rtree_max if values['tstop'] is None else values['tstop']
+        box = [min(tmin, tmax), max(tmin, tmax)]
+        for value in pointing:
+            box += [-2.0, 2.0] if value is None else [value, value]
+        self._conn.execute('INSERT INTO files_rtree VALUES (?, ?, ?, ?, ?, ?, '
+                           '?, ?, ?)', [cur.lastrowid] + box)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __repr__(self):
+        return '<{0}: {1}>'.format(self.__class__.__name__, self._filename)
+
+
+def _unit_vector(ra, dec):
+    """The Cartesian unit vector of an RA and Dec in degrees"""
+    ra = np.deg2rad(ra)
+    dec = np.deg2rad(dec)
+    return np.array([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), 
+                     np.sin(dec)])
+
+
+def _make_table(rows, keywords):
+    """Make a table from rows of (filename, file type, keyword values...), 
+    masking the values that are None.
+    """
+    table = Table(masked=True)
+    names = ('FILENAME', 'FILETYPE') + tuple(keywords)
+    types = (str, str) + tuple(_kw_types[keyword] for keyword in keywords)
+    for i, (name, the_type) in enumerate(zip(names, types)):
+        values = [row[i] for row in rows]
+        mask = np.array([value is None for value in values], dtype=bool)
+        fill = the_type()
+        data = np.array([fill if value is None else value for value in values],
+                        dtype=the_type if the_type is not str else str)
+        table[name] = MaskedColumn(data, mask=mask)
+    return table
+
+
+def _open(path):
+    """Open a file for reading, decompressing it on the fly if it is gzipped.
+    """
+    fp = open(path, 'rb')
+    magic = fp.read(2)
+    fp.seek(0)
+    if magic == b'\x1f\x8b':
+        return gzip.GzipFile(fileobj=fp, mode='rb')
+    return fp
+
+
+def _read_header(fp):
+    """Read the next header from a FITS file, up to and including the END card.
+    
+    Args:
+        fp (file): The open file, positioned at the start of a header
+    
+    Returns:
+        (dict): The card images, keyed by keyword
+    """
+    cards = {}
+    for i in range(_max_header_blocks):
+        block = fp.read(_block_size)
+        if i == 0 and not block.startswith((b'SIMPLE  =', b'XTENSION=')):
+            raise ValueError('not a FITS file')
+        if len(block) < _block_size:
+            raise ValueError('truncated header')
+        block = block.decode('ascii', errors='replace')
+        for j in range(0, _block_size, _card_size):
+            card = block[j:j + _card_size]
+            keyword = card[:8].rstrip()
+            if keyword == 'END':
+                return cards
+            if keyword and keyword not in cards:
+                cards[keyword] = card
+    raise ValueError('no END card')
+
+
+def _card_value(cards, keyword):
+    """The value of a keyword, or None if it is missing or undefined."""
+    card = cards.get(keyword)
+    if card is None:
+        return None
+    value = fits.Card.fromstring(card).value
+    if isinstance(value, fits.card.Undefined):
+        return None
+    return value
+
+
+def _data_size(cards):
+    """The size in bytes of the data unit that follows a header, including
+    the padding to a whole block.
+    """
+    naxis = _card_value(cards, 'NAXIS') or 0
+    if naxis == 0:
+        return 0
+    size = 1
+    for i in range(1, naxis + 1):
+        size *= _card_value(cards, 'NAXIS{}'.format(i))
+    size += _card_value(cards, 'PCOUNT') or 0
+    size *= _card_value(cards, 'GCOUNT') or 1
+    size *= abs(_card_value(cards, 'BITPIX')) // 8
+    return -(-size // _block_size) * _block_size
+
+
+def _scan_file(path, keywords):
+    """Read the PRIMARY header keywords and the file type of a file.
+    
+    Args:
+        path (str): The file path
+        keywords (tuple of str): The keywords
+    
+    Returns:
+        (tuple or str): The file type and the keyword values, or the reason 
+                        the file could not be read.
+    """
+    try:
+        with _open(path) as fp:
+            cards = _read_header(fp)
+            if 'SIMPLE' not in cards:
+                return 'not a FITS file'
+            
+            values = []
+            for keyword in keywords:
+                value = _card_value(cards, keyword)
+                if value is not None:
+                    try:
+                        value = _kw_types[keyword](value)
+                    except (TypeError, ValueError):
+                        value = None
+                values.append(value)
+            
+            # the file type is identified by the first extension
+            file_type = ''
+            fp.seek(_data_size(cards), os.SEEK_CUR)
+            try:
+                extname = _card_value(_read_header(fp), 'EXTNAME')
+                file_type = _extnames.get(extname, '')
+            except ValueError:
+                pass
+    except (OSError, EOFError, ValueError, TypeError) as err:
+        return str(err)
+    
+    return (file_type, tuple(values))
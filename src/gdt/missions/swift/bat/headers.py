@@ -39,11 +39,15 @@
 # the License.
 #
 
+import functools
+
+from astropy.io import fits
 from gdt.core.headers import Header, FileHeaders
-from ..time import Time
+from ..time import met_to_iso
 
 
-__all__ = ['SaoHeaders','PhaHeaders', 'RspHeaders', 'LightcurveHeaders']
+__all__ = ['SaoHeaders', 'AttHeaders', 'PhaHeaders', 'RspHeaders', 
+           'RspGridHeaders', 'LightcurveHeaders']
 
 # mission definitions
 _telescope = 'SWIFT'
@@ -99,20 +103,41 @@ _attflag_card  = ('ATTFLAG',  100, 'Attitude origin: 100=sat/spacecraft')
 _catsrc_card = ('CATSRC',   '', )
 _instrument_card = ('INSTRUME', _instrument, ' Instrument name')
 #----------------
+@functools.lru_cache(maxsize=4096)
+def _met_iso(met):
+    """The ISO string of a MET, as ``Time(met, format='swift').iso``, 
+    memoized since the same TSTART/TSTOP are set on every header of a file"""
+    return met_to_iso(met)
+
+
 class BatHeader(Header):
 
     def __setitem__(self, key, val):
         if not isinstance(key, tuple):
             if key.upper() == 'TSTART':
-                self['DATE-OBS'] = Time(val, format='swift').iso
+                self['DATE-OBS'] = _met_iso(val)
             elif key.upper() == 'TSTOP':
-                self['DATE-END'] = Time(val, format='swift').iso
+                self['DATE-END'] = _met_iso(val)
             else:
                 pass
 
-
         super().__setitem__(key, val)
 
+    def clone(self):
+        """Return a copy of the header.  This is equivalent to a deep copy, but 
+        is much faster since each card is parsed back from its image instead 
+        of rebuilding the header from the keyword template.
+        
+        Returns:
+            (:class:`BatHeader`)
+        """
+        obj = type(self).__new__(type(self))
+        fits.Header.__init__(obj, cards=[fits.Card.fromstring(card.image) 
+                                         for card in self.cards])
+        obj._kw_types = self._kw_types
+        obj.keywords = None
+        return obj
+
 
 class SaoPrimaryHeader(BatHeader):
     name = 'PRIMARY'
@@ -141,6 +166,22 @@ class SaoPreFilterHeader(BatHeader):
                 _object_card, _ra_obj_card, _dec_obj_card, _ra_pnt_card,
                 _dec_pnt_card, _pa_pnt_card, _trigtime_card, _utcfinit_card]
 
+class AttPrimaryHeader(BatHeader):
+    name = 'PRIMARY'
+    keywords = [_telescope_card, _obs_id_card, _timesys_card, _mjdrefi_card,
+                _mjdreff_card, _timeunit_card, _tstart_card, _tstop_card,
+                _date_obs_card, _date_end_card, _clockapp_card, _creator_card,
+                _origin_card, _date_card, _checksum_card, _datasum_card]
+
+
+class AttAttitudeHeader(BatHeader):
+    name = 'ATTITUDE'
+    keywords = [_extname_card, _telescope_card, _obs_id_card, _timesys_card,
+                _mjdrefi_card, _mjdreff_card, _timeunit_card, _tstart_card,
+                _tstop_card, _date_obs_card, _date_end_card, _clockapp_card,
+                _creator_card, _origin_card, _date_card, _checksum_card,
+                _datasum_card]
+
 class PhaPrimaryHeader(BatHeader):
     name='PRIMARY'
     keywords= [_telescope_card, _instrument_card, _obs_id_card,
@@ -291,6 +332,46 @@ class RspEboundsHeader(BatHeader):
      ('HDUVERS', '', 'Version of GTI header'), ('FLUXMETH', '', 'Flux extraction method'), ('DETCHANS', 0, 'Total number of detector channels availalble'),_procver_card, _softver_card,_caldbver_card, _seqpnum_card, _ra_obj_card, _dec_obj_card, _ra_pnt_card, _dec_pnt_card, _pa_pnt_card,
       _catsrc_card, _attflag_card, _utcfinit_card, _checksum_card, _datasum_card]
 
+class RspGridPrimaryHeader(BatHeader):
+    name = 'PRIMARY'
+    keywords = [_telescope_card, _instrument_card, _origin_card, _creator_card,
+                _date_card, ('FILENAME', '', 'Name of this file'),
+                _procver_card, _softver_card, _caldbver_card, _checksum_card, 
+                _datasum_card]
+
+class RspGridMatrixHeader(BatHeader):
+    name = 'SPECRESP GRID'
+    keywords = [_extname_card, 
+                ('HDUCLASS', 'OGIP', 'Conforms to OGIP/GSFC standards'),
+                ('HDUCLAS1', 'RESPONSE', 'Dataset relates to spectral response'),
+                ('HDUCLAS2', 'RSP_GRID', 'Spectral response matrices on a grid'),
+                _telescope_card, _instrument_card, 
+                ('CHANTYPE', 'PI', 'Type of channels (PHA, PI etc)'),
+                ('DETCHANS', 0, 'Total number of detector channels available'),
+                ('NUM_AZ', 0, 'Number of azimuth grid points'),
+                ('NUM_EL', 0, 'Number of elevation grid points'),
+                _checksum_card, _datasum_card]
+
+class RspGridEnergiesHeader(BatHeader):
+    name = 'ENERGIES'
+    keywords = [_extname_card, 
+                ('HDUCLASS', 'OGIP', 'Conforms to OGIP/GSFC standards'),
+                ('HDUCLAS1', 'RESPONSE', 'Dataset relates to spectral response'),
+                ('HDUCLAS2', 'ENERGIES', 'Photon energy bins of the matrices'),
+                _telescope_card, _instrument_card, _checksum_card, 
+                _datasum_card]
+
+class RspGridEboundsHeader(BatHeader):
+    name = 'EBOUNDS'
+    keywords = [_extname_card, 
+                ('HDUCLASS', 'OGIP', 'Conforms to OGIP/GSFC standards'),
+                ('HDUCLAS1', 'RESPONSE', 'Dataset relates to spectral response'),
+                ('HDUCLAS2', 'EBOUNDS', 'Nominal energies of the channels'),
+                _telescope_card, _instrument_card, 
+                ('CHANTYPE', 'PI', 'Type of channels (PHA, PI etc)'),
+                ('DETCHANS', 0, 'Total number of detector channels available'),
+                _checksum_card, _datasum_card]
+
 class LcPrimaryHeader(BatHeader):
      name = 'PRIMARY'
      keywords=[_telescope_card, _instrument_card, _obs_id_card,_targ_id_card, _seg_num_card,_timesys_card,
@@ -379,14 +460,32 @@ class LcStdgtiHeader(BatHeader):
 #-------------------------------------
 
 
-class RspHeaders(FileHeaders):
+class BatFileHeaders(FileHeaders):
+    """Base class for the BAT file headers.  The header templates are built 
+    once on import, and each new set of headers is cloned from them rather than 
+    deep copied.
+    """
+    def __init__(self):
+        self._headers = {h.name: h.clone() for h in self._header_templates}
+        self._header_templates = None
+        self.update()
+
+
+class RspHeaders(BatFileHeaders):
     _header_templates = [RspPrimaryHeader(), RspSpecHeader(), RspEboundsHeader()]
 
-class SaoHeaders(FileHeaders):
+class RspGridHeaders(BatFileHeaders):
+    _header_templates = [RspGridPrimaryHeader(), RspGridMatrixHeader(), 
+                         RspGridEnergiesHeader(), RspGridEboundsHeader()]
+
+class SaoHeaders(BatFileHeaders):
     _header_templates = [SaoPrimaryHeader(), SaoPreFilterHeader()]
 
-class PhaHeaders(FileHeaders):
+class AttHeaders(BatFileHeaders):
+    _header_templates = [AttPrimaryHeader(), AttAttitudeHeader()]
+
+class PhaHeaders(BatFileHeaders):
     _header_templates =[PhaPrimaryHeader(), PhaSpectrumHeader(), PhaEboundsHeader(), PhaStdgtiHeader()]
 
-class LightcurveHeaders(FileHeaders):
+class LightcurveHeaders(BatFileHeaders):
     _header_templates = [LcPrimaryHeader(), LcRateHeader(), LcEboundsHeader(), LcStdgtiHeader()]
@@ -38,6 +38,8 @@
 # License for the specific language governing permissions and limitations under
 # the License.
 #
+from functools import reduce
+
 import numpy as np
 import astropy.io.fits as fits
 
@@ -47,15 +49,29 @@ from gdt.core.file import FitsFileContextManager
 from .headers import PhaHeaders
 from ..time import Time
 
-__all__ = ['BatPha']
+__all__ = ['BatPha', 'BatPhaStack']
 
 
 class BatPha(Pha):
     def __init__(self):
         super().__init__()
+        self._stat_err = None
+        self._sys_err = None
     """PHA class for BAT spectra.
     """
 
+    @property
+    def stat_err(self):
+        """(np.array): The statistical uncertainty of the rates, as read from
+        the file. None unless opened with ``read_errors=True``."""
+        return self._stat_err
+
+    @property
+    def sys_err(self):
+        """(np.array): The systematic uncertainty of the rates, as read from
+        the file. None unless opened with ``read_errors=True``."""
+        return self._sys_err
+
     @classmethod
     def from_data(cls, data, gti=None, trigger_time=None, filename=None,
                   headers=None, channel_mask=None, header_type=PhaHeaders,
@@ -144,58 +160,60 @@ class BatPha(Pha):
 
 
     @classmethod
-    def open(cls, file_path, **kwargs):
+    def open(cls, file_path, read_errors=False, **kwargs):
         """Open a BAT Pha FITS file and return the BatPha object
 
         Args:
             file_path (str): The file path of the FITS file
+            read_errors (bool, optional): If True, also read the STAT_ERR and
+                                          SYS_ERR columns, which are available
+                                          as :attr:`stat_err` and 
+                                          :attr:`sys_err`. Default is False.
 
         Returns:
             (:class:`BatPha`)
         """
+        with super(Pha, cls).open(file_path, **kwargs) as obj:
+            trigtime = None
 
-        obj = super(Pha, cls).open(file_path, **kwargs)
-        trigtime = None
-
-        # get the headers
-        hdrs = [hdu.header for hdu in obj.hdulist]
-
-        if 'TRIGTIME' in hdrs[0].keys():
-            headers = PhaHeaders.from_headers(hdrs)
-            trigtime = float(headers['PRIMARY']['TRIGTIME'])
-
-        else:
+            # get the headers
+            hdrs = [hdu.header for hdu in obj.hdulist]
             headers = PhaHeaders.from_headers(hdrs)
+            if 'TRIGTIME' in hdrs[0].keys():
+                trigtime = float(headers['PRIMARY']['TRIGTIME'])
 
-        #if 'TSTART' in hdrs[0].keys():
-        tstart = float(headers['PRIMARY']['TSTART'])
-        tstop =  float(headers['PRIMARY']['TSTOP'])
-
-
-        # the channel energy bounds
-        ebounds = Ebounds.from_bounds(obj.column(2, 'E_MIN'),
-                                      obj.column(2, 'E_MAX'))
-
-        channel = obj.column(1,'CHANNEL')
-        rate = obj.column(1, 'RATE')
-        stat_err = obj.column(1, 'STAT_ERR')
-        sys_err = obj.column(1, 'SYS_ERR')
+            # each table is decoded once, and only the needed columns copied
+            spectrum = obj.hdulist[1].data
+            ebounds = obj.hdulist[2].data
+            stdgti = obj.hdulist[3].data
 
-        #the good time intervals
-        stdgti_start = obj.column(3, 'START')
-        stdgti_stop = obj.column(3, 'STOP')
-        if trigtime is not None:
-            stdgti_start -= trigtime
-            stdgti_stop -= trigtime
-        stdgti = Gti.from_bounds(stdgti_start, stdgti_stop)
-
-        exposure = headers['SPECTRUM']['EXPOSURE']
-        counts = obj.column(1, 'RATE') * exposure
-        data = EnergyBins(counts, obj.column(2, 'E_MIN'), obj.column(2, 'E_MAX'), exposure,
-                        )
-        return cls.from_data(data, gti=stdgti, trigger_time=trigtime,
-                                filename=obj.filename, headers=headers)
+            # the channel energy bounds
+            emin = np.array(ebounds['E_MIN'])
+            emax = np.array(ebounds['E_MAX'])
 
+            #the good time intervals
+            stdgti_start = np.array(stdgti['START'])
+            stdgti_stop = np.array(stdgti['STOP'])
+            if trigtime is not None:
+                stdgti_start -= trigtime
+                stdgti_stop -= trigtime
+            stdgti = Gti.from_bounds(stdgti_start, stdgti_stop)
+
+            exposure = headers['SPECTRUM']['EXPOSURE']
+            counts = spectrum['RATE'] * exposure
+            data = EnergyBins(counts, emin, emax, exposure)
+            
+            if read_errors:
+                stat_err = np.array(spectrum['STAT_ERR'])
+                sys_err = np.array(spectrum['SYS_ERR'])
+            filename = obj.filename
+            
+        pha = cls.from_data(data, gti=stdgti, trigger_time=trigtime,
+                            filename=filename, headers=headers)
+        if read_errors:
+            pha._stat_err = stat_err
+            pha._sys_err = sys_err
+        return pha
 
     def _build_hdulist(self):
 
@@ -283,3 +301,423 @@ class BatPha(Pha):
         hdu.header.comments['TIMEZERO'] = 'Zero-point offset for TIME column'
 
         return hdu
+
+
+class BatPhaStack():
+    """A stack of BAT spectra that share the same energy channels, such as a 
+    time-resolved series of spectra over a burst.
+    
+    The counts of all spectra are held in a single (number of spectra, 
+    number of channels) array, with a single :class:`Ebounds` for the stack,
+    so that operations on the stack (slicing and rebinning in energy, slicing 
+    and summing in time) are done on the whole array at once.  The spectra are
+    ordered by start time.
+    
+    A :class:`BatPha` for an individual spectrum is made on demand by indexing
+    the stack, so only the spectra that are used are built.
+    """
+    def __init__(self):
+        self._counts = np.empty((0, 0))
+        self._exposure = np.empty(0)
+        self._ebounds = None
+        self._emin = np.empty(0)
+        self._emax = np.empty(0)
+        self._tstart = np.empty(0)
+        self._tstop = np.empty(0)
+        self._trigtime = None
+        self._gtis = []
+        self._headers = []
+        self._filenames = []
+
+    @property
+    def counts(self):
+        """(np.array): The counts, of shape (``num_spectra``, ``num_chans``)"""
+        return self._counts
+
+    @property
+    def ebounds(self):
+        """(:class:`~gdt.core.data_primitives.Ebounds`): The energy bounds"""
+        return self._ebounds
+
+    @property
+    def energy_range(self):
+        """(float, float): The energy range of the spectra"""
+        return self._ebounds.range
+
+    @property
+    def exposure(self):
+        """(np.array): The exposure of each spectrum"""
+        return self._exposure
+
+    @property
+    def filenames(self):
+        """(list of str): The filename of each spectrum"""
+        return self._filenames
+
+    @property
+    def num_chans(self):
+        """(int): The number of energy channels"""
+        return self._counts.shape[1]
+
+    @property
+    def num_spectra(self):
+        """(int): The number of spectra"""
+        return self._counts.shape[0]
+
+    @property
+    def rates(self):
+        """(np.array): The count rates, of shape (``num_spectra``, 
+        ``num_chans``)"""
+        exposure = self._exposure[:, np.newaxis]
+        return np.divide(self._counts, exposure, 
+                         out=np.zeros_like(self._counts, dtype=float), 
+                         where=(exposure > 0.0))
+
+    @property
+    def time_range(self):
+        """(float, float): The time range of the stack"""
+        return (self._tstart.min(), self._tstop.max())
+
+    @property
+    def trigtime(self):
+        """(float): The trigger time of the data, if available"""
+        return self._trigtime
+
+    @property
+    def tstart(self):
+        """(np.array): The start time of each spectrum"""
+        return self._tstart
+
+    @property
+    def tstop(self):
+        """(np.array): The stop time of each spectrum"""
+        return self._tstop
+
+    def integrate_time(self, tstart=None, tstop=None):
+        """Sum the spectra that overlap a time range into a single spectrum.
+        
+        Args:
+            tstart (float, optional): The start of the time range. If omitted,
+                                      starts at the beginning of the stack.
+            tstop (float, optional): The end of the time range. If omitted,
+                                     ends at the end of the stack.
+        
+        Returns:
+            (:class:`BatPha`)
+        """
+        stack = self.slice_time(tstart, tstop)
+        if stack.num_spectra == 0:
+            raise ValueError('No spectra in the time range')
+        
+        exposure = stack._exposure.sum()
+        data = EnergyBins(stack._counts.sum(axis=0), self._emin, self._emax, 
+                          exposure)
+        gti = reduce(Gti.merge, stack._gtis)
+        
+        # the headers of the first spectrum are used as a template, if there 
+        # are any
+        if stack._headers[0] is None:
+            headers = PhaHeaders()
+        else:
+            headers = stack._headers[0].copy()
+        tmin, tmax = stack.time_range
+        offset = 0.0 if self._trigtime is None else self._trigtime
+        for hdr in headers:
+            hdr['TSTART'] = tmin + offset
+            hdr['TSTOP'] = tmax + offset
+            if self._trigtime is not None:
+                hdr['TRIGTIME'] = self._trigtime
+        headers['SPECTRUM']['EXPOSURE'] = exposure
+        headers['SPECTRUM']['TELAPSE'] = tmax - tmin
+        return BatPha.from_data(data, gti=gti, trigger_time=self._trigtime,
+                                headers=headers)
+
+    def rebin_energy(self, method, *args):
+        """Rebin all spectra in energy given a rebinning method.
+        
+        The same binning is applied to every spectrum, so that the stack 
+        keeps a single set of energy channels.  For binning methods that 
+        depend on the counts (e.g. a signal-to-noise criterion), the binning 
+        is determined from the sum of the spectra.
+        
+        Args:
+            method (<function>): The rebinning function
+            *args: Arguments to be passed to the rebinning function
+        
+        Returns:
+            (:class:`BatPhaStack`)
+        """
+        emin = self._emin
+        emax = self._emax
+        if not np.all(emax[:-1] == emin[1:]):
+            raise ValueError('Energy channels must be contiguous to rebin')
+        edges = np.append(emin, emax[-1])
+        
+        total = self._counts.sum(axis=0)
+        exposure = np.full(self.num_chans, self._exposure.sum())
+        new_edges = method(total, np.sqrt(total), exposure, edges, *args)[3]
+        
+        # the channel index at which each new bin starts, and the channels 
+        # beyond the last new edge are dropped
+        idx = np.searchsorted(edges, new_edges)
+        counts = np.add.reduceat(self._counts[:, :idx[-1]], idx[:-1], axis=1)
+        return self._from_stack(counts, new_edges[:-1], new_edges[1:])
+
+    def slice_energy(self, energy_ranges):
+        """Slice all spectra by one or more energy ranges. The channels that 
+        overlap with any of the energy ranges are kept.
+        
+        Args:
+            energy_ranges ([(float, float), ...]): 
+                The energy ranges to slice the data to.
+        
+        Returns:
+            (:class:`BatPhaStack`)
+        """
+        energy_ranges = np.asarray(energy_ranges, dtype=float)
+        if energy_ranges.ndim == 1:
+            energy_ranges = energy_ranges[np.newaxis, :]
+        mask = np.zeros(self.num_chans, dtype=bool)
+        for lo, hi in energy_ranges:
+            mask |= (self._emin < hi) & (self._emax > lo)
+        return self._from_stack(self._counts[:, mask], self._emin[mask], 
+                                self._emax[mask])
+
+    def slice_time(self, tstart=None, tstop=None):
+        """Select the spectra that overlap a time range.  The counts of the 
+        returned stack are a view into this stack.
+        
+        Args:
+            tstart (float, optional): The start of the time range. If omitted,
+                                      starts at the beginning of the stack.
+            tstop (float, optional): The end of the time range. If omitted,
+                                     ends at the end of the stack.
+        
+        Returns:
+            (:class:`BatPhaStack`)
+        """
+        mask = np.ones(self.num_spectra, dtype=bool)
+        if tstart is not None:
+            mask &= (self._tstop > tstart)
+        if tstop is not None:
+            mask &= (self._tstart < tstop)
+        idx = np.flatnonzero(mask)
+        if idx.size == 0:
+            select = slice(0, 0)
+        elif idx[-1] - idx[0] + 1 == idx.size:
+            select = slice(idx[0], idx[-1] + 1)
+        else:
+            select = idx
+        
+        return self._from_stack(self._counts[select], self._emin, self._emax,
+                                select=select)
+
+    @classmethod
+    def from_data(cls, counts, emin, emax, exposure, tstart, tstop, 
+                  trigger_time=None, gtis=None, headers=None, filenames=None):
+        """Create a stack from arrays.
+        
+        Args:
+            counts (np.array): The counts, of shape (number of spectra, number
+                               of channels)
+            emin (np.array): The low energy edge of each channel
+            emax (np.array): The high energy edge of each channel
+            exposure (np.array): The exposure of each spectrum
+            tstart (np.array): The start time of each spectrum
+            tstop (np.array): The stop time of each spectrum
+            trigger_time (float, optional): The trigger time, if applicable. 
+                                            If provided, the times are 
+                                            relative to the trigger time.
+            gtis (list of :class:`~gdt.core.data_primitives.Gti`, optional):
+                The good time intervals of each spectrum. If omitted, uses
+                (tstart, tstop) of each spectrum.
+            headers (list of :class:`~.headers.PhaHeaders`, optional):
+                The file headers of each spectrum
+            filenames (list of str, optional): The filename of each spectrum
+        
+        Returns:
+            (:class:`BatPhaStack`)
+        """
+        counts = np.asarray(counts, dtype=float)
+        if counts.ndim != 2:
+            raise ValueError('counts must be a 2D array')
+        num_spectra, num_chans = counts.shape
+        emin = np.asarray(emin)
+        emax = np.asarray(emax)
+        if emin.size != num_chans or emax.size != num_chans:
+            raise ValueError('emin and emax must have one value per channel')
+        exposure = np.asarray(exposure, dtype=float).reshape(-1)
+        tstart = np.asarray(tstart, dtype=float).reshape(-1)
+        tstop = np.asarray(tstop, dtype=float).reshape(-1)
+        for arr in (exposure, tstart, tstop):
+            if arr.size != num_spectra:
+                raise ValueError('exposure, tstart, and tstop must have one '
+                                 'value per spectrum')
+        if trigger_time is not None and trigger_time < 0.0:
+            raise ValueError('trigger_time must be non-negative')
+        
+        if headers is None:
+            headers = [None] * num_spectra
+        else:
+            headers = list(headers)
+            if len(headers) != num_spectra:
+                raise ValueError('headers must have one set per spectrum')
+            for hdrs in headers:
+                if not isinstance(hdrs, PhaHeaders):
+                    raise TypeError('headers must be of type PhaHeaders')
+        if filenames is None:
+            filenames = [None] * num_spectra
+        elif len(filenames) != num_spectra:
+            raise ValueError('filenames must have one per spectrum')
+        
+        if gtis is None:
+            gtis = [Gti.from_bounds([t0], [t1]) for t0, t1 in zip(tstart, 
+                                                                   tstop)]
+        else:
+            gtis = list(gtis)
+            if len(gtis) != num_spectra:
+                raise ValueError('gtis must have one per spectrum')
+        
+        # order by start time
+        order = np.argsort(tstart, kind='stable')
+        obj = cls()
+        obj._counts = counts[order] if np.any(np.diff(order) != 1) else counts
+        obj._exposure = exposure[order]
+        obj._set_ebounds(emin, emax)
+        obj._tstart = tstart[order]
+        obj._tstop = tstop[order]
+        obj._trigtime = trigger_time
+        obj._gtis = [gtis[i] for i in order]
+        obj._headers = [headers[i] for i in order]
+        obj._filenames = [filenames[i] for i in order]
+        return obj
+
+    @classmethod
+    def from_phas(cls, phas):
+        """Create a stack from a list of BatPha objects that have identical
+        energy channels. The times of all spectra are made relative to the 
+        trigger time of the first spectrum.
+        
+        Args:
+            phas (list of :class:`BatPha`): The spectra
+        
+        Returns:
+            (:class:`BatPhaStack`)
+        """
+        phas = list(phas)
+        if len(phas) == 0:
+            raise ValueError('At least one spectrum is required')
+        
+        emin = phas[0].data.lo_edges
+        emax = phas[0].data.hi_edges
+        trigtime = phas[0].trigtime
+        counts = np.empty((len(phas), emin.size))
+        exposure = np.empty(len(phas))
+        tstart = np.empty(len(phas))
+        tstop = np.empty(len(phas))
+        gtis = []
+        for i, pha in enumerate(phas):
+            if not np.array_equal(pha.data.lo_edges, emin) or \
+               not np.array_equal(pha.data.hi_edges, emax):
+                raise ValueError('All spectra must have the same energy '
+                                 'channels')
+            counts[i] = pha.data.counts
+            exposure[i] = pha.exposure
+            tstart[i], tstop[i] = pha.time_range
+            gti = pha.gti
+            # times relative to the trigger time of the stack
+            if pha.trigtime != trigtime:
+                offset = (pha.trigtime or 0.0) - (trigtime or 0.0)
+                tstart[i] += offset
+                tstop[i] += offset
+                gti = Gti.from_bounds(np.asarray(gti.low_edges()) + offset,
+                                      np.asarray(gti.high_edges()) + offset)
+            gtis.append(gti)
+        
+        return cls.from_data(counts, emin, emax, exposure, tstart, tstop, 
+                             trigger_time=trigtime, gtis=gtis,
+                             headers=[pha.headers for pha in phas],
+                             filenames=[pha.filename for pha in phas])
+
+    @classmethod
+    def open(cls, file_paths, **kwargs):
+        """Open a list of BAT PHA files with identical energy channels into a
+        stack.
+        
+        Args:
+            file_paths (list of str): The file paths of the FITS files
+            **kwargs: Options passed to :meth:`BatPha.open`
+        
+        Returns:
+            (:class:`BatPhaStack`)
+        """
+        return cls.from_phas([BatPha.open(file_path, **kwargs) \
+                              for file_path in file_paths])
+
+    def _from_stack(self, counts, emin, emax, select=None):
+        """A new stack with different counts and/or energy channels, keeping 
+        the times and headers of this stack, or of a selection of spectra"""
+        obj = type(self)()
+        obj._counts = counts
+        obj._set_ebounds(emin, emax)
+        obj._trigtime = self._trigtime
+        if select is None:
+            select = slice(None)
+        obj._exposure = self._exposure[select]
+        obj._tstart = self._tstart[select]
+        obj._tstop = self._tstop[select]
+        idx = np.arange(self.num_spectra)[select]
+        obj._gtis = [self._gtis[i] for i in idx]
+        obj._headers = [self._headers[i] for i in idx]
+        obj._filenames = [self._filenames[i] for i in idx]
+        return obj
+
+    def _set_ebounds(self, emin, emax):
+        self._emin = np.asarray(emin)
+        self._emax = np.asarray(emax)
+        self._ebounds = Ebounds.from_bounds(self._emin, self._emax)
+
+    def __getitem__(self, index):
+        if not isinstance(index, (int, np.integer)):
+            raise TypeError('index must be an integer')
+        if index < 0:
+            index += self.num_spectra
+        if index < 0 or index >= self.num_spectra:
+            raise IndexError('Out of range for {} spectra'.format(
+                             self.num_spectra))
+        
+        data = EnergyBins(self._counts[index], self._emin, self._emax, 
+                          self._exposure[index])
+        
+        headers = self._headers[index]
+        if headers is None:
+            headers = PhaHeaders()
+            offset = 0.0 if self._trigtime is None else self._trigtime
+            for hdr in headers:
+                hdr['TSTART'] = self._tstart[index] + offset
+                hdr['TSTOP'] = self._tstop[index] + offset
+                if self._trigtime is not None:
+                    hdr['TRIGTIME'] = self._trigtime
+            headers['SPECTRUM']['EXPOSURE'] = self._exposure[index]
+        
+        return BatPha.from_data(data, gti=self._gtis[index], 
+                                trigger_time=self._trigtime, 
+                                filename=self._filenames[index], 
+                                headers=headers)
+
+    def __iter__(self):
+        for i in range(self.num_spectra):
+            yield self[i]
+
+    def __len__(self):
+        return self.num_spectra
+
+    def __repr__(self):
+        s = '<{0}: {1} spectra;'.format(self.__class__.__name__, 
+                                         self.num_spectra)
+        if self._trigtime is not None:
+            s += '\n trigger time: {};'.format(self._trigtime)
+        if self.num_spectra > 0:
+            s += '\n time range {};'.format(self.time_range)
+        s += '\n energy range {}>'.format(self.energy_range)
+        return s
@@ -38,24 +38,136 @@
 # License for the specific language governing permissions and limitations under
 # the License.
 #
+import gzip
+from collections import OrderedDict
+from pathlib import Path
+
 import astropy.io.fits as fits
 import numpy as np
+from scipy import sparse
 
+from gdt.core.file import FitsFileContextManager
 from gdt.core.response import *
-from gdt.core.data_primitives import Ebounds, ResponseMatrix
-from .headers import RspHeaders
+from gdt.core.data_primitives import Bins, Ebounds, ResponseMatrix
+from ..frame import radec_to_azel
+from .headers import RspGridHeaders, RspHeaders
+
+__all__ = ['BatRsp', 'BatRspGrid', 'BatRspSeries', 'SparseResponseMatrix']
 
-__all__ = ['BatRsp']
+# the big-endian types of the binary table formats
+_table_dtypes = {'I': '>i2', 'J': '>i4', 'E': '>f4', 'D': '>f8'}
 
 class BatRsp(Rsp):
     """Class for BAT single-DRM response files.
     """
+    def __init__(self):
+        super().__init__()
+        self._fold_cache = None
+
+    def fold_model(self, function, params, channel_mask=None, exposure=1.0):
+        """Fold a photon model through the DRM for many sets of parameters at
+        once, e.g. over a parameter grid.  The model is evaluated for each set
+        of parameters and the spectra are folded with :meth:`fold_spectra`.
+
+        Args:
+            function (<function>): 
+                A photon spectrum function.  The function must accept a list of 
+                function parameters as its first argument and an array of photon 
+                energies as its second argument.  The function must return the 
+                evaluation of the photon model in units of ph/s-cm^2-keV.
+            params (np.array): The parameter sets, of shape 
+                               (num_sets, num_params)
+            channel_mask (np.array, optional): 
+                A Boolean mask where True indicates the channel is to be used 
+                for folding and False indicates the channel is to not be used 
+                for folding.  If omitted, all channels are used.
+            exposure (float or np.array, optional): The exposure in seconds, 
+                either one for all or one for each set. Default is 1.
+
+        Returns:
+            (np.array): The count spectra, of shape (num_sets, num_chans)
+        """
+        params = np.asarray(params, dtype=float)
+        if params.ndim != 2:
+            raise ValueError('params must be a 2-dimensional array of '
+                             'parameter sets')
+        centroids = self.drm.photon_bin_centroids
+        photon_flux = np.empty((params.shape[0], centroids.size))
+        for i in range(params.shape[0]):
+            photon_flux[i] = function(params[i], centroids)
+        return self.fold_spectra(photon_flux, channel_mask=channel_mask, 
+                                 exposure=exposure)
+
+    def fold_spectra(self, photon_flux, channel_mask=None, exposure=1.0):
+        """Fold many photon spectra through the DRM with a single matrix 
+        multiply.  The DRM, weighted by the photon bin widths, is converted to
+        a contiguous float64 array (or a CSR matrix for a 
+        :class:`SparseResponseMatrix`) on the first call and reused.
+
+        Args:
+            photon_flux (np.array): The photon spectra in ph/s-cm^2-keV, 
+                                    evaluated at the photon bin centroids, of 
+                                    shape (num_spectra, num_ebins) or 
+                                    (num_ebins,)
+            channel_mask (np.array, optional): 
+                A Boolean mask where True indicates the channel is to be used 
+                for folding and False indicates the channel is to not be used 
+                for folding.  If omitted, all channels are used.
+            exposure (float or np.array, optional): The exposure in seconds, 
+                either one for all or one for each spectrum. Default is 1.
+
+        Returns:
+            (np.array): The count spectra, of shape (num_spectra, num_chans) or
+                        (num_chans,)
+        """
+        photon_flux = np.asarray(photon_flux, dtype=float)
+        if photon_flux.shape[-1] != self.num_ebins:
+            raise ValueError('photon_flux must have {} photon bins'.format(
+                             self.num_ebins))
+        exposure = np.asarray(exposure, dtype=float)
+        if np.any(exposure <= 0.0):
+            raise ValueError('exposure must be positive')
+        
+        fold_matrix = self._fold_matrix()
+        if isinstance(fold_matrix, np.ndarray):
+            counts = photon_flux @ fold_matrix
+        else:
+            counts = (fold_matrix @ photon_flux.T).T
+        if channel_mask is not None:
+            counts = counts[..., channel_mask]
+        
+        if exposure.ndim > 0:
+            if (photon_flux.ndim != 2) or \
+               (exposure.shape != photon_flux.shape[:1]):
+                raise ValueError('exposure must be a float or have one value '
+                                 'for each spectrum')
+            exposure = exposure[:, np.newaxis]
+        return counts * exposure
+
     @classmethod
-    def open(cls, file_path, **kwargs):
+    def open(cls, file_path, sparse=False, zero_copy=False, **kwargs):
         """Read a single-DRM response file from disk.
+        
+        The rows of the MATRIX column are decoded with the channel groups 
+        given by the N_GRP, F_CHAN and N_CHAN columns.  If ``sparse`` is True,
+        the DRM is kept as a :class:`SparseResponseMatrix` holding only the 
+        nonzero elements, and folding, rebinning and resampling run on the 
+        sparse form.
+        
+        If ``zero_copy`` is True, the DRM is a read-only view of the MATRIX 
+        column in a memory map of the file, rather than a copy, so processes 
+        that open the same file share its pages.  The view keeps the 
+        big-endian float32 layout of the file.  This only applies to 
+        uncompressed files with a full row of channels in each MATRIX row; 
+        otherwise, the DRM is a read-only copy.  The other columns are small
+        and are always copied.
 
         Args:
             file_path (str): The file path
+            sparse (bool, optional): If True, store the DRM as a sparse matrix.
+                                     Default is False.
+            zero_copy (bool, optional): If True, map the DRM from the file. 
+                                        Default is False.
 
         Returns:
            (:class:`BatRsp`)
@@ -79,20 +191,47 @@ class BatRsp(Rsp):
         tstart = headers['SPECRESP MATRIX']['TSTART']
         tstop = headers['SPECRESP MATRIX']['TSTOP']
 
+        drm_hdu = obj.hdulist['SPECRESP MATRIX']
+        drm_data = drm_hdu.data
+        ebounds_data = obj.hdulist['EBOUNDS'].data
+        emin = obj.column(2, 'E_MIN')
+        emax = obj.column(2, 'E_MAX')
+        num_chans = emin.size
+        fchan = np.copy(drm_data['F_CHAN'])
+        nchan = np.copy(drm_data['N_CHAN'])
+        ngrp = np.copy(drm_data['N_GRP'])
+        
+        # the channel number of the first matrix column
+        tlmin = 'TLMIN{}'.format(drm_data.columns.names.index('F_CHAN') + 1)
+        first_chan = drm_hdu.header.get(tlmin, ebounds_data['CHANNEL'][0])
 
-        ebounds = Ebounds.from_bounds(obj.column(2, 'E_MIN'),
-                                      obj.column(2, 'E_MAX'))
-
-        num_ebins =  obj.hdulist['SPECRESP MATRIX'].header['NUMGRP']
-        num_chans = obj.hdulist['SPECRESP MATRIX'].header['DETCHANS']
-        fchan = np.copy(obj.column(1, 'F_CHAN'))
-        nchan = np.copy(obj.column(1, 'N_CHAN'))
-        ngrp = np.copy(obj.column(1, 'N_GRP'))
-
-
-        drm = ResponseMatrix(obj.column(1, 'MATRIX'), obj.column(1, 'ENERG_LO'),
-                            obj.column(1, 'ENERG_HI'),  obj.column(2, 'E_MIN'),
-                            obj.column(2, 'E_MAX'))
+        # a fixed-width matrix of full rows is used as is, anything else is
+        # decoded from the channel groups
+        matrix = drm_data['MATRIX']
+        full_rows = (matrix.dtype != object) and (matrix.ndim == 2) and \
+                    (matrix.shape[1] == num_chans) and \
+                    (fchan.dtype != object) and (fchan.ndim == 1) and \
+                    np.all(ngrp == 1) and np.all(fchan == first_chan) and \
+                    np.all(nchan == num_chans)
+        elo = obj.column(1, 'ENERG_LO')
+        ehi = obj.column(1, 'ENERG_HI')
+        if sparse or not full_rows:
+            drm = SparseResponseMatrix.from_groups(matrix, ngrp, fchan, nchan,
+                                                   elo, ehi, emin, emax, 
+                                                   first_chan=first_chan)
+            if not sparse:
+                drm = drm.to_dense()
+                fchan = np.full(elo.size, first_chan, dtype=int)
+                nchan = np.full(elo.size, num_chans, dtype=int)
+                ngrp = np.ones(elo.size, dtype=int)
+        elif zero_copy and cls._is_uncompressed(file_path):
+            matrix = cls._map_column(file_path, obj.hdulist, 'SPECRESP MATRIX',
+                                     'MATRIX')
+            drm = ResponseMatrix(matrix, elo, ehi, emin, emax)
+        else:
+            drm = ResponseMatrix(obj.column(1, 'MATRIX'), elo, ehi, emin, emax)
+        if zero_copy and not sparse:
+            drm.matrix.flags.writeable = False
 
         obj.close()
 
@@ -106,13 +245,127 @@ class BatRsp(Rsp):
 
         return obj
 
+    @staticmethod
+    def _is_uncompressed(file_path):
+        """Check if a file is an uncompressed FITS file.
+
+        Args:
+            file_path (str): The file path
+
+        Returns:
+            (bool)
+        """
+        with open(file_path, 'rb') as f:
+            return f.read(6) == b'SIMPLE'
+
+    @staticmethod
+    def _map_column(file_path, hdulist, extname, col_name):
+        """Return a read-only view of a fixed-width table column in a memory
+        map of the file.
+
+        Args:
+            file_path (str): The file path
+            hdulist (astropy.io.fits.HDUList): The open file
+            extname (str): The name of the table extension
+            col_name (str): The name of the column
+
+        Returns:
+            (np.array)
+        """
+        index = hdulist.index_of(extname)
+        hdu = hdulist[index]
+        col_dtype, col_offset = hdu.columns.dtype.fields[col_name][:2]
+        # FITS tables are big endian
+        dtype = col_dtype.base.newbyteorder('>')
+        
+        # each row is NAXIS1 bytes, and a multi-dimensional cell is C ordered
+        cell_strides = ()
+        stride = dtype.itemsize
+        for size in reversed(col_dtype.shape):
+            cell_strides = (stride,) + cell_strides
+            stride *= size
+        
+        mmap = np.memmap(file_path, dtype=np.uint8, mode='r')
+        offset = hdulist.fileinfo(index)['datLoc'] + col_offset
+        return np.ndarray((hdu.header['NAXIS2'],) + col_dtype.shape, 
+                          dtype=dtype, buffer=mmap, offset=offset,
+                          strides=(hdu.header['NAXIS1'],) + cell_strides)
+
+    def _fold_matrix(self):
+        """The DRM weighted by the photon bin widths, as a contiguous float64
+        array of shape (num_ebins, num_chans), or for a sparse DRM as the 
+        transposed CSR matrix.  This is built once for each DRM.
+
+        Returns:
+            (np.array or scipy.sparse.csr_matrix)
+        """
+        if (self._fold_cache is None) or (self._fold_cache[0] is not self.drm):
+            widths = np.asarray(self.drm.photon_bin_widths, dtype=float)
+            if isinstance(self.drm, SparseResponseMatrix):
+                csr = self.drm.sparse_matrix.astype(float)
+                fold_matrix = (sparse.diags(widths) @ csr).T.tocsr()
+            else:
+                fold_matrix = np.ascontiguousarray(self.drm.matrix, 
+                                                   dtype=float) * \
+                              widths[:, np.newaxis]
+            self._fold_cache = (self.drm, fold_matrix)
+        return self._fold_cache[1]
+
+    def write(self, directory, filename=None, overwrite=False, compress=False,
+              compresslevel=6, **kwargs):
+        """Write the response to disk.
+        
+        The rows of each table of a dense DRM are filled into one 
+        preallocated buffer, from which the table HDU is built.  The file is 
+        compressed with gzip as it is written if ``compress`` is True or the 
+        filename ends with '.gz'.
+
+        Args:
+            directory (str): The directory to write the file
+            filename (str, optional): The filename.  If omitted, uses the 
+                                      :attr:`filename` if set.
+            overwrite (bool, optional): If True, overwrite an existing file.
+                                        Default is False.
+            compress (bool, optional): If True, compress the file with gzip.
+                                       Default is False.
+            compresslevel (int, optional): The gzip compression level, from 1 
+                                           (fastest) to 9. Default is 6.
+            **kwargs (optional): keywords passed to 
+                                 :meth:`astropy.io.fits.HDUList.writeto()`
+        """
+        if (self.filename is None) and (filename is None):
+            raise NameError('Filename not set')
+        if filename is None:
+            filename = self.filename
+        
+        try:
+            self.headers['PRIMARY']['FILENAME'] = filename
+        except:
+            pass
+        try:
+            self.headers['PRIMARY']['CREATOR'] = self.headers.creator()[1]
+        except:
+            pass
+        if self.headers is not None:
+            self.headers.update()
+        
+        path = Path(directory) / filename
+        if path.exists() and not overwrite:
+            raise OSError('File {} already exists. Use overwrite=True to '
+                          'replace it'.format(path))
+        if compress or (path.suffix == '.gz'):
+            fileobj = gzip.open(path, 'wb', compresslevel=compresslevel)
+        else:
+            fileobj = open(path, 'wb')
+        
+        with fileobj:
+            self.hdulist.writeto(fileobj, checksum=True, **kwargs)
+
     def _build_hdulist(self):
 
         # create FITS and primary header
         hdulist = fits.HDUList()
         primary_hdu = fits.PrimaryHDU(header=self.headers['PRIMARY'])
-        for key, val in self.headers['PRIMARY'].items():
-            primary_hdu.header[key] = val
         hdulist.append(primary_hdu)
 
         # the drm extension
@@ -133,42 +386,1392 @@ class BatRsp(Rsp):
         headers['SPECRESP MATRIX']['NUMGRP'] = num_ebins
         return headers
 
+    def _drm_columns(self):
+        """The columns of the SPECRESP MATRIX extension of a dense DRM, with a
+        full row of channels in each MATRIX row.  The channel groups are 
+        those of a full row, rather than any left over from a response that 
+        was rebinned or resampled.
+
+        Returns:
+            (list of tuple, int): The name, format, unit and values of each 
+                                  column, and the number of the first channel
+        """
+        num_ebins = self.num_ebins
+        first_chan = 0
+        if (self._fchan is not None) and (np.size(self._fchan) > 0):
+            first_chan = int(np.min(self._fchan))
+        photon_bins = self.drm.photon_bins
+        columns = [('ENERG_LO', 'E', 'keV', photon_bins.low_edges()),
+                   ('ENERG_HI', 'E', 'keV', photon_bins.high_edges()),
+                   ('N_GRP', 'I', None, np.ones(num_ebins, dtype=int)),
+                   ('F_CHAN', 'I', None, np.full(num_ebins, first_chan)),
+                   ('N_CHAN', 'I', None, np.full(num_ebins, self.num_chans)),
+                   ('MATRIX', '{}E'.format(self.num_chans), None, 
+                    self.drm.matrix)]
+        return columns, first_chan
+
     def _ebounds_table(self):
+        columns = [('CHANNEL', 'I', None, np.arange(self.num_chans, dtype=int)),
+                   ('E_MIN', 'E', 'keV', self.ebounds.low_edges()),
+                   ('E_MAX', 'E', 'keV', self.ebounds.high_edges())]
+        return _table_hdu(columns, self.headers['EBOUNDS'])
+
+    def _drm_table(self):
+        if isinstance(self.drm, SparseResponseMatrix):
+            elo_col = fits.Column(name='ENERG_LO', format='E',
+                                  array=self.drm.photon_bins.low_edges(),
+                                  unit='keV')
+            ehi_col = fits.Column(name='ENERG_HI', format='E',
+                                  array=self.drm.photon_bins.high_edges(),
+                                  unit='keV')
+            
+            # only the channel groups are written, in variable-length rows
+            ngrp, fchan, nchan, rows = self.drm.to_groups()
+            ngrp_col = fits.Column(name='N_GRP', format='I', array=ngrp)
+            if np.all(ngrp <= 1):
+                fchan = np.array([f[0] if f.size else 0 for f in fchan])
+                nchan = np.array([n[0] if n.size else 0 for n in nchan])
+                fchan_col = fits.Column(name='F_CHAN', format='I', 
+                                        array=fchan)
+                nchan_col = fits.Column(name='N_CHAN', format='I', 
+                                        array=nchan)
+            else:
+                fchan_col = fits.Column(name='F_CHAN', format='PI()', 
+                                        array=fchan)
+                nchan_col = fits.Column(name='N_CHAN', format='PI()', 
+                                        array=nchan)
+            matrix_col = fits.Column(name='MATRIX', format='PE()', array=rows)
+            cols = [elo_col, ehi_col, ngrp_col, fchan_col, nchan_col, 
+                    matrix_col]
+            hdu = fits.BinTableHDU.from_columns(cols,
+                                         header=self.headers['SPECRESP MATRIX'])
+            hdu.header['NUMGRP'] = int(ngrp.sum())
+            hdu.header['TLMIN4'] = 0
+        else:
+            columns, first_chan = self._drm_columns()
+            hdu = _table_hdu(columns, self.headers['SPECRESP MATRIX'])
+            hdu.header['TLMIN4'] = first_chan
+
+        return hdu
+
+
+class BatRspGrid(FitsFileContextManager):
+    """A set of BAT DRMs on a regular grid of azimuth and elevation in the 
+    Swift spacecraft frame (see :class:`~gdt.missions.swift.frame.SwiftFrame`),
+    with the same photon bins and energy channels.  The DRM for any direction 
+    inside the grid is interpolated bilinearly in azimuth and elevation 
+    between the four surrounding grid points.
+    
+    The azimuths are wrapped to [-180, 180) degrees, so that a grid centered 
+    on the boresight (azimuth 0, elevation 0) is contiguous.  The DRMs are held
+    as one single-precision array of shape 
+    (num_az, num_el, num_ebins, num_chans), and are written to one file with
+    a row for each grid point.
+    
+    Many directions are interpolated, or folded, in a single call.  The most 
+    recently interpolated DRMs are kept in a least-recently-used cache, keyed 
+    on the direction, so that repeated requests for the same directions do not 
+    interpolate them again.
+    """
+    _cache_size = 128
+
+    def __init__(self):
+        super().__init__()
+        self._az = None
+        self._el = None
+        self._matrices = None
+        self._emin = None
+        self._emax = None
+        self._chanlo = None
+        self._chanhi = None
+        self._cache = OrderedDict()
+        self._cache_size = self.__class__._cache_size
+
+    @property
+    def az(self):
+        """(np.array): The azimuths of the grid, in degrees"""
+        return self._az
+
+    @property
+    def cache_size(self):
+        """(int): The maximum number of interpolated DRMs kept in the cache"""
+        return self._cache_size
+
+    @cache_size.setter
+    def cache_size(self, val):
+        val = int(val)
+        if val < 0:
+            raise ValueError('cache_size must be non-negative')
+        self._cache_size = val
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    @property
+    def ebounds(self):
+        """(:class:`~gdt.core.data_primitives.Ebounds`): The energy channel 
+        bounds"""
+        return Ebounds.from_bounds(self._chanlo, self._chanhi)
+
+    @property
+    def el(self):
+        """(np.array): The elevations of the grid, in degrees"""
+        return self._el
+
+    @property
+    def matrices(self):
+        """(np.array): The DRMs, of shape (num_az, num_el, num_ebins, 
+        num_chans).  This is shared with the object and should not be 
+        modified."""
+        return self._matrices
+
+    @property
+    def num_chans(self):
+        """(int): The number of energy channels"""
+        return self._matrices.shape[3]
+
+    @property
+    def num_ebins(self):
+        """(int): The number of photon bins"""
+        return self._matrices.shape[2]
+
+    @property
+    def num_points(self):
+        """(int): The number of grid points"""
+        return self._az.size * self._el.size
+
+    @property
+    def photon_bins(self):
+        """(:class:`~gdt.core.data_primitives.Ebounds`): The photon bins"""
+        return Ebounds.from_bounds(self._emin, self._emax)
+
+    def clear_cache(self):
+        """Remove all interpolated DRMs from the cache"""
+        self._cache.clear()
+
+    def contains(self, az, el):
+        """Check if directions are inside the grid.
+
+        Args:
+            az (float or np.array): The azimuth, in degrees
+            el (float or np.array): The elevation, in degrees
+
+        Returns:
+            (bool or np.array)
+        """
+        az, el = np.broadcast_arrays(self._wrap(az), 
+                                     np.asarray(el, dtype=float))
+        return (az >= self._az[0]) & (az <= self._az[-1]) & \
+               (el >= self._el[0]) & (el <= self._el[-1])
+
+    def fold_model(self, function, params, az, el, channel_mask=None, 
+                   exposure=1.0):
+        """Fold a photon model through the DRMs of many directions.  The model
+        is evaluated once and the spectrum is folded with 
+        :meth:`fold_spectra`.
+
+        Args:
+            function (<function>): 
+                A photon spectrum function.  The function must accept a list of 
+                function parameters as its first argument and an array of photon 
+                energies as its second argument.  The function must return the 
+                evaluation of the photon model in units of ph/s-cm^2-keV.
+            params (list of float): A list of parameter values to be passed to
+                                    the photon spectrum function
+            az (float or np.array): The azimuth, in degrees
+            el (float or np.array): The elevation, in degrees
+            channel_mask (np.array, optional): 
+                A Boolean mask where True indicates the channel is to be used 
+                for folding and False indicates the channel is to not be used 
+                for folding.  If omitted, all channels are used.
+            exposure (float or np.array, optional): The exposure in seconds, 
+                either one for all or one for each direction. Default is 1.
+
+        Returns:
+            (np.array): The count spectra, of shape (num_directions, num_chans)
+                        or (num_chans,) for a single direction
+        """
+        # the geometric mean of the photon bins, as for a ResponseMatrix
+        photon_flux = function(params, np.sqrt(self._emin * self._emax))
+        return self.fold_spectra(photon_flux, az, el, 
+                                 channel_mask=channel_mask, exposure=exposure)
+
+    def fold_spectra(self, photon_flux, az, el, channel_mask=None, 
+                     exposure=1.0):
+        """Fold photon spectra through the DRMs of many directions.  
+        
+        A single spectrum is folded through the DRM of every grid point and 
+        the count spectra are interpolated to the directions, which is the same
+        as folding through each interpolated DRM since the interpolation is 
+        linear.  Otherwise, there must be one spectrum for each direction.
+
+        Args:
+            photon_flux (np.array): The photon spectrum in ph/s-cm^2-keV, 
+                                    evaluated at the photon bin centroids, of 
+                                    shape (num_ebins,), or one for each 
+                                    direction of shape 
+                                    (num_directions, num_ebins)
+            az (float or np.array): The azimuth, in degrees
+            el (float or np.array): The elevation, in degrees
+            channel_mask (np.array, optional): 
+                A Boolean mask where True indicates the channel is to be used 
+                for folding and False indicates the channel is to not be used 
+                for folding.  If omitted, all channels are used.
+            exposure (float or np.array, optional): The exposure in seconds, 
+                either one for all or one for each direction. Default is 1.
+
+        Returns:
+            (np.array): The count spectra, of shape (num_directions, num_chans)
+                        or (num_chans,) for a single direction
+        """
+        photon_flux = np.asarray(photon_flux, dtype=float)
+        if photon_flux.shape[-1] != self.num_ebins:
+            raise ValueError('photon_flux must have {} photon bins'.format(
+                             self.num_ebins))
+        exposure = np.asarray(exposure, dtype=float)
+        if np.any(exposure <= 0.0):
+            raise ValueError('exposure must be positive')
+        
+        az, el, shape = self._assert_directions(az, el)
+        corners = self._corners(az, el)
+        photon_counts = photon_flux * (self._emax - self._emin)
+        if photon_counts.ndim == 1:
+            grid_counts = np.tensordot(self._matrices, photon_counts, 
+                                       axes=([2], [0]))
+            counts = sum(weight[:, np.newaxis] * grid_counts[i, j] \
+                         for i, j, weight in corners)
+        else:
+            if photon_counts.shape[:-1] != (az.size,):
+                raise ValueError('photon_flux must have one spectrum for each '
+                                 'direction')
+            counts = sum(weight[:, np.newaxis] * \
+                         np.einsum('ne,nec->nc', photon_counts, 
+                                   self._matrices[i, j]) \
+                         for i, j, weight in corners)
+        if channel_mask is not None:
+            counts = counts[:, channel_mask]
+        
+        if exposure.ndim > 0:
+            if exposure.shape != (az.size,):
+                raise ValueError('exposure must be a float or have one value '
+                                 'for each direction')
+            exposure = exposure[:, np.newaxis]
+        counts = counts * exposure
+        return counts.reshape(shape + counts.shape[1:])
+
+    def interpolate(self, az, el):
+        """Interpolate the DRMs for many directions.  Directions in the cache
+        are returned from it, and the others are interpolated together and 
+        added to it.
+
+        Args:
+            az (float or np.array): The azimuth, in degrees
+            el (float or np.array): The elevation, in degrees
+
+        Returns:
+            (np.array): The DRMs, of shape 
+                        (num_directions, num_ebins, num_chans) or 
+                        (num_ebins, num_chans) for a single direction
+        """
+        az, el, shape = self._assert_directions(az, el)
+        dtype = self._matrices.dtype.newbyteorder('=')
+        drms = np.empty((az.size, self.num_ebins, self.num_chans), dtype=dtype)
+        
+        keys = list(zip(az.tolist(), el.tolist()))
+        missed = []
+        for k, key in enumerate(keys):
+            drm = self._cache.get(key)
+            if drm is None:
+                missed.append(k)
+            else:
+                drms[k] = drm
+                self._cache.move_to_end(key)
+        
+        if len(missed) > 0:
+            missed = np.array(missed)
+            drms[missed] = self._interpolate(az[missed], el[missed])
+            # only the most recent directions would remain in the cache
+            if self._cache_size > 0:
+                for k in missed[-self._cache_size:]:
+                    drm = drms[k].copy()
+                    drm.flags.writeable = False
+                    self._cache[keys[k]] = drm
+                    self._cache.move_to_end(keys[k])
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        
+        return drms.reshape(shape + drms.shape[1:])
+
+    def interpolate_radec(self, ra, dec, quaternion):
+        """Interpolate the DRMs for many sky positions at one spacecraft 
+        attitude.  The positions are converted to azimuth and elevation with 
+        :func:`~gdt.missions.swift.frame.radec_to_azel`.
+
+        Args:
+            ra (float or np.array): The right ascension, in degrees
+            dec (float or np.array): The declination, in degrees
+            quaternion (:class:`~gdt.core.coords.Quaternion`, np.array, or :class:`~gdt.missions.swift.frame.SwiftFrame`): 
+                The attitude quaternion, scalar last
+
+        Returns:
+            (np.array): The DRMs, of shape 
+                        (num_positions, num_ebins, num_chans) or 
+                        (num_ebins, num_chans) for a single position
+        """
+        shape = np.broadcast(ra, dec).shape
+        az, el = radec_to_azel(ra, dec, quaternion)
+        if az.size != int(np.prod(shape)):
+            raise ValueError('quaternion must be a single attitude')
+        return self.interpolate(az.reshape(shape), el.reshape(shape))
+
+    def to_rsp(self, az, el, filename=None):
+        """Return the interpolated response for a single direction.
+
+        Args:
+            az (float): The azimuth, in degrees
+            el (float): The elevation, in degrees
+            filename (str, optional): The filename of the response
+
+        Returns:
+            (:class:`BatRsp`)
+        """
+        if (np.ndim(az) != 0) or (np.ndim(el) != 0):
+            raise ValueError('to_rsp requires a single direction')
+        drm = ResponseMatrix(np.array(self.interpolate(az, el)), self._emin, 
+                             self._emax, self._chanlo, self._chanhi)
+        
+        headers = RspHeaders()
+        headers['SPECRESP MATRIX']['DETCHANS'] = self.num_chans
+        headers['SPECRESP MATRIX']['NUMGRP'] = self.num_ebins
+        headers['EBOUNDS']['DETCHANS'] = self.num_chans
+        
+        rsp = BatRsp.from_data(drm, filename=filename, headers=headers)
+        rsp._ngrp = np.ones(self.num_ebins, dtype=int)
+        rsp._fchan = np.zeros(self.num_ebins, dtype=int)
+        rsp._nchan = np.full(self.num_ebins, self.num_chans, dtype=int)
+        return rsp
+
+    @classmethod
+    def from_data(cls, matrices, az, el, emin, emax, chanlo, chanhi, 
+                  filename=None, headers=None):
+        """Create a BatRspGrid from an array of DRMs.
+
+        Args:
+            matrices (np.array): The DRMs, of shape 
+                                 (num_az, num_el, num_ebins, num_chans)
+            az (np.array): The azimuths of the grid, in degrees, increasing
+                           after wrapping to [-180, 180)
+            el (np.array): The elevations of the grid, in degrees, increasing
+            emin (np.array): The low edges of the photon bins
+            emax (np.array): The high edges of the photon bins
+            chanlo (np.array): The low edges of the energy channels
+            chanhi (np.array): The high edges of the energy channels
+            filename (str, optional): The filename of the object
+            headers (:class:`~.headers.RspGridHeaders`, optional): 
+                The file headers
+
+        Returns:
+            (:class:`BatRspGrid`)
+        """
+        az = cls._wrap(np.asarray(az, dtype=float).flatten())
+        el = np.asarray(el, dtype=float).flatten()
+        if (az.size < 2) or (el.size < 2):
+            raise ValueError('The grid must have at least two azimuths and '
+                             'two elevations')
+        if np.any(np.diff(az) <= 0.0):
+            raise ValueError('az must be increasing after wrapping to '
+                             '[-180, 180)')
+        if np.any(np.diff(el) <= 0.0) or (el[0] < -90.0) or (el[-1] > 90.0):
+            raise ValueError('el must be increasing and within [-90, 90]')
+        
+        # single precision is kept as is, including the big-endian layout of
+        # a memory-mapped file
+        matrices = np.asarray(matrices)
+        if (matrices.dtype.kind != 'f') or (matrices.dtype.itemsize != 4):
+            matrices = matrices.astype(np.float32)
+        emin = np.asarray(emin, dtype=float)
+        emax = np.asarray(emax, dtype=float)
+        chanlo = np.asarray(chanlo, dtype=float)
+        chanhi = np.asarray(chanhi, dtype=float)
+        if matrices.shape != (az.size, el.size, emin.size, chanlo.size):
+            raise ValueError('matrices must have shape (num_az, num_el, '
+                             'num_ebins, num_chans)')
+        if (emax.size != emin.size) or (chanhi.size != chanlo.size):
+            raise ValueError('The low and high edges must be the same size')
+        
+        if headers is None:
+            headers = RspGridHeaders()
+        elif not isinstance(headers, RspGridHeaders):
+            raise TypeError('headers must be of type RspGridHeaders')
+        headers['SPECRESP GRID']['DETCHANS'] = chanlo.size
+        headers['SPECRESP GRID']['NUM_AZ'] = az.size
+        headers['SPECRESP GRID']['NUM_EL'] = el.size
+        headers['EBOUNDS']['DETCHANS'] = chanlo.size
+        
+        obj = cls()
+        obj._filename = filename
+        obj._headers = headers
+        obj._az = az
+        obj._el = el
+        obj._matrices = matrices
+        obj._emin = emin
+        obj._emax = emax
+        obj._chanlo = chanlo
+        obj._chanhi = chanhi
+        return obj
+
+    @classmethod
+    def from_rsps(cls, rsp_list, az, el, filename=None):
+        """Create a BatRspGrid from single-DRM responses on a grid of 
+        directions, which have identical photon bins and energy channels.
+
+        Args:
+            rsp_list (list of :class:`BatRsp`): The responses, with the 
+                elevations of the first azimuth in order, then those of the 
+                second azimuth, and so on
+            az (np.array): The azimuths of the grid, in degrees
+            el (np.array): The elevations of the grid, in degrees
+            filename (str, optional): The filename of the object
+
+        Returns:
+            (:class:`BatRspGrid`)
+        """
+        rsp_list = list(rsp_list)
+        if not all([isinstance(rsp, Rsp) for rsp in rsp_list]):
+            raise TypeError('rsp_list must be a list of Rsp objects')
+        num_az, num_el = np.size(az), np.size(el)
+        if len(rsp_list) != num_az * num_el:
+            raise ValueError('There must be one response for each grid point')
+        
+        first = rsp_list[0]
+        matrices = np.empty((len(rsp_list), first.num_ebins, first.num_chans),
+                            dtype=np.float32)
+        for i, rsp in enumerate(rsp_list):
+            if not np.array_equal(rsp.drm.photon_bin_centroids, 
+                                  first.drm.photon_bin_centroids) or \
+               not np.array_equal(rsp.drm.photon_bin_widths,
+                                  first.drm.photon_bin_widths) or \
+               not np.array_equal(rsp.drm.channel_centroids, 
+                                  first.drm.channel_centroids) or \
+               not np.array_equal(rsp.drm.channel_widths, 
+                                  first.drm.channel_widths):
+                raise ValueError('All responses must have the same photon bins'
+                                 ' and energy channels')
+            matrices[i] = rsp.drm.matrix
+        
+        ebins = first.drm.photon_bins
+        return cls.from_data(matrices.reshape(num_az, num_el, 
+                                              first.num_ebins, 
+                                              first.num_chans),
+                             az, el, ebins.low_edges(), ebins.high_edges(),
+                             first.ebounds.low_edges(), 
+                             first.ebounds.high_edges(), filename=filename)
+
+    @classmethod
+    def open(cls, file_path, zero_copy=False, **kwargs):
+        """Open a response grid file.
+        
+        If ``zero_copy`` is True and the file is uncompressed, the DRMs are a
+        read-only view of the MATRIX column in a memory map of the file, as for
+        :meth:`BatRsp.open`.
+
+        Args:
+            file_path (str): The file path
+            zero_copy (bool, optional): If True, map the DRMs from the file. 
+                                        Default is False.
+
+        Returns:
+            (:class:`BatRspGrid`)
+        """
+        obj = super().open(file_path, **kwargs)
+        headers = RspGridHeaders.from_headers([hdu.header \
+                                               for hdu in obj.hdulist])
+        num_az = headers['SPECRESP GRID']['NUM_AZ']
+        num_el = headers['SPECRESP GRID']['NUM_EL']
+        
+        # the rows run over the elevations for each azimuth
+        grid_data = obj.hdulist['SPECRESP GRID'].data
+        az = np.array(grid_data['AZ'][::num_el], dtype=float)
+        el = np.array(grid_data['EL'][:num_el], dtype=float)
+        energies = obj.hdulist['ENERGIES'].data
+        ebounds = obj.hdulist['EBOUNDS'].data
+        
+        if zero_copy and BatRsp._is_uncompressed(file_path):
+            matrices = BatRsp._map_column(file_path, obj.hdulist, 
+                                          'SPECRESP GRID', 'MATRIX')
+        else:
+            matrices = np.array(grid_data['MATRIX'], dtype=np.float32)
+            if zero_copy:
+                matrices.flags.writeable = False
+        matrices = matrices.reshape(num_az, num_el, energies.shape[0], 
+                                    ebounds.shape[0])
+        
+        grid = cls.from_data(matrices, az, el, energies['ENERG_LO'], 
+                             energies['ENERG_HI'], ebounds['E_MIN'], 
+                             ebounds['E_MAX'], filename=obj.filename, 
+                             headers=headers)
+        obj.close()
+        return grid
+
+    def _assert_directions(self, az, el):
+        """Check that directions are inside the grid.
+
+        Args:
+            az (float or np.array): The azimuth, in degrees
+            el (float or np.array): The elevation, in degrees
+
+        Returns:
+            (np.array, np.array, tuple): The flattened azimuths (wrapped) and 
+                                         elevations, and their shape
+        """
+        az, el = np.broadcast_arrays(self._wrap(az), 
+                                     np.asarray(el, dtype=float))
+        shape = az.shape
+        az = az.flatten()
+        el = el.flatten()
+        inside = (az >= self._az[0]) & (az <= self._az[-1]) & \
+                 (el >= self._el[0]) & (el <= self._el[-1])
+        if not np.all(inside):
+            raise ValueError('{} direction(s) are outside the response '
+                             'grid'.format(np.sum(~inside)))
+        return az, el, shape
+
+    def _build_hdulist(self):
+        # create FITS and primary header
+        hdulist = fits.HDUList()
+        primary_hdu = fits.PrimaryHDU(header=self.headers['PRIMARY'])
+        hdulist.append(primary_hdu)
+        
+        # one row for each grid point, with the elevations of each azimuth
+        az, el = np.meshgrid(self._az, self._el, indexing='ij')
+        num_cells = self.num_ebins * self.num_chans
+        az_col = fits.Column(name='AZ', format='E', unit='deg', 
+                             array=az.flatten())
+        el_col = fits.Column(name='EL', format='E', unit='deg', 
+                             array=el.flatten())
+        matrix_col = fits.Column(name='MATRIX', format='{}E'.format(num_cells),
+                                 dim='({0},{1})'.format(self.num_chans, 
+                                                        self.num_ebins),
+                                 array=self._matrices.reshape(self.num_points,
+                                                              num_cells))
+        hdulist.append(fits.BinTableHDU.from_columns([az_col, el_col, 
+                                                      matrix_col],
+                                           header=self.headers['SPECRESP GRID']))
+        
+        elo_col = fits.Column(name='ENERG_LO', format='E', unit='keV',
+                              array=self._emin)
+        ehi_col = fits.Column(name='ENERG_HI', format='E', unit='keV',
+                              array=self._emax)
+        hdulist.append(fits.BinTableHDU.from_columns([elo_col, ehi_col],
+                                                header=self.headers['ENERGIES']))
+        
         chan_col = fits.Column(name='CHANNEL', format='I',
                                array=np.arange(self.num_chans, dtype=int))
         emin_col = fits.Column(name='E_MIN', format='E', unit='keV',
-                               array=self.ebounds.low_edges())
+                               array=self._chanlo)
         emax_col = fits.Column(name='E_MAX', format='E', unit='keV',
-                               array=self.ebounds.high_edges())
+                               array=self._chanhi)
+        hdulist.append(fits.BinTableHDU.from_columns([chan_col, emin_col, 
+                                                      emax_col],
+                                                 header=self.headers['EBOUNDS']))
+        return hdulist
 
-        hdu = fits.BinTableHDU.from_columns([chan_col, emin_col, emax_col],
-                                             header=self.headers['EBOUNDS'])
-        for key, val in self.headers['EBOUNDS'].items():
-            hdu.header[key] = val
+    def _corners(self, az, el):
+        """The bilinear interpolation weights of the four grid points around 
+        each direction.
 
-        return hdu
+        Args:
+            az (np.array): The wrapped azimuths, in degrees
+            el (np.array): The elevations, in degrees
 
-    def _drm_table(self):
-        elo_col = fits.Column(name='ENERG_LO', format='E',
-                              array=self.drm.photon_bins.low_edges(),
-                              unit='keV')
-        ehi_col = fits.Column(name='ENERG_HI', format='E',
-                              array=self.drm.photon_bins.high_edges(),
-                              unit='keV')
-        ngrp_col = fits.Column(name='N_GRP', format='I', array=self._ngrp)
-        fchan_col = fits.Column(name='F_CHAN', format='I',
-                                array=self._fchan)
-        nchan_col = fits.Column(name='N_CHAN', format='I',
-                                array=self._nchan)
+        Returns:
+            (list of tuple): The azimuth indices, elevation indices and weights
+                             of each corner
+        """
+        i = np.clip(np.searchsorted(self._az, az, side='right') - 1, 0, 
+                    self._az.size - 2)
+        j = np.clip(np.searchsorted(self._el, el, side='right') - 1, 0, 
+                    self._el.size - 2)
+        u = (az - self._az[i]) / (self._az[i + 1] - self._az[i])
+        v = (el - self._el[j]) / (self._el[j + 1] - self._el[j])
+        return [(i, j, (1.0 - u) * (1.0 - v)), (i + 1, j, u * (1.0 - v)),
+                (i, j + 1, (1.0 - u) * v), (i + 1, j + 1, u * v)]
+
+    def _interpolate(self, az, el):
+        """Interpolate the DRMs for directions inside the grid, without the 
+        cache.
+
+        Args:
+            az (np.array): The wrapped azimuths, in degrees
+            el (np.array): The elevations, in degrees
+
+        Returns:
+            (np.array): The DRMs, of shape (num_directions, num_ebins, 
+                        num_chans)
+        """
+        dtype = self._matrices.dtype.newbyteorder('=')
+        drms = np.zeros((az.size, self.num_ebins, self.num_chans), dtype=dtype)
+        for i, j, weight in self._corners(az, el):
+            drms += self._matrices[i, j] * \
+                    weight.astype(dtype)[:, np.newaxis, np.newaxis]
+        return drms
+
+    @staticmethod
+    def _wrap(az):
+        """Wrap azimuths to [-180, 180) degrees"""
+        return (np.asarray(az, dtype=float) + 180.0) % 360.0 - 180.0
+
+    def __repr__(self):
+        s = '<{0}: {1} x {2} grid;'.format(self.__class__.__name__, 
+                                           self._az.size, self._el.size)
+        s += '\n az ({0}, {1}); el ({2}, {3});'.format(self._az[0], 
+                                                       self._az[-1],
+                                                       self._el[0], 
+                                                       self._el[-1])
+        s += '\n {0} energy bins; {1} channels>'.format(self.num_ebins, 
+                                                        self.num_chans)
+        return s
+
+
+class BatRspSeries(Rsp2):
+    """A time series of BAT single-DRM responses with the same photon bins and
+    energy channels, for example the responses of a time-resolved spectral
+    sequence during a slew.  The DRMs of any set of time intervals, and the 
+    count spectra folded through them, are computed in a single call.
     
-        matrix_col = fits.Column(name='MATRIX', array=self.drm.matrix,
-                                 format='{}E'.format(self.num_chans),
-                                 )
+    The DRM for a time interval is either interpolated linearly in time 
+    between the centers of the responses (at the center of the interval) or 
+    is the average of the responses weighted by their overlap with the 
+    interval.  The responses are ordered by their center times.  The times of
+    the series are relative to the trigger time of the first response, and 
+    the times of any response with a different trigger time are converted to
+    it, so the Rsp2 methods and the methods of the series use the same times.
+    """
+    def __init__(self):
+        super().__init__()
+        self._emin = None
+        self._emax = None
+        self._tstart = None
+        self._tstop = None
 
-        hdu = fits.BinTableHDU.from_columns([elo_col, ehi_col, ngrp_col,
-                                             fchan_col, nchan_col, matrix_col],
-                                         header=self.headers['SPECRESP MATRIX'])
-        for key, val in self.headers['SPECRESP MATRIX'].items():
-            hdu.header[key] = val
+    @property
+    def photon_bins(self):
+        """(:class:`~gdt.core.data_primitives.Ebounds`): The photon bins"""
+        return Ebounds.from_bounds(self._emin, self._emax)
 
-        return hdu
+    @property
+    def tstart(self):
+        """(np.array): The start times of the intervals over which the DRMs 
+        are valid, relative to the trigger time of the series"""
+        return self._tstart
+
+    @property
+    def tstop(self):
+        """(np.array): The end times of the intervals over which the DRMs 
+        are valid, relative to the trigger time of the series"""
+        return self._tstop
+
+    def average_matrices(self, time_ranges):
+        """Return the DRM of each time interval, averaged over the responses
+        weighted by their overlap with the interval.  An interval that does not
+        overlap any response gets the response that contains its center, or 
+        else the response with the nearest center time.
+
+        Args:
+            time_ranges (np.array): The time intervals, of shape 
+                                    (num_intervals, 2)
+
+        Returns:
+            (np.array): The DRMs, of shape (num_intervals, num_ebins, num_chans)
+        """
+        return self._combine_matrices(self._overlap_weights(time_ranges))
+
+    def fold_model(self, function, params, time_ranges, interpolate=False,
+                   channel_mask=None, exposure=1.0):
+        """Fold a photon model through the DRM of each time interval.  The 
+        model is evaluated for each set of parameters, and the spectra are 
+        folded with :meth:`fold_spectra`.
+
+        Args:
+            function (<function>): 
+                A photon spectrum function.  The function must accept a list of 
+                function parameters as its first argument and an array of photon 
+                energies as its second argument.  The function must return the 
+                evaluation of the photon model in units of ph/s-cm^2-keV.
+            params (np.array): The parameters, either one set for all intervals
+                               or of shape (num_intervals, num_params)
+            time_ranges (np.array): The time intervals, of shape 
+                                    (num_intervals, 2)
+            interpolate (bool, optional): If True, interpolate the DRM at the 
+                                          center of each interval, otherwise
+                                          average the DRMs over the interval.
+                                          Default is False.
+            channel_mask (np.array, optional): 
+                A Boolean mask where True indicates the channel is to be used 
+                for folding and False indicates the channel is to not be used 
+                for folding.  If omitted, all channels are used.
+            exposure (float or np.array, optional): The exposure in seconds, 
+                either one for all or one for each interval. Default is 1.
+
+        Returns:
+            (np.array): The count spectra, of shape (num_intervals, num_chans)
+        """
+        params = np.asarray(params, dtype=float)
+        centroids = np.sqrt(self._emin * self._emax)
+        if params.ndim == 1:
+            photon_flux = function(params, centroids)
+        else:
+            photon_flux = np.empty((params.shape[0], centroids.size))
+            for i in range(params.shape[0]):
+                photon_flux[i] = function(params[i], centroids)
+        return self.fold_spectra(photon_flux, time_ranges, 
+                                 interpolate=interpolate, 
+                                 channel_mask=channel_mask, exposure=exposure)
+
+    def fold_spectra(self, photon_flux, time_ranges, interpolate=False,
+                     channel_mask=None, exposure=1.0):
+        """Fold photon spectra through the DRM of each time interval in one 
+        call.  The interval DRMs are weighted sums of the responses, so the 
+        spectra are folded through each response they need, one matrix 
+        multiply per response, and the results are summed without building the
+        DRM of each interval.
+
+        Args:
+            photon_flux (np.array): The photon spectra in ph/s-cm^2-keV, 
+                                    evaluated at the photon bin centroids, 
+                                    either one for all intervals or of shape 
+                                    (num_intervals, num_ebins)
+            time_ranges (np.array): The time intervals, of shape 
+                                    (num_intervals, 2)
+            interpolate (bool, optional): If True, interpolate the DRM at the 
+                                          center of each interval, otherwise
+                                          average the DRMs over the interval.
+                                          Default is False.
+            channel_mask (np.array, optional): 
+                A Boolean mask where True indicates the channel is to be used 
+                for folding and False indicates the channel is to not be used 
+                for folding.  If omitted, all channels are used.
+            exposure (float or np.array, optional): The exposure in seconds, 
+                either one for all or one for each interval. Default is 1.
+
+        Returns:
+            (np.array): The count spectra, of shape (num_intervals, num_chans)
+        """
+        time_ranges = self._assert_ranges(time_ranges)
+        if interpolate:
+            weights = self._interp_weights(time_ranges.mean(axis=1))
+        else:
+            weights = self._overlap_weights(time_ranges)
+        
+        photon_flux = np.asarray(photon_flux, dtype=float)
+        if photon_flux.shape[-1] != self.num_ebins:
+            raise ValueError('photon_flux must have {} photon bins'.format(
+                             self.num_ebins))
+        photon_flux = np.broadcast_to(photon_flux, 
+                                      (weights.shape[0], self.num_ebins))
+        exposure = np.asarray(exposure, dtype=float)
+        if np.any(exposure <= 0.0):
+            raise ValueError('exposure must be positive')
+        if exposure.ndim > 0:
+            if exposure.shape != weights.shape[:1]:
+                raise ValueError('exposure must be a float or have one value '
+                                 'for each interval')
+            exposure = exposure[:, np.newaxis]
+        
+        photons = photon_flux * (self._emax - self._emin)
+        counts = np.zeros((weights.shape[0], self.num_chans))
+        for i in np.flatnonzero(weights.any(axis=0)):
+            rows = np.flatnonzero(weights[:, i])
+            drm = self._drms[i].drm
+            if isinstance(drm, SparseResponseMatrix):
+                folded = (drm.sparse_matrix.T @ photons[rows].T).T
+            else:
+                folded = photons[rows] @ drm.matrix
+            counts[rows] += weights[rows, i, np.newaxis] * folded
+        if channel_mask is not None:
+            counts = counts[:, channel_mask]
+        return counts * exposure
+
+    def interpolate_matrices(self, times):
+        """Return the DRMs linearly interpolated in time between the center 
+        times of the responses.  Before (after) the first (last) center time, 
+        the first (last) DRM is returned.
+
+        Args:
+            times (np.array): The times
+
+        Returns:
+            (np.array): The DRMs, of shape (num_times, num_ebins, num_chans)
+        """
+        times = np.asarray(times, dtype=float).ravel()
+        return self._combine_matrices(self._interp_weights(times))
+
+    def matrices(self):
+        """Return the DRMs stacked into one array.  The series does not keep
+        a stacked copy of the DRMs, so this builds a new array on each call; 
+        the other methods of the series use the DRMs of the responses 
+        directly.
+
+        Returns:
+            (np.array): The DRMs, of shape (num_drms, num_ebins, num_chans)
+        """
+        return np.stack([rsp.drm.matrix for rsp in self._drms])
+
+    @classmethod
+    def open(cls, file_paths, **kwargs):
+        """Open a series of BAT response files.
+
+        Args:
+            file_paths (list of str): The file paths
+            **kwargs: Options passed to :meth:`BatRsp.open`
+
+        Returns:
+            (:class:`BatRspSeries`)
+        """
+        return cls.from_rsps([BatRsp.open(file_path, **kwargs) \
+                              for file_path in file_paths])
+
+    @classmethod
+    def from_rsps(cls, rsp_list, filename=None):
+        """Create a BatRspSeries from a list of single-DRM responses that have
+        identical photon bins and energy channels, and a valid time range.
+        The responses may have different trigger times, in which case the 
+        times are converted to the trigger time of the first response in 
+        time.  The responses themselves are not modified.
+        
+        Args:
+            rsp_list (list of :class:`BatRsp`): The single-DRM responses
+            filename (str, optional): The filename of the object
+                 
+        Returns:
+            (:class:`BatRspSeries`)
+        """
+        rsp_list = list(rsp_list)
+        if len(rsp_list) == 0:
+            raise ValueError('At least one response is required')
+        if not all([isinstance(rsp, Rsp) for rsp in rsp_list]):
+            raise TypeError('rsp_list must be a list of Rsp objects')
+        
+        first = rsp_list[0]
+        for rsp in rsp_list:
+            if (rsp.tstart is None) or (rsp.tstop is None):
+                raise ValueError('Each response must have a time range')
+            # the centroids and widths are compared, as they are computed 
+            # from the edge arrays without building Ebounds objects
+            if not np.array_equal(rsp.drm.photon_bin_centroids, 
+                                  first.drm.photon_bin_centroids) or \
+               not np.array_equal(rsp.drm.photon_bin_widths,
+                                  first.drm.photon_bin_widths) or \
+               not np.array_equal(rsp.drm.channel_centroids, 
+                                  first.drm.channel_centroids) or \
+               not np.array_equal(rsp.drm.channel_widths, 
+                                  first.drm.channel_widths):
+                raise ValueError('All responses must have the same photon bins'
+                                 ' and energy channels')
+        
+        # order by the center times in MET (or relative to no trigger time),
+        # then shift the times to the trigger time of the first response. 
+        # Only the difference of the trigger times is added, so the times of
+        # the responses with the same trigger time are unchanged.
+        trigtime = np.array([rsp.trigtime if rsp.trigtime is not None \
+                             else 0.0 for rsp in rsp_list])
+        tstart = np.array([rsp.tstart for rsp in rsp_list])
+        tstop = np.array([rsp.tstop for rsp in rsp_list])
+        order = np.argsort((tstart + tstop) / 2.0 + trigtime, kind='stable')
+        shift = trigtime[order] - trigtime[order[0]]
+        obj = super().from_rsps([rsp_list[i] for i in order], 
+                                filename=filename)
+        obj._tstart = tstart[order] + shift
+        obj._tstop = tstop[order] + shift
+        obj._emin = np.asarray(first.drm.photon_bins.low_edges(), dtype=float)
+        obj._emax = np.asarray(first.drm.photon_bins.high_edges(), dtype=float)
+        return obj
+
+    def _assert_ranges(self, time_ranges):
+        """Check an array of time intervals.
+
+        Args:
+            time_ranges (np.array): The time intervals
+
+        Returns:
+            (np.array): The intervals, of shape (num_intervals, 2)
+        """
+        time_ranges = np.asarray(time_ranges, dtype=float).reshape(-1, 2)
+        if np.any(time_ranges[:, 0] > time_ranges[:, 1]):
+            raise ValueError('Range must be in increasing order: (lo, hi)')
+        return time_ranges
+
+    def _combine_matrices(self, weights):
+        """The weighted sums of the DRMs.  Only the responses with a nonzero
+        weight are read.
+
+        Args:
+            weights (np.array): The weights, of shape (num_sums, num_drms)
+
+        Returns:
+            (np.array): The DRMs, of shape (num_sums, num_ebins, num_chans)
+        """
+        matrices = np.zeros((weights.shape[0], self.num_ebins, self.num_chans))
+        for i in np.flatnonzero(weights.any(axis=0)):
+            rows = np.flatnonzero(weights[:, i])
+            matrices[rows] += weights[rows, i, np.newaxis, np.newaxis] * \
+                              self._drms[i].drm.matrix
+        return matrices
+
+    def _interp_weights(self, times):
+        """The weights of the responses for linear interpolation at the given
+        times.
+
+        Args:
+            times (np.array): The times
+
+        Returns:
+            (np.array): The weights, of shape (num_times, num_drms)
+        """
+        tcent = self.tcent
+        if tcent.size == 1:
+            return np.ones((times.size, 1))
+        
+        hi = np.clip(np.searchsorted(tcent, times, side='right'), 1, 
+                     tcent.size - 1)
+        lo = hi - 1
+        span = tcent[hi] - tcent[lo]
+        frac = np.divide(times - tcent[lo], span, out=np.zeros(times.size),
+                         where=(span > 0.0))
+        frac = np.clip(frac, 0.0, 1.0)
+        
+        weights = np.zeros((times.size, tcent.size))
+        rows = np.arange(times.size)
+        np.add.at(weights, (rows, lo), 1.0 - frac)
+        np.add.at(weights, (rows, hi), frac)
+        return weights
+
+    def _overlap_weights(self, time_ranges):
+        """The weights of the responses for the average over each time 
+        interval, in proportion to the overlap of each response with the 
+        interval.
+
+        Args:
+            time_ranges (np.array): The time intervals
+
+        Returns:
+            (np.array): The weights, of shape (num_intervals, num_drms)
+        """
+        time_ranges = self._assert_ranges(time_ranges)
+        start = time_ranges[:, 0:1]
+        stop = time_ranges[:, 1:2]
+        tstart = self.tstart
+        tstop = self.tstop
+        overlap = np.clip(np.minimum(stop, tstop) - np.maximum(start, tstart),
+                          0.0, None)
+        total = overlap.sum(axis=1)
+        
+        # the response that contains the center of the interval, or the 
+        # nearest one, where no response overlaps
+        center = (start + stop) / 2.0
+        contains = (tstart <= center) & (center <= tstop)
+        nearest = np.where(contains.any(axis=1), contains.argmax(axis=1),
+                           np.abs(center - self.tcent).argmin(axis=1))
+        
+        weights = np.zeros(overlap.shape)
+        valid = (total > 0.0)
+        weights[valid] = overlap[valid] / total[valid, np.newaxis]
+        weights[~valid, nearest[~valid]] = 1.0
+        return weights
+
+    def __repr__(self):
+        s = '<{0}: {1} DRMs;'.format(self.__class__.__name__, self.num_drms)
+        if self.trigtime is not None:
+            s += '\n trigger time: {};'.format(self.trigtime)
+        s += '\n time range ({0}, {1});'.format(self.tstart[0], 
+                                                self.tstop.max())
+        s += '\n {0} energy bins; {1} channels>'.format(self.num_ebins, 
+                                                        self.num_chans)
+        return s
+
+
+class SparseResponseMatrix(ResponseMatrix):
+    """A detector response matrix stored in compressed sparse row (CSR) form,
+    with only the nonzero elements kept.  The photon bins are the rows and the 
+    energy channels are the columns, as in 
+    :class:`~gdt.core.data_primitives.ResponseMatrix`.
+    
+    Folding, rebinning and resampling are done on the sparse matrix.  The 
+    :attr:`matrix` attribute returns a dense copy, so code that only needs the
+    nonzero elements should use :attr:`sparse_matrix`.
+
+    Parameters:
+        matrix (np.array or scipy.sparse matrix): The 2D matrix, of shape 
+                                                  (num_photon_bins, num_channels)
+        emin (np.array): The low edges of the (input) photon bins
+        emax (np.array): The high edges of the (input) photon bins
+        chanlo (np.array): The low edges of the (output) energy channels
+        chanhi (np.array): The high edges of the (output) energy channels    
+    """
+    def __init__(self, matrix, emin, emax, chanlo, chanhi):
+        if sparse.issparse(matrix):
+            csr = sparse.csr_matrix(matrix)
+        else:
+            matrix = np.asarray(matrix)
+            if matrix.ndim != 2:
+                raise TypeError('matrix must be a 2-dimensional array')
+            csr = sparse.csr_matrix(matrix)
+        csr.data = np.asarray(csr.data, 
+                              dtype=csr.data.dtype.newbyteorder('='))
+        csr.eliminate_zeros()
+        csr.sort_indices()
+        
+        # the edges are checked against a zero-stride placeholder of the 
+        # matrix shape, so that no dense matrix is allocated
+        super().__init__(np.broadcast_to(csr.dtype.type(0), csr.shape), emin, 
+                         emax, chanlo, chanhi)
+        self._matrix = None
+        self._csr = csr
+        self._csr_t = None
+
+    @property
+    def matrix(self):
+        """(np.array): A dense copy of the matrix"""
+        return self._csr.toarray()
+
+    @property
+    def nnz(self):
+        """(int): The number of stored (nonzero) elements"""
+        return self._csr.nnz
+
+    @property
+    def num_chans(self):
+        """(int): The number of energy channels"""
+        return self._csr.shape[1]
+
+    @property
+    def num_ebins(self):
+        """(int): The number of photon bins"""
+        return self._csr.shape[0]
+
+    @property
+    def sparse_matrix(self):
+        """(scipy.sparse.csr_matrix): The sparse matrix.  This is shared with
+        the object and should not be modified."""
+        return self._csr
+
+    def channel_effective_area(self):
+        """Returns the effective area as a function of recorded channel energy
+        (integrated over incident photon bins).
+        
+        Returns:
+            (:class:`Bins`)
+        """
+        return Bins(np.asarray(self._csr.sum(axis=0)).ravel(), self._chanlo, 
+                    self._chanhi)
+
+    def fold_spectrum(self, function, params, channel_mask=None):
+        """Fold a photon spectrum through a DRM to get a count spectrum
+        
+        Args: 
+            function (<function>): 
+                A photon spectrum function.  The function must accept a list of 
+                function parameters as its first argument and an array of photon 
+                energies as its second argument.  The function must return the 
+                evaluation of the photon model in units of ph/s-cm^2-keV.
+            params (list of float): A list of parameter values to be passed to
+                                   the photon spectrum function
+            channel_mask (np.array, optional): 
+                A boolean mask where True indicates the channel is to be used 
+                for folding and False indicates the channel is to not be used 
+                for folding.  If omitted, all channels are used.
+        
+        Returns:        
+            (np.array)
+        """
+        # the transpose is converted to CSR once, on the first fold
+        if self._csr_t is None:
+            self._csr_t = self._csr.T.tocsr()
+        
+        photon_model = function(params, self.photon_bin_centroids)
+        counts = self._csr_t @ (photon_model * self.photon_bin_widths)
+        if channel_mask is not None:
+            counts = counts[channel_mask]
+        return counts
+
+    def photon_effective_area(self):
+        """Returns the effective area as a function of incident photon energy
+        (integrated over recorded energy channels).
+        
+        Returns:        
+            (:class:`Bins`)
+        """
+        return Bins(np.asarray(self._csr.sum(axis=1)).ravel(), self._emin, 
+                    self._emax)
+
+    def rebin(self, factor=None, edge_indices=None):
+        """Rebins the channel energy axis of a DRM and returns a new response
+        object.  Rebinning can only be used to downgrade the channel resolution
+        and is constrained to the channel edges of the current DRM. 
+        
+        Rebinning can be performed by either defining an integral factor of the
+        number of current energy channels to combine (e.g. factor=4 for 128
+        energy channels would result in 32 energy channels), or by defining an
+        index array into the current channel edges that will define the new set
+        of edges.
+        
+        Args:
+            factor (int, optional): The rebinning factor. Must set either this
+                                    or `edge_indices`
+            edge_indices (np.array, optional): The index array that represents
+                                               which energy edges should remain
+                                               in the rebinned DRM.
+        
+        Returns:
+            (:class:`SparseResponseMatrix`)
+        """
+        # the new channel edges are checked and found by rebinning a single
+        # row of the dense matrix
+        chans = ResponseMatrix(np.zeros((1, self.num_chans)), self._emin[:1],
+                               self._emax[:1], self._chanlo, self._chanhi)
+        chans = chans.rebin(factor=factor, edge_indices=edge_indices)
+        chanlo = chans.ebounds.low_edges()
+        chanhi = chans.ebounds.high_edges()
+        
+        # sum the old channels into the new ones with a sparse 0/1 matrix
+        old = np.flatnonzero((self._chanlo >= chanlo[0]) & \
+                             (self._chanhi <= chanhi[-1]))
+        new = np.searchsorted(chanlo, self._chanlo[old], side='right') - 1
+        combine = sparse.csr_matrix((np.ones(old.size), (old, new)), 
+                                    shape=(self.num_chans, len(chanlo)))
+        
+        return type(self)(self._csr @ combine, self._emin, self._emax, chanlo,
+                          chanhi)
+
+    def resample(self, num_photon_bins=None, photon_bin_edges=None,
+                 num_interp_points=20, interp_kind='linear'):
+        """Resamples the incident photon axis of a DRM and returns a new 
+        ResponseMatrix object.  Resampling can be used to downgrade the photon 
+        energy resolution, upgrade the resolution, and/or redefine the edges of 
+        the incident photon bins.  By definition, the resampling can only be 
+        performed within the photon energy range of the current object.
+        
+        This follows :meth:`ResponseMatrix.resample`.  With linear 
+        interpolation, the interpolation and integration are done on the sparse
+        matrix, and elements that are zero on both sides of an interpolation 
+        point stay zero (the dense method fills them with a floor of 1e-10 
+        before interpolating).  Other kinds of interpolation are done on a 
+        dense copy of the matrix.
+        
+        Args:
+            num_photon_bins (int, optional): The number of photon bins in the
+                                             new DRM. The bin edges will be 
+                                             generated logarithmically. Only set
+                                             this or `photon_bin_edges`.
+            photon_bin_edges (np.array, optional): The array of photon bin edges.
+                                                   Only set this or 
+                                                   `num_photon_bins`
+            num_interp_points (int, optional): The number of interpolation points
+                                               used to integrate over for each
+                                               new photon bin. Default is 20.
+            interp_kind (str, optional): The kind of interpolation to be 
+                                         passed to scipy.interp1d.  Default is
+                                         'linear'.
+        
+        Returns:
+            (:class:`SparseResponseMatrix`)
+        """
+        if interp_kind != 'linear':
+            drm = self.to_dense().resample(num_photon_bins=num_photon_bins,
+                                           photon_bin_edges=photon_bin_edges,
+                                           num_interp_points=num_interp_points,
+                                           interp_kind=interp_kind)
+            return type(self)(drm.matrix, drm._emin, drm._emax, self._chanlo,
+                              self._chanhi)
+        
+        # the new photon edges are checked and found by resampling a single
+        # column of the dense matrix
+        bins = ResponseMatrix(np.ones((self.num_ebins, 1)), self._emin, 
+                              self._emax, self._chanlo[:1], self._chanhi[:1])
+        bins = bins.resample(num_photon_bins=num_photon_bins, 
+                             photon_bin_edges=photon_bin_edges,
+                             num_interp_points=1)
+        new_emin = bins.photon_bins.low_edges()
+        new_emax = bins.photon_bins.high_edges()
+        num_photon_bins = len(new_emin)
+        
+        # log10 of the differential effective area, offset by the 1e-10 floor
+        # so that the zeros stay zero, with the last row repeated at the top
+        # edge
+        diff_effarea = sparse.diags(1.0 / self.photon_bin_widths) @ self._csr
+        log_effarea = sparse.vstack((diff_effarea, diff_effarea[-1])).tocsr()
+        log_effarea.data = np.log10(log_effarea.data) + 10.0
+        
+        # the interpolation points over each new bin, as rows of a sparse
+        # matrix of linear interpolation weights
+        interp_arr = np.geomspace(new_emin, new_emax, num_interp_points + 2, 
+                                  axis=0)
+        x = np.append(self._emin, self._emax[-1])
+        points = interp_arr.ravel()
+        hi = np.clip(np.searchsorted(x, points), 1, x.size - 1)
+        frac = (points - x[hi - 1]) / (x[hi] - x[hi - 1])
+        rows = np.arange(points.size)
+        weights = sparse.csr_matrix((np.concatenate((1.0 - frac, frac)),
+                                     (np.concatenate((rows, rows)), 
+                                      np.concatenate((hi - 1, hi)))),
+                                    shape=(points.size, x.size))
+        weights.eliminate_zeros()
+        
+        # interpolate, then integrate over the points of each new bin with 
+        # the trapezoid rule
+        diff_effarea_interp = weights @ log_effarea
+        diff_effarea_interp.data = 10.0**(diff_effarea_interp.data - 10.0)
+        
+        dx = np.diff(interp_arr, axis=0) / 2.0
+        trap = np.zeros(interp_arr.shape)
+        trap[:-1] += dx
+        trap[1:] += dx
+        integrate = sparse.csr_matrix((trap.ravel(), 
+                                       (np.tile(np.arange(num_photon_bins), 
+                                                interp_arr.shape[0]), rows)),
+                                      shape=(num_photon_bins, points.size))
+        drm = (integrate @ diff_effarea_interp) / \
+              (self.num_ebins / num_photon_bins)
+        
+        return type(self)(drm, new_emin, new_emax, self._chanlo, self._chanhi)
+
+    def to_dense(self):
+        """Return the matrix as a dense 
+        :class:`~gdt.core.data_primitives.ResponseMatrix`.
+        
+        Returns:
+            (:class:`~gdt.core.data_primitives.ResponseMatrix`)
+        """
+        return ResponseMatrix(self.matrix, self._emin, self._emax, 
+                              self._chanlo, self._chanhi)
+
+    def to_groups(self):
+        """Return the OGIP channel groups of each photon bin: the runs of 
+        consecutive nonzero channels.
+
+        Returns:
+            (np.array, list of np.array, list of np.array, list of np.array): 
+                The number of groups in each row, the first channel 
+                (zero-based) and number of channels of each group in each row,
+                and the matrix elements of each row
+        """
+        csr = self._csr
+        row_nnz = np.diff(csr.indptr)
+        row = np.repeat(np.arange(self.num_ebins), row_nnz)
+        
+        # a group starts where the channel is not one more than the last
+        new_group = np.ones(csr.nnz, dtype=bool)
+        new_group[1:] = (csr.indices[1:] != csr.indices[:-1] + 1) | \
+                        (row[1:] != row[:-1])
+        starts = np.flatnonzero(new_group)
+        fchan = csr.indices[starts]
+        nchan = np.diff(np.append(starts, csr.nnz))
+        ngrp = np.bincount(row[starts], minlength=self.num_ebins)
+        
+        splits = np.cumsum(ngrp)[:-1]
+        return (ngrp, np.split(fchan, splits), np.split(nchan, splits), 
+                np.split(csr.data, csr.indptr[1:-1]))
+
+    @classmethod
+    def from_groups(cls, matrix, ngrp, fchan, nchan, emin, emax, chanlo, 
+                    chanhi, first_chan=0):
+        """Create a SparseResponseMatrix from the OGIP grouped form of a 
+        response, as stored in the MATRIX, N_GRP, F_CHAN and N_CHAN columns of 
+        a response file.  Each row of the matrix holds the elements of the
+        channel groups of that row, one group after another.
+
+        Args:
+            matrix (np.array): The matrix rows, either a 2D array (any unused
+                               elements at the end of a row are ignored) or 
+                               an array of variable-length rows
+            ngrp (np.array): The number of channel groups in each row
+            fchan (np.array): The first channel of each group, either one per
+                              row, a 2D array, or variable-length rows
+            nchan (np.array): The number of channels in each group, in the 
+                              same form as ``fchan``
+            emin (np.array): The low edges of the (input) photon bins
+            emax (np.array): The high edges of the (input) photon bins
+            chanlo (np.array): The low edges of the (output) energy channels
+            chanhi (np.array): The high edges of the (output) energy channels
+            first_chan (int, optional): The channel number of the first 
+                                        channel. Default is 0.
+        
+        Returns:
+            (:class:`SparseResponseMatrix`)
+        """
+        ngrp = np.asarray(ngrp, dtype=int).ravel()
+        fchan = cls._row_values(fchan, ngrp) - first_chan
+        nchan = cls._row_values(nchan, ngrp)
+        
+        # the number of stored elements in each row
+        group_row = np.repeat(np.arange(ngrp.size), ngrp)
+        row_nnz = np.bincount(group_row, weights=nchan, 
+                              minlength=ngrp.size).astype(int)
+        data = cls._row_values(matrix, row_nnz)
+        
+        # the channel of each element, counting up from the first channel of
+        # its group
+        group_start = np.cumsum(nchan) - nchan
+        indices = np.arange(nchan.sum()) - np.repeat(group_start - fchan, 
+                                                      nchan)
+        indptr = np.concatenate(([0], np.cumsum(row_nnz)))
+        csr = sparse.csr_matrix((data, indices, indptr), 
+                                shape=(ngrp.size, np.asarray(chanlo).size))
+        return cls(csr, emin, emax, chanlo, chanhi)
+
+    @staticmethod
+    def _row_values(arr, counts):
+        """Concatenate the first ``counts[i]`` values of each row of an array
+        of scalars, a 2D array, or an array of variable-length rows.
+
+        Args:
+            arr (np.array): The array
+            counts (np.array): The number of values to take from each row
+
+        Returns:
+            (np.array)
+        """
+        if isinstance(arr, np.ndarray) and arr.dtype != object:
+            arr = np.asarray(arr, dtype=arr.dtype.newbyteorder('='))
+            if arr.ndim == 1:
+                return arr[counts > 0]
+            return arr[np.arange(arr.shape[1]) < counts[:, np.newaxis]]
+        
+        rows = [np.atleast_1d(row)[:count] for row, count in zip(arr, counts)]
+        if len(rows) == 0:
+            return np.array([])
+        arr = np.concatenate(rows)
+        return np.asarray(arr, dtype=arr.dtype.newbyteorder('='))
+
+    def __repr__(self):
+        return '<SparseResponseMatrix: {0} energy bins; {1} channels; {2} ' \
+               'nonzero>'.format(self.num_ebins, self.num_chans, self.nnz)
+
+
+def _table_hdu(columns, header):
+    """Build a binary table HDU from one preallocated buffer, in the 
+    big-endian layout of the file, into which each column is filled once.
+
+    Args:
+        columns (list of tuple): The name, format ('I', 'J', 'E', or 'D', 
+                                 with an optional repeat count), unit and 
+                                 values of each column
+        header (:class:`~gdt.core.headers.Header`): The header of the table
+
+    Returns:
+        (:class:`astropy.io.fits.BinTableHDU`)
+    """
+    fields = []
+    for name, fmt, unit, array in columns:
+        repeat = int(fmt[:-1]) if len(fmt) > 1 else 1
+        fields.append((name, _table_dtypes[fmt[-1]], 
+                       (repeat,) if repeat > 1 else ()))
+    data = np.empty(len(columns[0][3]), dtype=fields)
+    for name, fmt, unit, array in columns:
+        data[name] = array
+    
+    coldefs = fits.ColDefs(data)
+    for name, fmt, unit, array in columns:
+        coldefs[name].unit = unit
+        # a vector column is written as a repeat count, without a TDIM
+        coldefs[name].dim = None
+    return fits.BinTableHDU.from_columns(coldefs, header=header)
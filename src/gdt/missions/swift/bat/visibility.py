@@ -0,0 +1,248 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+import numpy as np
+
+from gdt.core.data_primitives import Gti
+from ..frame import rotation_matrices, _unit_vectors
+
+__all__ = ['BatVisibility']
+
+
+class BatVisibility():
+    """Determine when sky positions are visible to BAT over a position and
+    attitude history.  A position is visible when it is inside the BAT field 
+    of view, above the Earth limb, and the spacecraft is outside the SAA.
+    
+    The field of view is approximated by a cone of radius ``fov_radius`` 
+    around the BAT boresight (the Swift +X axis).  All positions are evaluated
+    at once from the position and quaternion arrays, in blocks of time so 
+    that the memory use stays bounded, and without creating any astropy 
+    frames.
+
+    Parameters:
+        time (np.array): The MET of each sample
+        position (np.array): The spacecraft position in km, 
+                             shape (num_samples, 3)
+        quaternion (np.array): The attitude quaternions, scalar last, 
+                               shape (num_samples, 4)
+        saa (np.array(dtype=bool), optional): True for samples inside the SAA
+        fov_radius (float, optional): The radius of the field of view cone, in
+                                      degrees. Default is 60.
+        earth_radius (float, optional): The radius of the Earth, in km, 
+                                        including any atmosphere to be 
+                                        treated as opaque. Default is 6378.137.
+    """
+    def __init__(self, time, position, quaternion, saa=None, fov_radius=60.0,
+                 earth_radius=6378.137):
+        self._time = np.asarray(time, dtype=float).flatten()
+        num_samples = self._time.size
+        
+        position = np.asarray(position, dtype=float)
+        if position.shape != (num_samples, 3):
+            raise ValueError('position must have shape (num_samples, 3)')
+        
+        quaternion = np.asarray(quaternion, dtype=float)
+        if quaternion.shape != (num_samples, 4):
+            raise ValueError('quaternion must have shape (num_samples, 4)')
+        
+        if saa is None:
+            saa = np.zeros(num_samples, dtype=bool)
+        saa = np.asarray(saa, dtype=bool).flatten()
+        if saa.size != num_samples:
+            raise ValueError('saa must have the same size as time')
+        
+        if (fov_radius <= 0.0) or (fov_radius > 180.0):
+            raise ValueError('fov_radius must be between 0 and 180')
+        if earth_radius <= 0.0:
+            raise ValueError('earth_radius must be positive')
+        
+        # the boresight is the first column of the rotation from the Swift 
+        # frame to the ICRS frame
+        self._boresight = np.ascontiguousarray(
+                                    rotation_matrices(quaternion)[:, :, 0])
+        
+        # the Earth direction and the cosine of its angular radius
+        distance = np.linalg.norm(position, axis=1)
+        self._earth_dir = -position / distance[:, np.newaxis]
+        self._cos_earth = np.cos(np.arcsin(np.clip(earth_radius / distance, 
+                                                   0.0, 1.0)))
+        
+        self._saa = saa
+        self._fov_radius = float(fov_radius)
+        self._cos_fov = np.cos(np.deg2rad(fov_radius))
+        self._earth_radius = float(earth_radius)
+
+    @property
+    def earth_radius(self):
+        """(float): The radius of the Earth, in km"""
+        return self._earth_radius
+
+    @property
+    def fov_radius(self):
+        """(float): The radius of the field of view cone, in degrees"""
+        return self._fov_radius
+
+    @property
+    def num_samples(self):
+        """(int): The number of time samples"""
+        return self._time.size
+
+    @property
+    def time(self):
+        """(np.array): The MET of each sample"""
+        return self._time
+
+    def intervals(self, ra, dec, block_size=2**22):
+        """Return the intervals over which each position is visible.  An 
+        interval runs from the first to the last visible sample, as for 
+        :meth:`~gdt.core.data_primitives.Gti.from_boolean_mask`.
+
+        Args:
+            ra (float or np.array): The right ascension, in degrees
+            dec (float or np.array): The declination, in degrees
+            block_size (int, optional): The maximum number of 
+                                        (sample, position) pairs evaluated at
+                                        once.
+
+        Returns:
+            (list of :class:`~gdt.core.data_primitives.Gti`): The visible 
+            intervals of each position, or None for a position that is never
+            visible.  All positions are None if there are no samples.
+        """
+        vec = self._unit_vectors(ra, dec)
+        num_srcs = vec.shape[0]
+        if self.num_samples == 0:
+            return [None] * num_srcs
+        
+        # track the transitions between blocks of time, carrying over the
+        # visibility of the last sample of the previous block
+        src_starts, time_starts = [], []
+        src_stops, time_stops = [], []
+        prev = np.zeros(num_srcs, dtype=bool)
+        for i0, i1 in self._blocks(num_srcs, block_size):
+            visible = self._visible(vec, i0, i1)
+            changes = np.diff(np.vstack((prev, visible)).astype(np.int8), 
+                              axis=0)
+            row, src = np.nonzero(changes == 1)
+            src_starts.append(src)
+            time_starts.append(self._time[i0 + row])
+            row, src = np.nonzero(changes == -1)
+            src_stops.append(src)
+            time_stops.append(self._time[i0 + row - 1])
+            prev = visible[-1]
+        
+        # close any intervals that are open at the end
+        src = np.flatnonzero(prev)
+        src_stops.append(src)
+        time_stops.append(np.full(src.size, self._time[-1]))
+        
+        src_starts = np.concatenate(src_starts)
+        time_starts = np.concatenate(time_starts)
+        src_stops = np.concatenate(src_stops)
+        time_stops = np.concatenate(time_stops)
+        
+        # group by position; the intervals of each position are already in 
+        # time order, so the stable sort keeps the starts and stops paired
+        idx = np.argsort(src_starts, kind='stable')
+        time_starts = time_starts[idx]
+        time_stops = time_stops[np.argsort(src_stops, kind='stable')]
+        splits = np.cumsum(np.bincount(src_starts, minlength=num_srcs))[:-1]
+        
+        gtis = []
+        for starts, stops in zip(np.split(time_starts, splits), 
+                                 np.split(time_stops, splits)):
+            if starts.size == 0:
+                gtis.append(None)
+            else:
+                gtis.append(Gti.from_bounds(starts, stops))
+        return gtis
+
+    def mask(self, ra, dec):
+        """Return the visibility of each position at each sample.
+
+        Args:
+            ra (float or np.array): The right ascension, in degrees
+            dec (float or np.array): The declination, in degrees
+
+        Returns:
+            (np.array(dtype=bool)): Shape (num_samples, num_positions)
+        """
+        return self._visible(self._unit_vectors(ra, dec), 0, self.num_samples)
+
+    @classmethod
+    def from_sao(cls, sao, **kwargs):
+        """Create a BatVisibility object from an SAO file.
+
+        Args:
+            sao (:class:`~gdt.missions.swift.poshist.SwiftSao`): The SAO file
+            **kwargs: Options passed to :class:`BatVisibility`
+
+        Returns:
+            (:class:`BatVisibility`)
+        """
+        return cls(sao.sao_column('TIME'), sao.sao_column('POSITION'),
+                   sao.sao_column('QUATERNION'), 
+                   saa=sao.sao_column('SAA').astype(bool), **kwargs)
+
+    def _blocks(self, num_srcs, block_size):
+        """Split the samples into blocks of at most ``block_size`` 
+        (sample, position) pairs"""
+        step = max(1, block_size // max(num_srcs, 1))
+        for i0 in range(0, self.num_samples, step):
+            yield i0, min(i0 + step, self.num_samples)
+
+    def _visible(self, vec, i0, i1):
+        """The visibility of the positions for samples i0 to i1"""
+        in_fov = (self._boresight[i0:i1] @ vec.T) >= self._cos_fov
+        occulted = (self._earth_dir[i0:i1] @ vec.T) > \
+                   self._cos_earth[i0:i1, np.newaxis]
+        return in_fov & ~occulted & ~self._saa[i0:i1, np.newaxis]
+
+    @staticmethod
+    def _unit_vectors(ra, dec):
+        """Convert RA and Dec in degrees to unit vectors of shape (num, 3)"""
+        return _unit_vectors(ra, dec).reshape(-1, 3)
+
+    def __repr__(self):
+        return '<{0}: {1} samples; fov_radius={2} deg>'.format(
+                                                    self.__class__.__name__,
+                                                    self.num_samples, 
+                                                    self.fov_radius)
@@ -0,0 +1,253 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+import functools
+import os
+from pathlib import Path
+
+import numpy as np
+import astropy.io.fits as fits
+import astropy.units as u
+
+__all__ = ['SwiftClockCorrection']
+
+
+class SwiftClockCorrection():
+    """The Swift spacecraft clock correction, read from a local copy of the 
+    Swift clock-correction (swco) FITS table.
+    
+    Each row of the table covers a range of MET (TSTART-TSTOP) and gives a 
+    constant offset, TOFFSET, plus a quadratic in the time since TSTART:
+    
+        correction = TOFFSET + C0 + C1 * (met - TSTART) + C2 * (met - TSTART)**2
+    
+    In the swco table, TOFFSET is in seconds and the coefficients are in 
+    microseconds, microseconds/day and microseconds/day**2 (i.e. the 
+    polynomial is in days since TSTART).  The coefficients are converted from 
+    the units given in the table to seconds, seconds/second and 
+    seconds/second**2 when it is read, so the polynomial is evaluated in 
+    seconds.
+    
+    The rows are indexed by start time, so a whole array of times is 
+    corrected with one binary search.  The corrected time is 
+    ``met - correction``.
+    
+    The decoded table is cached per process, so opening the same (unmodified)
+    file again does not read it again.
+    """
+    _columns = ('TSTART', 'TSTOP', 'TOFFSET', 'C0', 'C1', 'C2')
+    
+    def __init__(self):
+        self._table = {col_name: np.array([]) for col_name in self._columns}
+        self._filename = None
+
+    @property
+    def filename(self):
+        """(str): The filename"""
+        return self._filename
+
+    @property
+    def num_rows(self):
+        """(int): The number of rows in the correction table"""
+        return self._table['TSTART'].size
+
+    def time_range(self):
+        """The range of MET covered by the table.
+        
+        Returns:
+            (float, float): The start and stop MET
+        """
+        return (self._table['TSTART'][0], self._table['TSTOP'][-1])
+
+    def apply(self, met):
+        """Apply the clock correction to Swift MET.
+
+        Args:
+            met (float or np.array): The time(s) in Swift MET
+
+        Returns:
+            (float or np.array): The corrected time(s)
+        """
+        met = np.asarray(met, dtype=float)
+        return met - self.correction(met)
+
+    def correction(self, met):
+        """Return the clock correction at the given times.
+
+        Args:
+            met (float or np.array): The time(s) in Swift MET
+
+        Returns:
+            (float or np.array): The correction, in seconds
+        """
+        met = np.asarray(met, dtype=float)
+        table = self._table
+        idx = np.searchsorted(table['TSTART'], met, side='right') - 1
+        valid = (idx >= 0)
+        idx = np.clip(idx, 0, None)
+        valid &= (met <= table['TSTOP'][idx])
+        if not np.all(valid):
+            raise ValueError('met is not covered by the clock correction '
+                             'table')
+        
+        dt = met - table['TSTART'][idx]
+        return table['TOFFSET'][idx] + table['C0'][idx] + \
+               dt * (table['C1'][idx] + dt * table['C2'][idx])
+
+    @classmethod
+    def open(cls, file_path):
+        """Open a Swift clock-correction FITS file.
+
+        Args:
+            file_path (str): The file path of the FITS file
+
+        Returns:
+            (:class:`SwiftClockCorrection`)
+        """
+        path = Path(file_path).resolve()
+        stat = os.stat(path)
+        table = _read_table(str(path), stat.st_mtime_ns, stat.st_size)
+        obj = cls.from_data(**{col_name.lower(): table[col_name] \
+                               for col_name in cls._columns})
+        obj._filename = path.name
+        return obj
+
+    @classmethod
+    def from_data(cls, tstart, tstop, toffset, c0, c1=None, c2=None):
+        """Create a SwiftClockCorrection object from the table columns.  The
+        polynomial is in seconds since the start of each row.
+
+        Args:
+            tstart (np.array): The start of each row, in MET
+            tstop (np.array): The end of each row, in MET
+            toffset (np.array): The constant offset of each row, in seconds
+            c0 (np.array): The constant coefficient, in seconds
+            c1 (np.array, optional): The linear coefficient, in s/s
+            c2 (np.array, optional): The quadratic coefficient, in s/s**2
+
+        Returns:
+            (:class:`SwiftClockCorrection`)
+        """
+        tstart = np.asarray(tstart, dtype=float).flatten()
+        if tstart.size == 0:
+            raise ValueError('The clock correction table must have at least '
+                             'one row')
+        if c1 is None:
+            c1 = np.zeros(tstart.size)
+        if c2 is None:
+            c2 = np.zeros(tstart.size)
+        
+        obj = cls()
+        idx = np.argsort(tstart, kind='stable')
+        for col_name, col in zip(cls._columns, 
+                                 (tstart, tstop, toffset, c0, c1, c2)):
+            col = np.asarray(col, dtype=float).flatten()
+            if col.size != tstart.size:
+                raise ValueError('{} must have the same number of rows as '
+                                 'tstart'.format(col_name))
+            obj._table[col_name] = col[idx]
+        return obj
+
+    def __repr__(self):
+        return '<{0}: {1} rows>'.format(self.__class__.__name__, 
+                                        self.num_rows)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_table(path, mtime_ns, size):
+    """Read the clock-correction table, converting the columns to seconds and
+    the coefficients to seconds per second**k.  The modification time and size
+    are part of the cache key, so a changed file is read again.
+
+    Args:
+        path (str): The resolved file path
+        mtime_ns (int): The modification time of the file
+        size (int): The size of the file
+
+    Returns:
+        (dict)
+    """
+    with fits.open(path) as hdulist:
+        hdu = hdulist[1]
+        names = [name.upper() for name in hdu.columns.names]
+        missing = [col_name for col_name in SwiftClockCorrection._columns \
+                   if col_name not in names]
+        if len(missing) > 0:
+            raise ValueError('{0} is not a clock-correction table: missing '
+                             'columns {1}'.format(path, missing))
+        
+        table = {}
+        for col_name in SwiftClockCorrection._columns:
+            unit = _column_unit(hdu.columns[col_name])
+            if col_name.startswith('C'):
+                # C0 in s, C1 in s/s, C2 in s/s**2
+                target = u.s / u.s**int(col_name[1])
+            else:
+                target = u.s
+            try:
+                scale = unit.to(target)
+            except u.UnitConversionError:
+                raise ValueError('Cannot convert column {0} in {1} from {2} '
+                                 'to {3}'.format(col_name, path, unit, 
+                                                 target))
+            table[col_name] = np.asarray(hdu.data[col_name], 
+                                         dtype=float) * scale
+    return table
+
+
+def _column_unit(col):
+    """Parse the unit of a clock-correction table column.  The time columns
+    default to seconds, but the coefficients must have a unit.
+
+    Args:
+        col (:class:`astropy.io.fits.Column`): The column
+
+    Returns:
+        (:class:`astropy.units.UnitBase`)
+    """
+    if not col.unit:
+        if col.name.upper().startswith('C'):
+            raise ValueError('Column {} has no unit'.format(col.name))
+        return u.s
+    try:
+        return u.Unit(col.unit)
+    except ValueError:
+        raise ValueError('Column {0} has an unknown unit: '
+                         '{1}'.format(col.name, col.unit))
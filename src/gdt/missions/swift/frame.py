@@ -38,11 +38,13 @@
 # License for the specific language governing permissions and limitations under
 # the License.
 #
+import numpy as np
+import astropy.units as u
 from astropy.coordinates import FunctionTransform, ICRS, frame_transform_graph
 from gdt.core.coords import *
-from gdt.core.coords.spacecraft.frame import spacecraft_to_icrs, icrs_to_spacecraft
 
-__all__ = ['SwiftFrame', 'swift_to_icrs', 'icrs_to_swift']
+__all__ = ['SwiftFrame', 'swift_to_icrs', 'icrs_to_swift', 'radec_to_azel',
+           'azel_to_radec', 'rotation_matrices']
 
 class SwiftFrame(SpacecraftFrame):
     """
@@ -50,6 +52,14 @@ class SwiftFrame(SpacecraftFrame):
     as a quaternion that represents a rotation from the Swift frame to the ICRS
     frame. This class is a wholesale inheritance of SpacecraftFrame
 
+    The transforms rotate the coordinates with the rotation matrices of the 
+    quaternion directly, instead of building a scipy Rotation for each call.
+    The matrices are computed the first time they are needed and cached on 
+    the frame.  Frames are immutable, and a copy of the frame with new 
+    attributes (e.g. through ``replicate`` or ``realize_frame``) is a new 
+    object, so the cached matrices always belong to the quaternion of the 
+    frame.
+
     Example use:
 
         >>> from gdt.core.coords import Quaternion
@@ -58,7 +68,18 @@ class SwiftFrame(SpacecraftFrame):
         >>> coord = SkyCoord(100.0, -30.0, unit='deg')
         >>> az_el = SkyCoord.transform_to(swift_frame)
     """
-    pass
+    @property
+    def rotation_matrices(self):
+        """(np.array): The rotation matrices from the Swift frame to the ICRS 
+        frame, shape (num_frames, 3, 3).  These are cached on the frame and 
+        should not be modified."""
+        matrices = self.__dict__.get('_rotation_matrices')
+        if matrices is None:
+            matrices = rotation_matrices(self.quaternion).reshape(-1, 3, 3)
+            matrices.flags.writeable = False
+            self._rotation_matrices = matrices
+        return matrices
+
 
 @frame_transform_graph.transform(FunctionTransform, SwiftFrame, ICRS)
 def swift_to_icrs(swift_frame, icrs_frame):
@@ -71,7 +92,11 @@ def swift_to_icrs(swift_frame, icrs_frame):
     Returns:
         (:class:`astropy.coordinates.ICRS`)
     """
-    return spacecraft_to_icrs(swift_frame, icrs_frame)
+    xyz = _apply_rotation(swift_frame.rotation_matrices, 
+                          swift_frame.cartesian.xyz.value)
+    ra, dec = _lon_lat(xyz)
+    icrs = ICRS(ra=ra * u.deg, dec=dec * u.deg)
+    return icrs.transform_to(icrs_frame)
 
 @frame_transform_graph.transform(FunctionTransform, ICRS, SwiftFrame)
 def icrs_to_swift(icrs_frame, swift_frame):
@@ -84,4 +109,146 @@ def icrs_to_swift(icrs_frame, swift_frame):
     Returns:
         (:class:`SwiftFrame`)
     """
-    return icrs_to_spacecraft(icrs_frame, swift_frame)
+    # the inverse rotation is the transpose of the rotation matrix
+    matrices = np.swapaxes(swift_frame.rotation_matrices, -1, -2)
+    xyz = _apply_rotation(matrices, icrs_frame.cartesian.xyz.value)
+    az, el = _lon_lat(xyz)
+    return type(swift_frame)(az=az * u.deg, el=el * u.deg,
+                             quaternion=swift_frame.quaternion)
+
+
+def rotation_matrices(quaternion):
+    """Compute the rotation matrices from the Swift frame to the ICRS frame.
+
+    Args:
+        quaternion (:class:`~gdt.core.coords.Quaternion` or np.array): 
+            The attitude quaternion(s), scalar last, shape (..., 4)
+
+    Returns:
+        (np.array): The rotation matrices, shape (..., 3, 3)
+    """
+    if isinstance(quaternion, Quaternion):
+        quaternion = np.stack((quaternion.x, quaternion.y, quaternion.z, 
+                               quaternion.w), axis=-1)
+    quat = np.asarray(quaternion, dtype=float)
+    if quat.shape[-1] != 4:
+        raise ValueError('quaternion must have shape (..., 4)')
+    quat = quat / np.linalg.norm(quat, axis=-1, keepdims=True)
+    x, y, z, w = np.moveaxis(quat, -1, 0)
+
+    matrix = np.empty(quat.shape[:-1] + (3, 3))
+    matrix[..., 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+    matrix[..., 0, 1] = 2.0 * (x * y - z * w)
+    matrix[..., 0, 2] = 2.0 * (x * z + y * w)
+    matrix[..., 1, 0] = 2.0 * (x * y + z * w)
+    matrix[..., 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+    matrix[..., 1, 2] = 2.0 * (y * z - x * w)
+    matrix[..., 2, 0] = 2.0 * (x * z - y * w)
+    matrix[..., 2, 1] = 2.0 * (y * z + x * w)
+    matrix[..., 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+    return matrix
+
+
+def radec_to_azel(ra, dec, quaternion):
+    """Convert equatorial (ICRS) coordinates to Swift azimuth and elevation 
+    for an array of attitudes, without creating any astropy frames.  This is
+    equivalent to transforming a SkyCoord to a :class:`SwiftFrame` for each
+    attitude.
+    
+    The output is broadcast over the attitudes and the positions, so that for
+    N quaternions and M positions the result has shape (N, M).
+
+    Args:
+        ra (float or np.array): The right ascension, in degrees
+        dec (float or np.array): The declination, in degrees
+        quaternion (:class:`~gdt.core.coords.Quaternion`, np.array, or :class:`SwiftFrame`): 
+            The attitude quaternion(s), scalar last, shape (N, 4) or (4,).
+            If a SwiftFrame is given, its cached rotation matrices are used.
+
+    Returns:
+        (np.array, np.array): The azimuth (0-360 deg) and elevation 
+                              (-90-90 deg)
+    """
+    matrix = _as_matrices(quaternion)
+    vec = _unit_vectors(ra, dec)
+    # the inverse (transposed) rotation takes ICRS to the Swift frame
+    vec_prime = np.einsum('...ji,mj->...mi', matrix, vec.reshape(-1, 3))
+    vec_prime = vec_prime.reshape(matrix.shape[:-2] + vec.shape)
+    return _lon_lat(vec_prime)
+
+
+def azel_to_radec(az, el, quaternion):
+    """Convert Swift azimuth and elevation to equatorial (ICRS) coordinates
+    for an array of attitudes, without creating any astropy frames.  This is
+    equivalent to transforming a SkyCoord in a :class:`SwiftFrame` to ICRS 
+    for each attitude.
+    
+    The output is broadcast over the attitudes and the positions, so that for
+    N quaternions and M positions the result has shape (N, M).
+
+    Args:
+        az (float or np.array): The azimuth, in degrees
+        el (float or np.array): The elevation, in degrees
+        quaternion (:class:`~gdt.core.coords.Quaternion`, np.array, or :class:`SwiftFrame`): 
+            The attitude quaternion(s), scalar last, shape (N, 4) or (4,).
+            If a SwiftFrame is given, its cached rotation matrices are used.
+
+    Returns:
+        (np.array, np.array): The right ascension (0-360 deg) and declination
+                              (-90-90 deg)
+    """
+    matrix = _as_matrices(quaternion)
+    vec = _unit_vectors(az, el)
+    vec_prime = np.einsum('...ij,mj->...mi', matrix, vec.reshape(-1, 3))
+    vec_prime = vec_prime.reshape(matrix.shape[:-2] + vec.shape)
+    return _lon_lat(vec_prime)
+
+
+def _apply_rotation(matrices, xyz):
+    """Rotate Cartesian vectors by an array of rotation matrices.  As for the 
+    spacecraft frame transforms, either may be a single element, otherwise 
+    they are paired element by element.
+
+    Args:
+        matrices (np.array): The rotation matrices, shape (num_frames, 3, 3)
+        xyz (np.array): The vectors, shape (3, ...)
+
+    Returns:
+        (np.array): The rotated vectors, shape (num, 3)
+    """
+    xyz = xyz.reshape(3, -1).T
+    if xyz.shape[0] == 1:
+        return matrices @ xyz[0]
+    elif matrices.shape[0] == 1:
+        return xyz @ matrices[0].T
+    return np.einsum('nij,nj->ni', matrices, xyz)
+
+
+def _as_matrices(quaternion):
+    """Return the rotation matrices for a quaternion input, the cached 
+    matrices of a SwiftFrame, or the input itself if it is already an array of
+    rotation matrices"""
+    if isinstance(quaternion, SwiftFrame):
+        return quaternion.rotation_matrices
+    elif not isinstance(quaternion, Quaternion):
+        quaternion = np.asarray(quaternion, dtype=float)
+        if quaternion.shape[-2:] == (3, 3):
+            return quaternion
+    return rotation_matrices(quaternion)
+
+
+def _unit_vectors(lon, lat):
+    """Convert longitude and latitude in degrees to Cartesian unit vectors of 
+    shape (..., 3)"""
+    lon, lat = np.broadcast_arrays(np.deg2rad(lon), np.deg2rad(lat))
+    cos_lat = np.cos(lat)
+    return np.stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), 
+                     np.sin(lat)), axis=-1)
+
+
+def _lon_lat(vec):
+    """Convert Cartesian unit vectors of shape (..., 3) to longitude 
+    (0-360 deg) and latitude (-90-90 deg)"""
+    lon = np.rad2deg(np.arctan2(vec[..., 1], vec[..., 0])) % 360.0
+    lat = 90.0 - np.rad2deg(np.arccos(np.clip(vec[..., 2], -1.0, 1.0)))
+    return lon, lat
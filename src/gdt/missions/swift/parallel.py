@@ -0,0 +1,188 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT
+# WITH UNLIMITED RIGHTS
+#
+# Grant No.: 80NSSC21K0651
+# Grantee Name: Universities Space Research Association
+# Grantee Address: 425 3rd Street SW, Suite 950, Washington DC 20024
+#
+# Copyright 2024 by Universities Space Research Association (USRA). All rights
+# reserved.
+#
+# Developed by: Corinne Fletcher
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# This work is a derivative of the Gamma-ray Data Tools (GDT), including the
+# Core and Fermi packages, originally developed by the following:
+#
+#     William Cleveland and Adam Goldstein
+#     Universities Space Research Association
+#     Science and Technology Institute
+#     https://sti.usra.edu
+#
+#     Daniel Kocevski
+#     National Aeronautics and Space Administration (NASA)
+#     Marshall Space Flight Center
+#     Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+import os
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+__all__ = ['iter_open', 'open_many']
+
+_executors = {'process': ProcessPoolExecutor, 'thread': ThreadPoolExecutor}
+
+
+def iter_open(cls, paths, workers=None, executor='process', max_in_flight=None,
+              **kwargs):
+    """Open many files of the same type across a pool of workers, yielding 
+    the opened objects in the order of the input paths.
+    
+    At most ``max_in_flight`` files are submitted ahead of the object that is
+    next to be yielded, so the number of opened objects held by the pool (and
+    waiting to be yielded in order) is bounded no matter how many paths are 
+    given.  A file that fails to open is reported with a warning and yields 
+    None in its place, and the remaining files are still opened.
+    
+    With the 'process' executor, the opened objects are pickled back from the
+    worker processes, so this is best suited to objects that are fully read on
+    open (e.g. :class:`~gdt.missions.swift.bat.pha.BatPha`), or that are 
+    opened again when unpickled (e.g. a :class:`~gdt.missions.swift.poshist.SwiftSao`
+    opened in lazy mode).  The 'thread'
+    executor avoids the copy, and still runs in parallel where the reading 
+    releases the GIL (e.g. gzip decompression).
+
+    Args:
+        cls (class): The class to open the files with, e.g. 
+                     :class:`~gdt.missions.swift.bat.pha.BatPha`.  The files 
+                     are opened with ``cls.open(path, **kwargs)``.
+        paths (list of str): The file paths
+        workers (int, optional): The number of workers.  If omitted, uses the 
+                                 number of CPUs.  If 1, the files are opened in
+                                 this thread.
+        executor (str, optional): Either 'process' or 'thread'. Default is 
+                                  'process'.
+        max_in_flight (int, optional): The maximum number of files submitted
+                                       but not yet yielded. If omitted, uses 
+                                       twice the number of workers.
+        **kwargs: Options passed to ``cls.open``
+
+    Yields:
+        (object or None): The opened object, or None if the file could not be
+                          opened
+    """
+    if executor not in _executors:
+        raise ValueError("executor must be one of 'process' or 'thread'")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('workers must be >= 1')
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    if max_in_flight < 1:
+        raise ValueError('max_in_flight must be >= 1')
+    
+    paths = [str(path) for path in paths]
+    if workers == 1:
+        for path in paths:
+            yield _result(path, *_open_one(cls, path, kwargs))
+        return
+    
+    pool = _executors[executor](max_workers=workers)
+    futures = deque()
+    try:
+        for i, path in enumerate(paths):
+            while (len(futures) < max_in_flight) and \
+                  (i + len(futures) < len(paths)):
+                futures.append(pool.submit(_open_one, cls, 
+                                           paths[i + len(futures)], kwargs))
+            try:
+                obj, error = futures.popleft().result()
+            except Exception as err:
+                # e.g. the object could not be sent back from the worker
+                obj, error = None, '{}: {}'.format(err.__class__.__name__, err)
+            yield _result(path, obj, error)
+    finally:
+        # if iteration stops early, the files not yet started are dropped
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+def open_many(cls, paths, workers=None, executor='process', max_in_flight=None,
+              **kwargs):
+    """Open many files of the same type across a pool of workers.  For 
+    example, ``open_many(BatPha, paths, workers=8)`` opens the files in eight
+    processes.  See :func:`iter_open` for the options; this returns the
+    objects as a list in the order of the input paths, with None in place of 
+    any file that could not be opened.
+
+    Args:
+        cls (class): The class to open the files with
+        paths (list of str): The file paths
+        workers (int, optional): The number of workers.  If omitted, uses the 
+                                 number of CPUs.  If 1, the files are opened in
+                                 this thread.
+        executor (str, optional): Either 'process' or 'thread'. Default is 
+                                  'process'.
+        max_in_flight (int, optional): The maximum number of files submitted
+                                       but not yet collected. If omitted, uses 
+                                       twice the number of workers.
+        **kwargs: Options passed to ``cls.open``
+
+    Returns:
+        (list)
+    """
+    return list(iter_open(cls, paths, workers=workers, executor=executor,
+                          max_in_flight=max_in_flight, **kwargs))
+
+
+def _open_one(cls, path, kwargs):
+    """Open a single file, returning the error rather than raising it so that
+    one bad file does not stop the batch.
+
+    Args:
+        cls (class): The class to open the file with
+        path (str): The file path
+        kwargs (dict): Options passed to ``cls.open``
+
+    Returns:
+        (object, str): The opened object and None, or None and the error 
+                       message
+    """
+    try:
+        return (cls.open(path, **kwargs), None)
+    except Exception as err:
+        return (None, '{}: {}'.format(err.__class__.__name__, err))
+
+
+def _result(path, obj, error):
+    """Warn about a file that could not be opened.
+
+    Args:
+        path (str): The file path
+        obj (object or None): The opened object
+        error (str or None): The error message
+
+    Returns:
+        (object or None)
+    """
+    if error is not None:
+        warnings.warn('Could not open {}: {}'.format(path, error), 
+                      RuntimeWarning, stacklevel=3)
+    return obj
@@ -38,64 +38,216 @@
 # License for the specific language governing permissions and limitations under
 # the License.
 #
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
 import numpy as np
+import astropy.io.fits as fits
 import astropy.units as u
 from astropy.timeseries import TimeSeries
 import astropy.coordinates.representation as r
+from gdt.core import cache_path
 from gdt.core.coords import Quaternion
+from gdt.core.data_primitives import Gti
 from gdt.core.file import FitsFileContextManager
 from gdt.core.coords.spacecraft import SpacecraftFrameModelMixin, SpacecraftStatesModelMixin
 from gdt.core.coords.spacecraft import SpacecraftFrame
+from gdt.missions.swift.frame import SwiftFrame
 from gdt.missions.swift.time import Time
-from gdt.missions.swift.bat.headers import SaoHeaders
+from gdt.missions.swift.bat.headers import SaoHeaders, AttHeaders
 
 
-__all__ = ['SwiftSao']
+__all__ = ['SwiftSao', 'SwiftAttitude', 'SwiftSaoCache']
 
 
 class SwiftSao(SpacecraftFrameModelMixin, SpacecraftStatesModelMixin, FitsFileContextManager):
     """Class for reading a Swift SAO Position history file.
     """
+    _columns = ('TIME', 'POSITION', 'VELOCITY', 'QUATERNION', 'SUNSHINE', 
+                'SAA')
+    _units = {'TIME': 's', 'POSITION': 'km', 'VELOCITY': 'km/s'}
+    
+    def __init__(self):
+        super().__init__()
+        self._data = {}
+        self._bytes_read = 0
+        self._state_index = {}
+        self._file_path = None
+        self._lazy = False
 
-    @staticmethod
-    def _reorder_bytes(arr):
-        """Method to reorder bytes according to old and new numpy API"""
-        if np.__version__ >= '2.0.0':
-            return arr.view(arr.dtype.newbyteorder()).byteswap()
-        return arr.byteswap().newbyteorder()
+    @property
+    def bytes_read(self):
+        """(int): The number of bytes of table data decoded from the file so 
+        far"""
+        return self._bytes_read
 
-    def get_spacecraft_frame(self) -> SpacecraftFrame:
+    @property
+    def headers(self):
+        """(:class:`~gdt.missions.swift.bat.headers.SaoHeaders`): The headers.
+        For a file opened in lazy mode, the headers are parsed on first 
+        access."""
+        if (self._headers is None) and (self._hdulist is not None):
+            hdrs = [hdu.header for hdu in self._hdulist]
+            self._headers = SaoHeaders.from_headers(hdrs)
+        return self._headers
 
-        sc_frame = SpacecraftFrame(
-            obsgeoloc=r.CartesianRepresentation(
-                x = self._reorder_bytes(self.ndim_column_as_array(1, 'POSITION', 0)),
-                y = self._reorder_bytes(self.ndim_column_as_array(1, 'POSITION', 1)),
-                z = self._reorder_bytes(self.ndim_column_as_array(1, 'POSITION', 2)),
-                unit=u.km
-            ),
-            obsgeovel=r.CartesianRepresentation(
-                x=self._reorder_bytes(self.ndim_column_as_array(1, 'VELOCITY', 0)),
-                y=self._reorder_bytes(self.ndim_column_as_array(1, 'VELOCITY', 1)),
-                z=self._reorder_bytes(self.ndim_column_as_array(1, 'VELOCITY', 2)),
-                unit=u.km/u.s
-            ),
-            quaternion=Quaternion(self._reorder_bytes(self.column(1,'QUATERNION'))),
-            obstime=Time(self.column(1, 'TIME'), format='swift')
+    def frame_at(self, met) -> SwiftFrame:
+        """Return the interpolated Swift frame at the requested times.  
+        The TIME column is binary searched for each requested time, the 
+        position and velocity are linearly interpolated, and the attitude 
+        quaternion is spherically interpolated (slerp) between the bracketing 
+        rows.  Only the requested frames are built, so this is much cheaper 
+        than :meth:`get_spacecraft_frame` when only a few times are needed.
+
+        Args:
+            met (float or np.array): The time(s) in Swift MET
+
+        Returns:
+            (:class:`~gdt.missions.swift.frame.SwiftFrame`)
+        """
+        met = np.asarray(met, dtype=float)
+        idx, frac = _bracket(self._sao_column('TIME'), met)
+        pos = _lerp(self._sao_column('POSITION'), idx, frac)
+        vel = _lerp(self._sao_column('VELOCITY'), idx, frac)
+        quat = self._sao_column('QUATERNION')
+        quat = _slerp(quat[idx], quat[idx + 1], frac)
+
+        frame = SwiftFrame(
+            obsgeoloc=r.CartesianRepresentation(np.moveaxis(pos, -1, 0), 
+                                                unit=u.km),
+            obsgeovel=r.CartesianRepresentation(np.moveaxis(vel, -1, 0),
+                                                unit=u.km/u.s),
+            quaternion=Quaternion(quat),
+            obstime=Time(met, format='swift')
         )
+        return frame
+
+    def get_spacecraft_frame(self, attitude=None) -> SpacecraftFrame:
+        """Return the spacecraft frame at each row of the file.
 
+        Args:
+            attitude (:class:`SwiftAttitude`, optional): 
+                If given, the quaternions are interpolated from this attitude
+                history instead of taken from the SAO QUATERNION column.  
+                Rows outside of the time range of the attitude history (e.g.
+                at the edges of a stitched SAO timeline) keep the SAO 
+                quaternion.
+
+        Returns:
+            (:class:`~gdt.core.coords.SpacecraftFrame`)
+        """
+        if attitude is not None:
+            time = self._sao_column('TIME')
+            tmin, tmax = attitude.time_range()
+            mask = (time >= tmin) & (time <= tmax)
+            quat = self._sao_column('QUATERNION').astype(float)
+            quat[mask] = attitude._slerp_at(time[mask])
+            quaternion = Quaternion(quat)
+        else:
+            quaternion = Quaternion(self._sao_column('QUATERNION'))
+        
+        sc_frame = SpacecraftFrame(
+            obsgeoloc=r.CartesianRepresentation(self._sao_column('POSITION').T,
+                                                unit=u.km),
+            obsgeovel=r.CartesianRepresentation(self._sao_column('VELOCITY').T,
+                                                unit=u.km/u.s),
+            quaternion=quaternion,
+            obstime=Time(self._sao_column('TIME'), format='swift')
+        )
 
         return sc_frame
 
     def get_spacecraft_states(self) -> TimeSeries:
         series = TimeSeries(
-            time=Time(self.column(1, 'TIME'), format='swift'),
+            time=Time(self._sao_column('TIME'), format='swift'),
             data={
-                'sun': self.column(1, 'SUNSHINE'),
-                'saa': self.column(1, 'SAA'),
+                'sun': self._sao_column('SUNSHINE'),
+                'saa': self._sao_column('SAA'),
             }
         )
         return series
 
+    def good_intervals(self, tstart, tstop):
+        """Return the Good Time Intervals (outside the SAA) between two times.
+        The interval is clipped to the time range covered by the file.
+
+        Args:
+            tstart (float): The start of the interval in Swift MET
+            tstop (float): The end of the interval in Swift MET
+
+        Returns:
+            (:class:`~gdt.core.data_primitives.Gti`): The good time intervals, 
+            or None if there is no good time in the interval.
+        """
+        time = self._sao_column('TIME')
+        tstart = max(float(tstart), time[0])
+        tstop = min(float(tstop), time[-1])
+        if tstart >= tstop:
+            return None
+        
+        # the good intervals are the gaps between the SAA intervals
+        starts, stops = self._state_intervals('SAA')
+        lo = np.concatenate(([tstart], stops))
+        hi = np.concatenate((starts, [tstop]))
+        lo = np.clip(lo, tstart, tstop)
+        hi = np.clip(hi, tstart, tstop)
+        mask = (hi > lo)
+        if mask.sum() == 0:
+            return None
+        return Gti.from_bounds(lo[mask], hi[mask])
+
+    def in_saa(self, met):
+        """Determine if the spacecraft was in the SAA at the given times.  
+        Times outside of the file are reported as False.
+
+        Args:
+            met (float or np.array): The time(s) in Swift MET
+
+        Returns:
+            (np.array(dtype=bool))
+        """
+        return self._in_state('SAA', met)
+
+    def saa_during(self, tstart, tstop):
+        """Determine if the spacecraft was in the SAA at any point during each
+        of a set of time windows.
+
+        Args:
+            tstart (float or np.array): The start time(s) of the windows in
+                                        Swift MET
+            tstop (float or np.array): The end time(s) of the windows in
+                                       Swift MET
+
+        Returns:
+            (np.array(dtype=bool))
+        """
+        tstart, tstop = np.broadcast_arrays(np.asarray(tstart, dtype=float),
+                                            np.asarray(tstop, dtype=float))
+        starts, stops = self._state_intervals('SAA')
+        
+        # the intervals are disjoint and sorted, so the last interval starting
+        # before the end of a window is the only one that can overlap it
+        idx = np.searchsorted(starts, tstop, side='right') - 1
+        valid = (idx >= 0)
+        overlap = np.zeros(tstart.shape, dtype=bool)
+        overlap[valid] = stops[idx[valid]] > tstart[valid]
+        return overlap
+
+    def sunlit(self, met):
+        """Determine if the spacecraft was in sunlight at the given times.  
+        Times outside of the file are reported as False.
+
+        Args:
+            met (float or np.array): The time(s) in Swift MET
+
+        Returns:
+            (np.array(dtype=bool))
+        """
+        return self._in_state('SUNSHINE', met)
+
     def get_bat_pointing(self):
         bat_ra = self.headers['PRIMARY']['RA_PNT']
         bat_dec = self.headers['PRIMARY']['DEC_PNT']
@@ -115,35 +267,737 @@ class SwiftSao(SpacecraftFrameModelMixin, SpacecraftStatesModelMixin, FitsFileCo
     def time_range(self):
         return(self.get_tstart(), self.get_tstop())
 
+    def ndim_column(self, hdu_num: int, col_name: str) -> np.array:
+        """Return a multi-dimensional column (e.g. POSITION, VELOCITY or 
+        QUATERNION) from an HDU as a single native-endian array of shape
+        (num_rows, num_elements).  The column is sliced directly from the FITS
+        table without any per-row Python work.
+
+        Args:
+            hdu_num (int): The HDU number
+            col_name (str): The name of the column
+
+        Returns:
+            (np.array)
+        """
+        col = self._native(self.hdulist[hdu_num].data[col_name])
+        return col.reshape(col.shape[0], -1)
+
     def ndim_column_as_array(self, hdu_num: int, col_name: str, arr_num: int)-> np.array:
-        """Return a list of columns from an HDU as an array.
+        """Return one element of a multi-dimensional column from an HDU as an
+        array.
 
         Args:
             hdu_num (int): The HDU number
-            col_names (list of str): The names of the columns
-            dtype (np.dtype, optional): The custom dtype of the output array
+            col_name (str): The name of the column
+            arr_num (int): The index of the element within each row
+
+        Returns:
+            (np.array)
+        """
+        return self.ndim_column(hdu_num, col_name)[:, arr_num]
+
+    def sao_column(self, col_name):
+        """Return a column of the SAO table as a native-endian array.  Unlike
+        :meth:`column`, this also works for objects that were not read from a
+        file (e.g. stitched, or loaded from a :class:`SwiftSaoCache`).  The 
+        returned array is shared with the object and should not be modified.
+
+        Args:
+            col_name (str): The name of the column
 
         Returns:
             (np.array)
         """
-        items = self.column(hdu_num, col_name)
-        new_array = []
-        for item in items:
-            new_array += [item[arr_num]]
-        return np.array(new_array)
+        return self._sao_column(col_name)
 
     @classmethod
-    def open(cls, file_path, **kwargs):
+    def open(cls, file_path, lazy=False, cache=None, **kwargs):
         """Open a Swift BAT SAO FITS file.
+        
+        In lazy mode, the file is memory mapped, the headers are only parsed 
+        when first accessed, and each column is only decoded (and cached) when 
+        it is first needed.  For example, :meth:`get_spacecraft_states` will
+        only read the TIME, SUNSHINE, and SAA columns.  Memory mapping only 
+        applies to uncompressed files; for gzipped files the decompression 
+        still happens, but the column decoding and header parsing are deferred.
+        :attr:`bytes_read` reports how much table data was actually decoded.
+        When pickled (e.g. to send it to another process), a lazy object only 
+        keeps the columns decoded so far and the file path, and the file is 
+        opened again in lazy mode when it is unpickled.  An object that is not
+        lazy is pickled with all of its columns.
+        
+        If a :class:`SwiftSaoCache` is given, the decoded columns and headers 
+        are loaded from the cache if the file has been opened before, 
+        otherwise the file is read and stored in the cache.  An object loaded
+        from the cache has no open FITS file, and ``lazy`` is ignored.
+
+        Args:
+            file_path (str): The file path of the FITS file
+            lazy (bool, optional): If True, open the file in lazy mode. 
+                                   Default is False.
+            cache (:class:`SwiftSaoCache`, optional): The on-disk cache
+
+        Returns:
+            (:class:`SwiftSao`)
+        """
+        if cache is not None:
+            entry = cache.get(file_path)
+            if entry is not None:
+                data, hdrs = entry
+                return cls.from_data(*[data[col_name] for col_name in cls._columns],
+                                     headers=SaoHeaders.from_headers(hdrs),
+                                     filename=Path(file_path).name)
+        
+        if lazy:
+            kwargs['memmap'] = True
+        obj = super().open(file_path, **kwargs)
+        obj._file_path = str(Path(file_path).resolve())
+        obj._lazy = lazy
+        if not lazy:
+            hdrs = [hdu.header for hdu in obj.hdulist]
+            obj._headers = SaoHeaders.from_headers(hdrs)
+            obj._index_states()
+        
+        if cache is not None:
+            data = {col_name: obj._sao_column(col_name) \
+                    for col_name in cls._columns}
+            cache.put(file_path, data, [hdu.header for hdu in obj.hdulist])
+
+        return obj
+
+    @classmethod
+    def from_data(cls, time, position, velocity, quaternion, sunshine=None,
+                  saa=None, headers=None, filename=None):
+        """Create a SwiftSao object from arrays of the SAO columns.
+
+        Args:
+            time (np.array): The MET of each row
+            position (np.array): The spacecraft position in km, 
+                                 shape (num_rows, 3)
+            velocity (np.array): The spacecraft velocity in km/s, 
+                                 shape (num_rows, 3)
+            quaternion (np.array): The attitude quaternions, scalar last, 
+                                   shape (num_rows, 4)
+            sunshine (np.array, optional): The sunshine flag of each row
+            saa (np.array, optional): The SAA flag of each row
+            headers (:class:`~gdt.missions.swift.bat.headers.SaoHeaders`, optional):
+                The file headers
+            filename (str, optional): The filename
+
+        Returns:
+            (:class:`SwiftSao`)
+        """
+        obj = cls()
+        obj._filename = filename
+        
+        time = np.asarray(time, dtype=float).flatten()
+        num_rows = time.size
+        if sunshine is None:
+            sunshine = np.zeros(num_rows, dtype=np.int16)
+        if saa is None:
+            saa = np.zeros(num_rows, dtype=np.int16)
+        columns = (time, np.asarray(position), np.asarray(velocity), 
+                   np.asarray(quaternion), np.asarray(sunshine), 
+                   np.asarray(saa))
+        for col_name, col in zip(cls._columns, columns):
+            if col.shape[0] != num_rows:
+                raise ValueError('{} must have the same number of rows as '
+                                 'time'.format(col_name))
+            obj._data[col_name] = cls._native(col)
+
+        if headers is not None:
+            if not isinstance(headers, SaoHeaders):
+                raise TypeError('headers must be of type SaoHeaders')
+        else:
+            headers = SaoHeaders()
+            if num_rows > 0:
+                for hdr in headers:
+                    hdr['TSTART'] = time[0]
+                    hdr['TSTOP'] = time[-1]
+        obj._headers = headers
+        obj._index_states()
+
+        return obj
+
+    @classmethod
+    def open_many(cls, file_paths, **kwargs):
+        """Open several Swift SAO FITS files and stitch them into a single
+        time-ordered SwiftSao object.  The rows are sorted by TIME and rows 
+        with a duplicate TIME (where files overlap, or the same file is given
+        more than once) are only kept once, taking the row from the file that
+        appears first in ``file_paths``.  The headers are taken from the 
+        earliest file, with TSTART and TSTOP updated to cover the stitched 
+        timeline.  A ValueError is raised if no file paths are given.
+
+        Args:
+            file_paths (list of str): The file paths of the FITS files
+
+        Returns:
+            (:class:`SwiftSao`)
+        """
+        file_paths = list(file_paths)
+        if len(file_paths) == 0:
+            raise ValueError('At least one file must be provided')
+
+        # each file is opened once, and its columns are read through 
+        # sao_column, so that lazy and cached opening also apply here
+        columns = {col_name: [] for col_name in cls._columns}
+        headers = None
+        for file_path in file_paths:
+            with cls.open(file_path, **kwargs) as sao:
+                for col_name in cls._columns:
+                    columns[col_name].append(sao.sao_column(col_name))
+                if (headers is None) or \
+                   (sao.get_tstart() < headers['PRIMARY']['TSTART']):
+                    headers = sao.headers
+        data = {col_name: np.concatenate(cols) \
+                for col_name, cols in columns.items()}
+
+        # sort by time, keeping only the first of any duplicate times
+        idx = np.argsort(data['TIME'], kind='stable')
+        time = data['TIME'][idx]
+        keep = np.ones(time.size, dtype=bool)
+        keep[1:] = time[1:] > time[:-1]
+        idx = idx[keep]
+
+        for hdr in headers:
+            hdr['TSTART'] = data['TIME'][idx[0]]
+            hdr['TSTOP'] = data['TIME'][idx[-1]]
+        
+        return cls.from_data(*[data[col_name][idx] for col_name in cls._columns],
+                             headers=headers)
+
+    def __getstate__(self):
+        # an open FITS file cannot be pickled.  A lazy object is opened again
+        # when unpickled, otherwise any columns not yet decoded and the headers
+        # are read from the file before it is dropped
+        if (self._hdulist is not None) and not self._lazy:
+            for col_name in self._columns:
+                self._sao_column(col_name)
+            self.headers
+        state = self.__dict__.copy()
+        state['_hdulist'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._lazy and (self._file_path is not None):
+            self._hdulist = fits.open(self._file_path, memmap=True)
+
+    def _build_hdulist(self):
+        # for an object without an open file (e.g. stitched, loaded from the
+        # cache, or unpickled), the table is built from the decoded columns
+        hdulist = fits.HDUList()
+        primary_hdu = fits.PrimaryHDU(header=self.headers['PRIMARY'])
+        hdulist.append(primary_hdu)
+
+        cols = [self._sao_column(col_name) for col_name in self._columns]
+        data = np.empty(cols[0].shape[0], 
+                        dtype=[(col_name, col.dtype, col.shape[1:]) \
+                               for col_name, col in zip(self._columns, cols)])
+        for col_name, col in zip(self._columns, cols):
+            data[col_name] = col
+        coldefs = fits.ColDefs(data)
+        for col_name, unit in self._units.items():
+            coldefs[col_name].unit = unit
+        
+        sao_hdu = fits.BinTableHDU.from_columns(coldefs, 
+                                                header=self.headers['PREFILTER'])
+        hdulist.append(sao_hdu)
+        return hdulist
+
+    def _sao_column(self, col_name):
+        """Return a native-endian column of the SAO table.  Columns are read
+        from the file on first access and cached.
+
+        Args:
+            col_name (str): The name of the column
+
+        Returns:
+            (np.array)
+        """
+        if col_name not in self._data:
+            col = self._native(self.hdulist[1].data[col_name])
+            self._bytes_read += col.nbytes
+            self._data[col_name] = col
+        return self._data[col_name]
+
+    def _in_state(self, col_name, met):
+        """Look up the state flag at the given times from the interval index.
+
+        Args:
+            col_name (str): The name of the flag column
+            met (float or np.array): The time(s) in Swift MET
+
+        Returns:
+            (np.array(dtype=bool))
+        """
+        met = np.asarray(met, dtype=float)
+        starts, stops = self._state_intervals(col_name)
+        idx = np.searchsorted(starts, met, side='right') - 1
+        valid = (idx >= 0)
+        state = np.zeros(met.shape, dtype=bool)
+        state[valid] = met[valid] < stops[idx[valid]]
+        return state
+
+    def _state_intervals(self, col_name):
+        """Return the run-length encoded intervals over which a state flag is
+        set.  The index is built once and cached.
+        
+        Each interval starts at the first sample with the flag set and stops at
+        the next sample, so that the state between samples is that of the 
+        preceding sample. The last interval is closed at the last sample.
+
+        Args:
+            col_name (str): The name of the flag column
+
+        Returns:
+            (np.array, np.array): The interval start and stop times
+        """
+        if col_name not in self._state_index:
+            time = self._sao_column('TIME')
+            flag = self._sao_column(col_name).astype(bool)
+            
+            edges = np.diff(flag.astype(np.int8))
+            istart = np.flatnonzero(edges == 1) + 1
+            istop = np.flatnonzero(edges == -1) + 1
+            if flag.size > 0 and flag[0]:
+                istart = np.concatenate(([0], istart))
+            
+            starts = time[istart]
+            stops = np.empty(istart.size, dtype=float)
+            stops[:istop.size] = time[istop]
+            if istop.size < istart.size:
+                stops[-1] = np.nextafter(time[-1], np.inf)
+            self._state_index[col_name] = (starts, stops)
+        return self._state_index[col_name]
+
+    def _index_states(self):
+        """Build the interval index of the SAA and sunshine flags"""
+        for col_name in ('SAA', 'SUNSHINE'):
+            self._state_intervals(col_name)
+
+    @staticmethod
+    def _native(arr):
+        """Return a contiguous, native-endian copy of an array, or the array
+        itself if it is already contiguous and native-endian."""
+        arr = np.asarray(arr)
+        return np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder('='))
+
+
+class SwiftAttitude(SpacecraftFrameModelMixin, FitsFileContextManager):
+    """Class for reading a Swift attitude file (sat, pat, or uat).
+    
+    The attitude files are sampled much more finely than the SAO file.  The 
+    TIME and QPARAM columns of the ATTITUDE extension are decoded once on 
+    open, and rows with a duplicate TIME are dropped.
+    """
+    def __init__(self):
+        super().__init__()
+        self._time = np.array([], dtype=float)
+        self._quat = np.empty((0, 4), dtype=float)
+
+    @property
+    def num_rows(self):
+        """(int): The number of attitude samples"""
+        return self._time.size
+
+    @property
+    def quaternion(self):
+        """(:class:`~gdt.core.coords.Quaternion`): The attitude quaternions"""
+        return Quaternion(self._quat)
+
+    @property
+    def time(self):
+        """(np.array): The MET of each attitude sample"""
+        return self._time
+
+    def decimate(self, factor):
+        """Return a new attitude history keeping every ``factor``-th sample.
+
+        Args:
+            factor (int): The decimation factor
+
+        Returns:
+            (:class:`SwiftAttitude`)
+        """
+        factor = int(factor)
+        if factor < 1:
+            raise ValueError('factor must be a positive integer')
+        return self.from_data(self._time[::factor], self._quat[::factor],
+                              headers=self._headers, filename=self.filename)
+
+    def get_spacecraft_frame(self) -> SpacecraftFrame:
+        """Return the spacecraft frame at each attitude sample.  The frame 
+        only has an attitude; the position and velocity are taken from the
+        SAO file (see :meth:`SwiftSao.get_spacecraft_frame`).
+
+        Returns:
+            (:class:`~gdt.core.coords.SpacecraftFrame`)
+        """
+        sc_frame = SpacecraftFrame(
+            quaternion=Quaternion(self._quat),
+            obstime=Time(self._time, format='swift')
+        )
+        return sc_frame
+
+    def quaternion_at(self, met):
+        """Return the attitude at the requested times, spherically 
+        interpolated (slerp) between the bracketing samples.
+
+        Args:
+            met (float or np.array): The time(s) in Swift MET
+
+        Returns:
+            (:class:`~gdt.core.coords.Quaternion`)
+        """
+        return Quaternion(self._slerp_at(met))
+
+    def resample(self, cadence, tstart=None, tstop=None):
+        """Return a new attitude history resampled to a regular cadence.
+
+        Args:
+            cadence (float): The time between samples, in seconds
+            tstart (float, optional): The start time of the resampled history.
+                                      Default is the start of the file.
+            tstop (float, optional): The stop time of the resampled history.
+                                     Default is the end of the file.
+
+        Returns:
+            (:class:`SwiftAttitude`)
+        """
+        if cadence <= 0.0:
+            raise ValueError('cadence must be positive')
+        if tstart is None:
+            tstart = self._time[0]
+        if tstop is None:
+            tstop = self._time[-1]
+        
+        num_samples = int(np.floor((tstop - tstart) / cadence)) + 1
+        time = tstart + cadence * np.arange(num_samples)
+        return self.from_data(time, self._slerp_at(time),
+                              headers=self._headers, filename=self.filename)
+
+    def time_range(self):
+        """The time range covered by the attitude samples.
+
+        Returns:
+            (float, float)
+        """
+        return (self._time[0], self._time[-1])
+
+    @classmethod
+    def open(cls, file_path, **kwargs):
+        """Open a Swift attitude FITS file.
 
         Args:
             file_path (str): The file path of the FITS file
 
         Returns:
-            (:class:`BatSAO`)
+            (:class:`SwiftAttitude`)
         """
         obj = super().open(file_path, **kwargs)
-        hdrs = [hdu.header for hdu in obj.hdulist]
-        obj._headers = SaoHeaders.from_headers(hdrs)
+        hdu = obj.hdulist['ATTITUDE']
+        obj._headers = AttHeaders.from_headers([obj.hdulist[0].header, 
+                                                hdu.header])
+        obj._time, obj._quat = cls._unique(SwiftSao._native(hdu.data['TIME']),
+                                           SwiftSao._native(hdu.data['QPARAM']))
+        return obj
+
+    @classmethod
+    def from_data(cls, time, quaternion, headers=None, filename=None):
+        """Create a SwiftAttitude object from arrays of times and quaternions.
+
+        Args:
+            time (np.array): The MET of each sample
+            quaternion (np.array): The attitude quaternions, scalar last, 
+                                   shape (num_rows, 4)
+            headers (:class:`~gdt.missions.swift.bat.headers.AttHeaders`, optional):
+                The file headers
+            filename (str, optional): The filename
+
+        Returns:
+            (:class:`SwiftAttitude`)
+        """
+        obj = cls()
+        obj._filename = filename
+        
+        time = np.asarray(time, dtype=float).flatten()
+        quaternion = np.asarray(quaternion, dtype=float)
+        if quaternion.shape != (time.size, 4):
+            raise ValueError('quaternion must have shape (num_rows, 4)')
+        obj._time, obj._quat = cls._unique(time, quaternion)
+        
+        if headers is not None:
+            if not isinstance(headers, AttHeaders):
+                raise TypeError('headers must be of type AttHeaders')
+            headers = headers.copy()
+        else:
+            headers = AttHeaders()
+        if obj._time.size > 0:
+            for hdr in headers:
+                hdr['TSTART'] = obj._time[0]
+                hdr['TSTOP'] = obj._time[-1]
+        obj._headers = headers
 
         return obj
+
+    def __getstate__(self):
+        # everything is read on open, so only the open FITS file is dropped
+        state = self.__dict__.copy()
+        state['_hdulist'] = None
+        return state
+
+    def _slerp_at(self, met):
+        """Interpolate the quaternion array at the requested times.
+
+        Args:
+            met (float or np.array): The time(s) in Swift MET
+
+        Returns:
+            (np.array)
+        """
+        met = np.asarray(met, dtype=float)
+        idx, frac = _bracket(self._time, met)
+        return _slerp(self._quat[idx], self._quat[idx + 1], frac)
+
+    @staticmethod
+    def _unique(time, quat):
+        """Sort the samples by time and drop the duplicate times, keeping the 
+        first of each.
+
+        Args:
+            time (np.array): The sample times
+            quat (np.array): The quaternions
+
+        Returns:
+            (np.array, np.array)
+        """
+        if np.all(time[1:] > time[:-1]):
+            return time, quat
+        idx = np.argsort(time, kind='stable')
+        keep = np.ones(time.size, dtype=bool)
+        keep[1:] = time[idx][1:] > time[idx][:-1]
+        idx = idx[keep]
+        return time[idx], quat[idx]
+
+
+class SwiftSaoCache():
+    """An on-disk cache of decoded SAO files.  
+    
+    Each cached file is stored as a directory of raw ``.npy`` arrays (one per
+    column), which are memory mapped when loaded, and its FITS headers. 
+    Entries are keyed by the absolute file path, modification time, and size of
+    the original file, so a file that changes on disk is decoded again.  When
+    the total size of the cache exceeds ``max_bytes``, the least recently used
+    entries are removed.
+    
+    Parameters:
+        directory (str, optional): The cache directory. If omitted, uses a 
+                                   ``swift/sao`` directory in the GDT cache 
+                                   path.
+        max_bytes (int, optional): The maximum size of the cache in bytes. 
+                                   Default is 2 GB.
+    """
+    def __init__(self, directory=None, max_bytes=2 * 1024**3):
+        if directory is None:
+            directory = os.path.join(cache_path, 'swift', 'sao')
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        
+        if max_bytes <= 0:
+            raise ValueError('max_bytes must be positive')
+        self._max_bytes = int(max_bytes)
+
+    @property
+    def directory(self):
+        """(pathlib.Path): The cache directory"""
+        return self._directory
+
+    @property
+    def max_bytes(self):
+        """(int): The maximum size of the cache in bytes"""
+        return self._max_bytes
+
+    @property
+    def num_entries(self):
+        """(int): The number of cached files"""
+        return len(self._entries())
+
+    @property
+    def size(self):
+        """(int): The total size of the cache in bytes"""
+        return sum(self._entry_size(entry) for entry in self._entries())
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        for entry in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def get(self, file_path):
+        """Load a cached file, if it exists.
+
+        Args:
+            file_path (str): The path of the original FITS file
+
+        Returns:
+            (dict, list): A dictionary of the memory-mapped column arrays and 
+            the list of FITS headers, or None if the file is not in the cache.
+        """
+        entry = self._directory / self.key(file_path)
+        if not entry.is_dir():
+            return None
+        
+        try:
+            data = {col_name: np.load(entry / (col_name + '.npy'), 
+                                      mmap_mode='r') \
+                    for col_name in SwiftSao._columns}
+            hdrs = [fits.Header.fromtextfile(str(hdr_file)) \
+                    for hdr_file in sorted(entry.glob('*.hdr'))]
+        except (OSError, ValueError):
+            return None
+        
+        # mark as recently used
+        os.utime(entry)
+        return data, hdrs
+
+    def key(self, file_path):
+        """The cache key of a file.
+
+        Args:
+            file_path (str): The path of the original FITS file
+
+        Returns:
+            (str)
+        """
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        ident = '{0}:{1}:{2}'.format(path, stat.st_mtime_ns, stat.st_size)
+        return hashlib.sha1(ident.encode()).hexdigest()
+
+    def put(self, file_path, data, headers):
+        """Store a decoded file in the cache, then evict the least recently 
+        used entries if the cache is too large.
+
+        Args:
+            file_path (str): The path of the original FITS file
+            data (dict): The column arrays, keyed by column name
+            headers (list): The FITS headers of the file
+        """
+        entry = self._directory / self.key(file_path)
+        if entry.is_dir():
+            return
+        
+        # write to a temporary directory and rename, so that a partially 
+        # written entry is never read
+        tmp_dir = Path(tempfile.mkdtemp(dir=self._directory, prefix='.tmp'))
+        try:
+            for col_name, arr in data.items():
+                np.save(tmp_dir / (col_name + '.npy'), np.asarray(arr))
+            for i, hdr in enumerate(headers):
+                hdr.totextfile(str(tmp_dir / '{:02d}.hdr'.format(i)))
+            os.replace(tmp_dir, entry)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        self._evict()
+
+    def _entries(self):
+        """The entry directories in the cache"""
+        return [entry for entry in self._directory.iterdir() \
+                if entry.is_dir() and not entry.name.startswith('.')]
+
+    @staticmethod
+    def _entry_size(entry):
+        """The size of an entry in bytes"""
+        return sum(f.stat().st_size for f in entry.iterdir())
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits within
+        the size limit"""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        sizes = [self._entry_size(entry) for entry in entries]
+        total = sum(sizes)
+        for entry, size in zip(entries, sizes):
+            if total <= self._max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def __repr__(self):
+        return '<{0}: {1} entries; {2}>'.format(self.__class__.__name__,
+                                                self.num_entries, 
+                                                self.directory)
+
+
+def _bracket(time, met):
+    """Find the bracketing rows of a time column for each requested time.
+
+    Args:
+        time (np.array): The sorted time column
+        met (np.array): The requested times
+
+    Returns:
+        (np.array, np.array): The index of the lower bracketing row and the 
+                              interpolation fraction (0-1)
+    """
+    if time.size < 2:
+        raise ValueError('At least two rows are required for interpolation')
+    if np.any(met < time[0]) or np.any(met > time[-1]):
+        raise ValueError('met must be within the time range of the file: '
+                         '({0}, {1})'.format(time[0], time[-1]))
+
+    idx = np.searchsorted(time, met, side='right') - 1
+    idx = np.clip(idx, 0, time.size - 2)
+    frac = (met - time[idx]) / (time[idx + 1] - time[idx])
+    return idx, frac
+
+
+def _lerp(arr, idx, frac):
+    """Linear interpolation between rows ``idx`` and ``idx + 1`` of an array.
+
+    Args:
+        arr (np.array): The array, shape (num_rows, n)
+        idx (np.array): The index of the lower bracketing row
+        frac (np.array): The interpolation fraction (0-1)
+
+    Returns:
+        (np.array)
+    """
+    lo = arr[idx].astype(float)
+    return lo + frac[..., np.newaxis] * (arr[idx + 1] - lo)
+
+
+def _slerp(quat0, quat1, frac):
+    """Vectorized spherical linear interpolation between two arrays of
+    quaternions.
+
+    Args:
+        quat0 (np.array): The starting quaternions, shape (..., 4)
+        quat1 (np.array): The ending quaternions, shape (..., 4)
+        frac (np.array): The interpolation fraction (0-1), shape (...)
+
+    Returns:
+        (np.array)
+    """
+    quat0 = np.asarray(quat0, dtype=float)
+    quat1 = np.asarray(quat1, dtype=float)
+    frac = np.asarray(frac, dtype=float)[..., np.newaxis]
+
+    # take the shortest path
+    dot = np.sum(quat0 * quat1, axis=-1, keepdims=True)
+    quat1 = np.where(dot < 0.0, -quat1, quat1)
+    dot = np.abs(dot)
+
+    # fall back to linear interpolation for nearly identical quaternions
+    theta = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_theta = np.sin(theta)
+    small = sin_theta < 1e-8
+    sin_theta[small] = 1.0
+    w0 = np.where(small, 1.0 - frac, np.sin((1.0 - frac) * theta) / sin_theta)
+    w1 = np.where(small, frac, np.sin(frac * theta) / sin_theta)
+
+    quat = w0 * quat0 + w1 * quat1
+    return quat / np.linalg.norm(quat, axis=-1, keepdims=True)
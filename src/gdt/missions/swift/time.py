@@ -40,14 +40,22 @@
 #
 
 import datetime
+import functools
 import re
 
 import erfa
 import numpy as np
 from astropy.time import TimeFromEpoch, TimeUnique, ScaleValueError, Time
+from astropy.time import update_leap_seconds
 from astropy.time.utils import day_frac
 
-__all__ = ['SwiftSecTime', 'Time']
+__all__ = ['SwiftSecTime', 'Time', 'met_to_datetime64', 'met_to_iso',
+           'met_to_unix', 'met_to_utc_jd', 'utc_to_met']
+
+# the MET epoch in UTC and the TAI-UTC offset (leap seconds) at the epoch
+_met_epoch_utc = np.datetime64('2001-01-01T00:00:00', 'us')
+_met_epoch_tai_utc = 32
+_unix_epoch_jd = 2440587.5
 
 class SwiftSecTime(TimeFromEpoch):
     """Represents the number of seconds elapsed since Jan 1, 2001, 00:00:00 UTC,
@@ -69,3 +77,176 @@ class SwiftSecTime(TimeFromEpoch):
 
     epoch_format = 'iso'
     """(str): Format of :attr:`epoch_val`"""
+
+
+@functools.lru_cache(maxsize=1)
+def _leap_second_table():
+    """Build the leap-second step table once, from the same ERFA table used by
+    astropy.
+    
+    Returns:
+        (np.array, np.array, np.array): The UTC of each step and the MET of
+        each step, both in integer microseconds from the MET epoch, and the
+        number of leap seconds since the MET epoch (in microseconds) that 
+        applies from each step.
+    """
+    update_leap_seconds()
+    table = erfa.leap_seconds.get()
+    # before 1972 UTC was not defined by whole leap seconds
+    table = table[table['year'] >= 1972]
+    dates = np.array(['{0:04d}-{1:02d}-01'.format(year, month) \
+                      for year, month in zip(table['year'], table['month'])],
+                     dtype='datetime64[us]')
+    utc_us = (dates - _met_epoch_utc).astype(np.int64)
+    offset_us = (np.round(table['tai_utc']).astype(np.int64) - \
+                 _met_epoch_tai_utc) * 1000000
+    met_us = utc_us + offset_us
+    return utc_us, met_us, offset_us
+
+
+@functools.lru_cache(maxsize=1)
+def _met_epoch_jd():
+    """The two-part Julian Date of the MET epoch, as used by SwiftSecTime"""
+    epoch = Time(SwiftSecTime.epoch_val, format=SwiftSecTime.epoch_format,
+                 scale=SwiftSecTime.epoch_scale)
+    return epoch.jd1, epoch.jd2
+
+
+def _met_offset_us(met_us):
+    """The leap seconds since the MET epoch, in microseconds, at each MET"""
+    _, met_steps, offset_us = _leap_second_table()
+    idx = np.searchsorted(met_steps, met_us, side='right') - 1
+    return offset_us[np.clip(idx, 0, None)]
+
+
+def met_to_datetime64(met, clock=None):
+    """Convert Swift MET to UTC as datetime64, rounded to the microsecond.
+    This is equivalent to ``Time(met, format='swift').utc.datetime``, but 
+    only uses a precomputed leap-second table.  A time within a leap second 
+    is returned as the following 00:00:00.
+
+    Args:
+        met (float or np.array): The time(s) in Swift MET
+        clock (:class:`~gdt.missions.swift.clock.SwiftClockCorrection`, optional):
+            If given, the clock correction is applied to the MET first
+
+    Returns:
+        (np.datetime64 or np.array(dtype='datetime64[us]'))
+    """
+    if clock is not None:
+        met = clock.apply(met)
+    met_us = np.round(np.asarray(met, dtype=float) * 1e6).astype(np.int64)
+    utc_us = met_us - _met_offset_us(met_us)
+    return _met_epoch_utc + utc_us.astype('timedelta64[us]')
+
+
+def met_to_iso(met, precision=3):
+    """Format Swift MET as an ISO string in the TT time scale.  The result is
+    identical to ``Time(met, format='swift').iso``: the same Julian Date
+    arithmetic and ERFA formatting are used, but no Time object is created.
+
+    Args:
+        met (float or np.array): The time(s) in Swift MET
+        precision (int, optional): The number of decimal places of the 
+                                   seconds. Default is 3.
+
+    Returns:
+        (str or np.array)
+    """
+    met = np.asarray(met, dtype=float)
+    epoch_jd1, epoch_jd2 = _met_epoch_jd()
+    day, frac = day_frac(met, np.zeros_like(met), 
+                         divisor=1.0 / SwiftSecTime.unit)
+    jd1 = epoch_jd1 + day
+    jd2 = epoch_jd2 + frac
+    extra = np.round(jd2)
+    jd1 += extra
+    jd2 -= extra
+    
+    iys, ims, ids, ihmsfs = erfa.d2dtf(b'TT', precision, jd1, jd2)
+    if precision > 0:
+        fmt = '{0:4d}-{1:02d}-{2:02d} {3:02d}:{4:02d}:{5:02d}.{6:0' + \
+              str(precision) + 'd}'
+    else:
+        fmt = '{0:4d}-{1:02d}-{2:02d} {3:02d}:{4:02d}:{5:02d}'
+    iso = [fmt.format(*vals) for vals in zip(iys.flat, ims.flat, ids.flat, 
+                                            ihmsfs['h'].flat, ihmsfs['m'].flat,
+                                            ihmsfs['s'].flat, 
+                                            ihmsfs['f'].flat)]
+    if met.ndim == 0:
+        return iso[0]
+    return np.array(iso).reshape(met.shape)
+
+
+def met_to_unix(met, clock=None):
+    """Convert Swift MET to Unix time (seconds since 1970-01-01 UTC, 
+    excluding leap seconds).
+
+    Args:
+        met (float or np.array): The time(s) in Swift MET
+        clock (:class:`~gdt.missions.swift.clock.SwiftClockCorrection`, optional):
+            If given, the clock correction is applied to the MET first
+
+    Returns:
+        (float or np.array)
+    """
+    if clock is not None:
+        met = clock.apply(met)
+    met = np.asarray(met, dtype=float)
+    offset = _met_offset_us(np.round(met * 1e6).astype(np.int64)) / 1e6
+    epoch = (_met_epoch_utc - np.datetime64('1970-01-01', 'us')) / \
+            np.timedelta64(1, 's')
+    return met - offset + epoch
+
+
+def met_to_utc_jd(met, clock=None):
+    """Convert Swift MET to a UTC Julian Date.  Note that a single float64 
+    Julian Date has a resolution of about 40 microseconds; use 
+    :func:`met_to_datetime64` when full precision is needed.
+
+    Args:
+        met (float or np.array): The time(s) in Swift MET
+        clock (:class:`~gdt.missions.swift.clock.SwiftClockCorrection`, optional):
+            If given, the clock correction is applied to the MET first
+
+    Returns:
+        (float or np.array)
+    """
+    return _unix_epoch_jd + met_to_unix(met, clock=clock) / 86400.0
+
+
+def utc_to_met(utc, clock=None):
+    """Convert UTC to Swift MET.  This is equivalent to 
+    ``Time(utc, scale='utc').swift``, but only uses a precomputed leap-second
+    table.
+
+    Args:
+        utc (str, datetime, np.datetime64, or np.array): 
+            The UTC time(s), as anything that can be converted to 
+            datetime64 (e.g. ISO strings)
+        clock (:class:`~gdt.missions.swift.clock.SwiftClockCorrection`, optional):
+            If given, the returned MET is the uncorrected spacecraft time, 
+            i.e. the inverse of applying the clock correction
+
+    Returns:
+        (float or np.array)
+    """
+    met = _utc_to_met(utc)
+    if clock is not None:
+        # the correction varies slowly, so a couple of fixed-point iterations
+        # invert it to well below a microsecond
+        met_corr = met
+        for _ in range(3):
+            met = met_corr + clock.correction(met)
+    return met
+
+
+def _utc_to_met(utc):
+    """Convert UTC to Swift MET, without any clock correction"""
+    utc_us = (np.asarray(utc, dtype='datetime64[us]') - \
+              _met_epoch_utc).astype(np.int64)
+    utc_steps, _, offset_us = _leap_second_table()
+    idx = np.searchsorted(utc_steps, utc_us, side='right') - 1
+    # the sum is exact in integer microseconds, so the only rounding is in 
+    # the final division
+    return (utc_us + offset_us[np.clip(idx, 0, None)]) / 1e6
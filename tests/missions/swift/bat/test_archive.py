@@ -0,0 +1,226 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT WITH UNLIMITED RIGHTS
+#
+# Contract No.: CA 80MSFC17M0022
+# Contractor Name: Universities Space Research Association
+# Contractor Address: 7178 Columbia Gateway Drive, Columbia, MD 21046
+#
+# Copyright 2017-2022 by Universities Space Research Association (USRA). All rights reserved.
+#
+# Developed by: William Cleveland and Adam Goldstein
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# Developed by: Daniel Kocevski
+#               National Aeronautics and Space Administration (NASA)
+#               Marshall Space Flight Center
+#               Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing permissions and limitations under the
+# License.
+#
+#
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import astropy.io.fits as fits
+
+from gdt.missions.swift.bat.headers import *
+from gdt.missions.swift.bat.archive import *
+
+
+def write_file(path, headers, compress=False, **keywords):
+    """Write a file with the given headers and small data tables"""
+    for key, val in keywords.items():
+        headers[0][key] = val
+    hdus = [fits.PrimaryHDU(header=headers[0])]
+    for i in range(1, headers.num_headers):
+        col = fits.Column('X', 'E', array=np.arange(1000.0))
+        hdus.append(fits.BinTableHDU.from_columns([col], header=headers[i]))
+    fits.HDUList(hdus).writeto(path)
+    if compress:
+        with open(path, 'rb') as fin, gzip.open(path + '.gz', 'wb') as fout:
+            shutil.copyfileobj(fin, fout)
+        os.remove(path)
+        path += '.gz'
+    return path
+
+
+class TestScanHeaders(unittest.TestCase):
+    
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        d = self.tempdir.name
+        self.paths = [
+            write_file(os.path.join(d, 'sw01.pha'), PhaHeaders(), 
+                       OBS_ID='00968211000', TSTART=612353536.6, 
+                       TSTOP=612353636.6, TRIGTIME=612353555.0, RA_OBJ=10.0,
+                       DEC_OBJ=-20.0, PA_PNT=30.0),
+            write_file(os.path.join(d, 'sw01.lc'), LightcurveHeaders(), 
+                       compress=True, OBS_ID='00968211000', TSTART=1.0e8, 
+                       TSTOP=1.1e8),
+            write_file(os.path.join(d, 'sw01.rsp'), RspHeaders(), 
+                       OBS_ID='00968211000', RA_PNT=45.0),
+            write_file(os.path.join(d, 'sw01sao.fits'), SaoHeaders(),
+                       compress=True, TSTART=5.0e8),
+        ]
+        
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_scan(self):
+        table = scan_headers(self.paths, processes=1)
+        self.assertEqual(len(table), 4)
+        self.assertListEqual(table['FILENAME'].tolist(), self.paths)
+        self.assertListEqual(table['FILETYPE'].tolist(), 
+                             ['pha', 'lightcurve', 'response', 'sao'])
+        self.assertEqual(table['OBS_ID'][0], '00968211000')
+        self.assertEqual(table['TSTART'][0], 612353536.6)
+        self.assertEqual(table['TSTOP'][0], 612353636.6)
+        self.assertEqual(table['TRIGTIME'][0], 612353555.0)
+        self.assertEqual(table['RA_OBJ'][0], 10.0)
+        self.assertEqual(table['DEC_OBJ'][0], -20.0)
+        self.assertEqual(table['PA_PNT'][0], 30.0)
+        self.assertEqual(table['TSTART'][1], 1.0e8)
+        self.assertEqual(table['RA_PNT'][2], 45.0)
+        self.assertEqual(table['TSTART'][3], 5.0e8)
+        # the response PRIMARY header has no TSTART
+        self.assertTrue(table['TSTART'].mask[2])
+        self.assertFalse(table['TSTART'].mask[0])
+
+    def test_keywords(self):
+        table = scan_headers(self.paths, keywords=['tstart', 'obs_id'], 
+                             processes=1)
+        self.assertListEqual(table.colnames, ['FILENAME', 'FILETYPE', 
+                                              'TSTART', 'OBS_ID'])
+        with self.assertRaises(ValueError):
+            scan_headers(self.paths, keywords=['NOT_A_KEY'])
+
+    def test_pool(self):
+        table1 = scan_headers(self.paths, processes=1)
+        table2 = scan_headers(self.paths, processes=2, chunksize=1)
+        for col in table1.colnames:
+            self.assertListEqual(table1[col].tolist(), table2[col].tolist())
+
+    def test_bad_file(self):
+        bad = os.path.join(self.tempdir.name, 'bad.fits')
+        with open(bad, 'w') as f:
+            f.write('not a fits file')
+        with self.assertWarns(RuntimeWarning):
+            table = scan_headers(self.paths + [bad], processes=1)
+        self.assertEqual(len(table), 4)
+    
+    def test_empty(self):
+        table = scan_headers([], processes=1)
+        self.assertEqual(len(table), 0)
+        self.assertIn('TSTART', table.colnames)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            scan_headers(self.paths, processes=0)
+
+
+class TestArchiveIndex(unittest.TestCase):
+    
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        d = self.tempdir.name
+        self.paths = [
+            write_file(os.path.join(d, 'a.pha'), PhaHeaders(), 
+                       OBS_ID='00968211000', TSTART=100.0, TSTOP=200.0, 
+                       RA_PNT=10.0, DEC_PNT=0.0),
+            write_file(os.path.join(d, 'b.lc'), LightcurveHeaders(), 
+                       compress=True, OBS_ID='00968211000', TSTART=150.0, 
+                       TSTOP=400.0, RA_PNT=50.0, DEC_PNT=0.0),
+            write_file(os.path.join(d, 'c.lc'), LightcurveHeaders(), 
+                       OBS_ID='00968212000', TSTART=500.0, TSTOP=600.0, 
+                       RA_PNT=10.0, DEC_PNT=85.0),
+            write_file(os.path.join(d, 'd.rsp'), RspHeaders(), 
+                       OBS_ID='00968211000', RA_PNT=10.0, DEC_PNT=0.0)
+        ]
+        self.index = ArchiveIndex.open(os.path.join(d, 'index.db'))
+        self.index.update(self.paths, processes=1)
+        
+    def tearDown(self):
+        self.index.close()
+        self.tempdir.cleanup()
+    
+    def filenames(self, table):
+        return [os.path.basename(f) for f in table['FILENAME']]
+    
+    def test_attributes(self):
+        self.assertEqual(self.index.num_files, 4)
+        self.assertTrue(self.index.filename.endswith('index.db'))
+    
+    def test_query_time(self):
+        table = self.index.query(tstart=180.0, tstop=190.0)
+        self.assertListEqual(self.filenames(table), ['a.pha', 'b.lc.gz'])
+        self.assertListEqual(table['FILETYPE'].tolist(), ['pha', 'lightcurve'])
+        self.assertListEqual(table['TSTART'].tolist(), [100.0, 150.0])
+        table = self.index.query(tstart=450.0)
+        self.assertListEqual(self.filenames(table), ['c.lc'])
+        table = self.index.query(tstop=100.0)
+        self.assertListEqual(self.filenames(table), ['a.pha'])
+        self.assertEqual(len(self.index.query(tstart=700.0, tstop=800.0)), 0)
+
+    def test_query_position(self):
+        table = self.index.query(ra=20.0, dec=0.0, radius=15.0)
+        self.assertListEqual(self.filenames(table), ['a.pha', 'd.rsp'])
+        table = self.index.query(ra=190.0, dec=88.0, radius=10.0)
+        self.assertListEqual(self.filenames(table), ['c.lc'])
+        table = self.index.query(tstart=0.0, tstop=1000.0, ra=30.0, dec=0.0, 
+                                 radius=25.0)
+        self.assertListEqual(self.filenames(table), ['a.pha', 'b.lc.gz'])
+        with self.assertRaises(ValueError):
+            self.index.query(ra=20.0, dec=0.0)
+    
+    def test_query_other(self):
+        table = self.index.query(filetype='lightcurve')
+        self.assertListEqual(self.filenames(table), ['b.lc.gz', 'c.lc'])
+        table = self.index.query(obs_id='00968211000', filetype='response')
+        self.assertListEqual(self.filenames(table), ['d.rsp'])
+        self.assertTrue(table['TSTART'].mask[0])
+        self.assertEqual(len(self.index.query()), 4)
+
+    def test_update(self):
+        self.assertEqual(self.index.update(self.paths, processes=1), 0)
+        # rewrite a file with a new time range
+        os.remove(self.paths[2])
+        write_file(self.paths[2], LightcurveHeaders(), OBS_ID='00968212000',
+                   TSTART=700.0, TSTOP=800.0, RA_PNT=10.0, DEC_PNT=85.0)
+        os.utime(self.paths[2], ns=(0, 0))
+        self.assertEqual(self.index.update(self.paths, processes=1), 1)
+        self.assertEqual(self.index.num_files, 4)
+        table = self.index.query(tstart=750.0, tstop=760.0)
+        self.assertListEqual(self.filenames(table), ['c.lc'])
+        self.assertEqual(len(self.index.query(tstart=550.0, tstop=560.0)), 0)
+    
+    def test_persistence(self):
+        self.index.close()
+        with ArchiveIndex.open(os.path.join(self.tempdir.name, 
+                                            'index.db')) as index:
+            self.assertEqual(index.num_files, 4)
+            self.assertEqual(index.update(self.paths, processes=1), 0)
+        self.index = ArchiveIndex.open(os.path.join(self.tempdir.name, 
+                                                    'index.db'))
+
+    def test_prune(self):
+        os.remove(self.paths[0])
+        self.assertEqual(self.index.prune(), 1)
+        self.assertEqual(self.index.num_files, 3)
+        self.assertEqual(len(self.index.query(tstart=180.0, tstop=190.0)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
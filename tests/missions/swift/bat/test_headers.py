@@ -142,6 +142,87 @@ class TestSaoHeaders(unittest.TestCase):
 
 
 
+class TestBatHeader(unittest.TestCase):
+    def test_date_obs(self):
+        hdr = SaoHeaders()['PRIMARY']
+        hdr['TSTART'] = 612353536.6006
+        hdr['TSTOP'] = 612355698.6006
+        self.assertEqual(hdr['DATE-OBS'], '2020-05-28 10:13:20.785')
+        self.assertEqual(hdr['DATE-END'], '2020-05-28 10:49:22.785')
+
+    def test_setitem(self):
+        hdr = PhaHeaders()['SPECTRUM']
+        hdr['exposure'] = 10
+        self.assertEqual(hdr['EXPOSURE'], 10.0)
+        self.assertIsInstance(hdr['EXPOSURE'], float)
+        hdr['DATE_OBS'] = '2020-05-28 10:13:20.785'
+        self.assertEqual(hdr['DATE-OBS'], '2020-05-28 10:13:20.785')
+        with self.assertRaises(KeyError):
+            hdr['NOT_A_KEY'] = 1.0
+        with self.assertRaises(TypeError):
+            hdr['EXPOSURE'] = 'ten'
+
+    def test_clone(self):
+        hdr = PhaHeaders()['SPECTRUM']
+        hdr['TSTART'] = 612353536.6006
+        clone = hdr.clone()
+        self.assertIsInstance(clone, type(hdr))
+        self.assertEqual(clone.tostring(), hdr.tostring())
+        clone['TSTART'] = 612355698.6006
+        self.assertEqual(hdr['TSTART'], 612353536.6006)
+        self.assertEqual(hdr['DATE-OBS'], '2020-05-28 10:13:20.785')
+
+    def test_from_headers(self):
+        headers = PhaHeaders()
+        headers['SPECTRUM']['TSTART'] = 612353536.6006
+        headers['SPECTRUM']['TRIGTIME'] = 612353536.6006
+        headers['SPECTRUM']['EXPOSURE'] = 2.5
+        new_headers = PhaHeaders.from_headers([headers[i] for i in range(4)])
+        for i in range(4):
+            self.assertEqual(new_headers[i].tostring(), headers[i].tostring())
+        # the templates are not modified
+        self.assertEqual(PhaHeaders()['SPECTRUM']['EXPOSURE'], 0.0)
+
+
+class TestAttHeaders(unittest.TestCase):
+    def setUp(self):
+        self.headers = AttHeaders()
+
+    def test_primary(self):
+        hdr = self.headers[0]
+        self.assertTrue('TELESCOP' in hdr.keys())
+        self.assertEqual(hdr['TELESCOP'], 'SWIFT')
+        self.assertTrue('OBS_ID' in hdr.keys())
+        self.assertTrue('TIMESYS' in hdr.keys())
+        self.assertEqual(hdr['TIMESYS'], 'TT')
+        self.assertTrue('MJDREFI' in hdr.keys())
+        self.assertEqual(hdr['MJDREFI'], 51910)
+        self.assertTrue('MJDREFF' in hdr.keys())
+        self.assertTrue('TIMEUNIT' in hdr.keys())
+        self.assertEqual(hdr['TIMEUNIT'], 's')
+        self.assertTrue('TSTART' in hdr.keys())
+        self.assertTrue('TSTOP' in hdr.keys())
+        self.assertTrue('DATE-OBS' in hdr.keys())
+        self.assertTrue('DATE-END' in hdr.keys())
+        self.assertTrue('CLOCKAPP' in hdr.keys())
+        self.assertTrue('CREATOR' in hdr.keys())
+        self.assertTrue('ORIGIN' in hdr.keys())
+        self.assertTrue('DATE' in hdr.keys())
+        self.assertTrue('CHECKSUM' in hdr.keys())
+        self.assertTrue('DATASUM' in hdr.keys())
+
+    def test_attitude(self):
+        hdr = self.headers[1]
+        self.assertTrue('EXTNAME' in hdr.keys())
+        self.assertEqual(hdr['EXTNAME'], 'ATTITUDE')
+        self.assertTrue('TELESCOP' in hdr.keys())
+        self.assertEqual(hdr['TELESCOP'], 'SWIFT')
+        self.assertTrue('TSTART' in hdr.keys())
+        self.assertTrue('TSTOP' in hdr.keys())
+        self.assertTrue('DATE-OBS' in hdr.keys())
+        self.assertTrue('DATE-END' in hdr.keys())
+
+
 class TestPhaHeaders(unittest.TestCase):
     def setUp(self):
         self.headers = PhaHeaders()
@@ -563,6 +644,45 @@ class TestRspHeaders(unittest.TestCase):
         self.assertTrue('CHECKSUM' in hdr.keys())
         self.assertTrue('DATASUM' in hdr.keys())
 
+class TestRspGridHeaders(unittest.TestCase):
+    def setUp(self):
+        self.headers = RspGridHeaders()
+
+    def test_names(self):
+        self.assertListEqual(self.headers.keys(), ['PRIMARY', 'SPECRESP GRID',
+                                                   'ENERGIES', 'EBOUNDS'])
+
+    def test_primary(self):
+        hdr = self.headers[0]
+        self.assertEqual(hdr['TELESCOP'], 'SWIFT')
+        self.assertEqual(hdr['INSTRUME'], 'BAT')
+        self.assertTrue('FILENAME' in hdr.keys())
+        self.assertTrue('CREATOR' in hdr.keys())
+        self.assertTrue('DATE' in hdr.keys())
+
+    def test_grid(self):
+        hdr = self.headers[1]
+        self.assertEqual(hdr['EXTNAME'], 'SPECRESP GRID')
+        self.assertEqual(hdr['HDUCLAS1'], 'RESPONSE')
+        self.assertEqual(hdr['HDUCLAS2'], 'RSP_GRID')
+        self.assertEqual(hdr['DETCHANS'], 0)
+        self.assertEqual(hdr['NUM_AZ'], 0)
+        self.assertEqual(hdr['NUM_EL'], 0)
+        hdr['NUM_AZ'] = 13
+        self.assertEqual(hdr['NUM_AZ'], 13)
+
+    def test_energies(self):
+        hdr = self.headers[2]
+        self.assertEqual(hdr['EXTNAME'], 'ENERGIES')
+        self.assertEqual(hdr['HDUCLAS2'], 'ENERGIES')
+
+    def test_ebounds(self):
+        hdr = self.headers[3]
+        self.assertEqual(hdr['EXTNAME'], 'EBOUNDS')
+        self.assertEqual(hdr['HDUCLAS2'], 'EBOUNDS')
+        self.assertTrue('DETCHANS' in hdr.keys())
+
+
 class TestLightcurveHeaders(unittest.TestCase):
     def setUp(self):
         self.headers = LightcurveHeaders()
@@ -28,9 +28,12 @@
 #
 import os
 import unittest
+import numpy as np
 from tempfile import TemporaryDirectory
 from pathlib import Path
 from gdt.core import data_path
+from gdt.core.data_primitives import EnergyBins, Gti
+from gdt.missions.swift.bat.headers import PhaHeaders
 from gdt.missions.swift.bat.pha import *
 from gdt.core.binning.binned import combine_by_factor
 
@@ -72,6 +75,15 @@ class TestBatPha_Ps(unittest.TestCase):
     def test_trigtime(self):
         self.assertAlmostEqual(self.pha.trigtime, 612354468.864, places=3)
 
+    def test_errors(self):
+        self.assertIsNone(self.pha.stat_err)
+        self.assertIsNone(self.pha.sys_err)
+        pha = BatPha.open(ps_file, read_errors=True)
+        self.assertEqual(pha.stat_err.size, 80)
+        self.assertEqual(pha.sys_err.size, 80)
+        self.assertListEqual(pha.data.counts.tolist(),
+                             self.pha.data.counts.tolist())
+
     def test_rebin_energy(self):
         pha2 = self.pha.rebin_energy(combine_by_factor, 2)
         self.assertEqual(pha2.num_chans, self.pha.num_chans//2)
@@ -222,3 +234,151 @@ class TestBatPha_Sl(unittest.TestCase):
             except AssertionError:
                     pass
             pha.close()
+
+
+def make_pha(tstart, counts, trigtime=612353536.6006, exposure=10.0):
+    """A BatPha with 8 channels from 15-150 keV"""
+    edges = np.geomspace(15.0, 150.0, 9)
+    headers = PhaHeaders()
+    for hdr in headers:
+        hdr['TSTART'] = trigtime + tstart
+        hdr['TSTOP'] = trigtime + tstart + exposure
+        hdr['TRIGTIME'] = trigtime
+    headers['SPECTRUM']['EXPOSURE'] = exposure
+    data = EnergyBins(counts, edges[:-1], edges[1:], exposure)
+    gti = Gti.from_bounds([tstart], [tstart + exposure])
+    return BatPha.from_data(data, gti=gti, trigger_time=trigtime, 
+                            headers=headers, filename='{}.pha'.format(tstart))
+
+
+class TestBatPhaStack(unittest.TestCase):
+    
+    def setUp(self):
+        self.counts = np.arange(32, dtype=float).reshape(4, 8)
+        # out of time order
+        self.phas = [make_pha(t, c) for t, c in zip([10.0, 0.0, 20.0, 30.0], 
+                                                    self.counts)]
+        self.stack = BatPhaStack.from_phas(self.phas)
+    
+    def test_attributes(self):
+        self.assertEqual(self.stack.num_spectra, 4)
+        self.assertEqual(len(self.stack), 4)
+        self.assertEqual(self.stack.num_chans, 8)
+        self.assertEqual(self.stack.trigtime, 612353536.6006)
+        self.assertListEqual(self.stack.tstart.tolist(), [0.0, 10.0, 20.0, 
+                                                          30.0])
+        self.assertListEqual(self.stack.tstop.tolist(), [10.0, 20.0, 30.0, 
+                                                         40.0])
+        self.assertEqual(self.stack.time_range, (0.0, 40.0))
+        self.assertListEqual(self.stack.exposure.tolist(), [10.0] * 4)
+        self.assertListEqual(self.stack.counts[0].tolist(), 
+                             self.counts[1].tolist())
+        self.assertListEqual(self.stack.filenames, ['0.0.pha', '10.0.pha', 
+                                                    '20.0.pha', '30.0.pha'])
+        self.assertAlmostEqual(self.stack.energy_range[0], 15.0)
+        self.assertAlmostEqual(self.stack.energy_range[1], 150.0)
+        self.assertListEqual(self.stack.rates[1].tolist(),
+                             (self.counts[0] / 10.0).tolist())
+
+    def test_getitem(self):
+        pha = self.stack[1]
+        self.assertIsInstance(pha, BatPha)
+        self.assertListEqual(pha.data.counts.tolist(), self.counts[0].tolist())
+        self.assertEqual(pha.exposure, 10.0)
+        self.assertEqual(pha.time_range, (10.0, 20.0))
+        self.assertEqual(pha.trigtime, 612353536.6006)
+        self.assertEqual(pha.filename, '10.0.pha')
+        self.assertEqual(self.stack[-1].time_range, (30.0, 40.0))
+        self.assertEqual(len(list(self.stack)), 4)
+        with self.assertRaises(IndexError):
+            self.stack[4]
+        with self.assertRaises(TypeError):
+            self.stack[0:2]
+    
+    def test_slice_energy(self):
+        stack = self.stack.slice_energy((30.0, 60.0))
+        pha = self.stack[0].slice_energy([(30.0, 60.0)])
+        self.assertEqual(stack.num_chans, pha.num_chans)
+        self.assertListEqual(stack.counts[0].tolist(), 
+                             pha.data.counts.tolist())
+        self.assertEqual(stack.num_spectra, 4)
+        stack = self.stack.slice_energy([(15.0, 20.0), (140.0, 150.0)])
+        self.assertEqual(stack.num_chans, 2)
+
+    def test_rebin_energy(self):
+        stack = self.stack.rebin_energy(combine_by_factor, 3)
+        self.assertEqual(stack.num_chans, 2)
+        for i in range(4):
+            pha = self.stack[i].rebin_energy(combine_by_factor, 3)
+            self.assertListEqual(stack.counts[i].tolist(), 
+                                 pha.data.counts.tolist())
+        self.assertAlmostEqual(stack.energy_range[0], 15.0)
+
+    def test_slice_time(self):
+        stack = self.stack.slice_time(5.0, 25.0)
+        self.assertEqual(stack.num_spectra, 3)
+        self.assertTrue(np.shares_memory(stack.counts, self.stack.counts))
+        self.assertListEqual(stack.tstart.tolist(), [0.0, 10.0, 20.0])
+        self.assertEqual(self.stack.slice_time(tstart=25.0).num_spectra, 2)
+        self.assertEqual(self.stack.slice_time(50.0, 60.0).num_spectra, 0)
+
+    def test_integrate_time(self):
+        pha = self.stack.integrate_time(10.0, 30.0)
+        self.assertListEqual(pha.data.counts.tolist(), 
+                             (self.counts[0] + self.counts[2]).tolist())
+        self.assertEqual(pha.exposure, 20.0)
+        self.assertEqual(pha.time_range, (10.0, 30.0))
+        self.assertEqual(pha.headers['SPECTRUM']['EXPOSURE'], 20.0)
+        pha = self.stack.integrate_time()
+        self.assertEqual(pha.exposure, 40.0)
+        with self.assertRaises(ValueError):
+            self.stack.integrate_time(50.0, 60.0)
+
+    def test_trigtime(self):
+        phas = [make_pha(0.0, self.counts[0]), 
+                make_pha(0.0, self.counts[1], trigtime=612353546.6006)]
+        stack = BatPhaStack.from_phas(phas)
+        self.assertListEqual(stack.tstart.tolist(), [0.0, 10.0])
+        self.assertEqual(stack[1].gti.range, (10.0, 20.0))
+
+    def test_from_data(self):
+        edges = np.geomspace(15.0, 150.0, 9)
+        stack = BatPhaStack.from_data(self.counts, edges[:-1], edges[1:], 
+                                      [1.0, 2.0, 3.0, 4.0], 
+                                      [0.0, 1.0, 3.0, 6.0], 
+                                      [1.0, 3.0, 6.0, 10.0])
+        self.assertIsNone(stack.trigtime)
+        pha = stack[2]
+        self.assertEqual(pha.exposure, 3.0)
+        self.assertEqual(pha.headers['PRIMARY']['TSTART'], 3.0)
+        self.assertEqual(pha.headers['SPECTRUM']['EXPOSURE'], 3.0)
+        
+        # without headers in the stack, the integrated spectrum gets new ones
+        pha = stack.integrate_time(1.0, 6.0)
+        self.assertListEqual(pha.data.counts.tolist(), 
+                             self.counts[1:3].sum(axis=0).tolist())
+        self.assertEqual(pha.exposure, 5.0)
+        self.assertEqual(pha.headers['PRIMARY']['TSTART'], 1.0)
+        self.assertEqual(pha.headers['PRIMARY']['TSTOP'], 6.0)
+        self.assertEqual(pha.headers['SPECTRUM']['EXPOSURE'], 5.0)
+
+    def test_errors(self):
+        edges = np.geomspace(15.0, 150.0, 9)
+        with self.assertRaises(ValueError):
+            BatPhaStack.from_data(self.counts[0], edges[:-1], edges[1:], 1.0,
+                                  0.0, 1.0)
+        with self.assertRaises(ValueError):
+            BatPhaStack.from_data(self.counts, edges[:-2], edges[1:-1], 
+                                  np.ones(4), np.zeros(4), np.ones(4))
+        with self.assertRaises(ValueError):
+            BatPhaStack.from_data(self.counts, edges[:-1], edges[1:], 
+                                  np.ones(3), np.zeros(4), np.ones(4))
+        with self.assertRaises(ValueError):
+            BatPhaStack.from_phas([])
+        edges = np.geomspace(15.0, 350.0, 9)
+        pha = BatPha.from_data(EnergyBins(self.counts[0], edges[:-1], 
+                                          edges[1:], 10.0), 
+                               gti=Gti.from_bounds([0.0], [10.0]), 
+                               headers=PhaHeaders())
+        with self.assertRaises(ValueError):
+            BatPhaStack.from_phas(self.phas + [pha])
@@ -27,12 +27,18 @@
 # License.
 #
 
+import gzip
 import os
 import unittest
+import numpy as np
+import astropy.io.fits as fits
 from tempfile import TemporaryDirectory
 from gdt.core import data_path
+from gdt.core.data_primitives import ResponseMatrix
+from gdt.missions.swift.bat.headers import RspHeaders
 from gdt.missions.swift.bat.response import *
 from gdt.core.spectra.functions import PowerLaw
+from gdt.missions.swift.frame import azel_to_radec
 from pathlib import Path
 
 
@@ -43,6 +49,7 @@ ps_rsp = data_path / 'swift-bat' /'sw00974827000bevps.rsp.gz'
 class TestBatRsp_As(unittest.TestCase):
 
     def setUp(self):
+        self.path = as_rsp
         self.rsp =BatRsp.open(as_rsp)
 
     def tearDown(self):
@@ -81,6 +88,12 @@ class TestBatRsp_As(unittest.TestCase):
         self.assertEqual(rsp.num_chans, self.rsp.num_chans)
         self.assertEqual(rsp.num_ebins, self.rsp.num_ebins // 2)
 
+    def test_open_sparse(self):
+        rsp = BatRsp.open(self.path, sparse=True)
+        self.assertIsInstance(rsp.drm, SparseResponseMatrix)
+        self.assertListEqual(rsp.drm.matrix.tolist(), 
+                             self.rsp.drm.matrix.tolist())
+
     def test_write(self):
         with TemporaryDirectory() as this_path:
             self.rsp.write(this_path, overwrite=True)
@@ -101,6 +114,7 @@ class TestBatRsp_As(unittest.TestCase):
 class TestBatRsp_Ps(unittest.TestCase):
 
     def setUp(self):
+        self.path = ps_rsp
         self.rsp =BatRsp.open(ps_rsp)
 
     def tearDown(self):
@@ -139,6 +153,12 @@ class TestBatRsp_Ps(unittest.TestCase):
         self.assertEqual(rsp.num_chans, self.rsp.num_chans)
         self.assertEqual(rsp.num_ebins, self.rsp.num_ebins // 2)
 
+    def test_open_sparse(self):
+        rsp = BatRsp.open(self.path, sparse=True)
+        self.assertIsInstance(rsp.drm, SparseResponseMatrix)
+        self.assertListEqual(rsp.drm.matrix.tolist(), 
+                             self.rsp.drm.matrix.tolist())
+
     def test_write(self):
         with TemporaryDirectory() as this_path:
             self.rsp.write(this_path, overwrite=True)
@@ -153,3 +173,624 @@ class TestBatRsp_Ps(unittest.TestCase):
             self.assertEqual(rsp.tstart, self.rsp.tstart)
             self.assertEqual(rsp.tstop, self.rsp.tstop)
             rsp.close()
+
+
+def make_drm(num_ebins=60, num_chans=40):
+    """A banded DRM, with a second channel group in one row"""
+    edges = np.geomspace(10.0, 500.0, num_ebins + 1)
+    chan_edges = np.geomspace(10.0, 300.0, num_chans + 1)
+    rng = np.random.default_rng(0)
+    matrix = np.zeros((num_ebins, num_chans))
+    for i in range(num_ebins):
+        j = i * num_chans // num_ebins
+        matrix[i, max(j - 4, 0):j + 2] = rng.uniform(0.1, 1.0, 
+                                                     min(j + 2, num_chans) - \
+                                                     max(j - 4, 0))
+    matrix[5, 30] = 0.5
+    return (matrix, edges[:-1], edges[1:], chan_edges[:-1], chan_edges[1:])
+
+
+class TestSparseResponseMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.args = make_drm()
+        self.drm = ResponseMatrix(*self.args)
+        self.sparse_drm = SparseResponseMatrix(*self.args)
+
+    def test_attributes(self):
+        self.assertEqual(self.sparse_drm.num_ebins, 60)
+        self.assertEqual(self.sparse_drm.num_chans, 40)
+        self.assertEqual(self.sparse_drm.nnz, np.count_nonzero(self.args[0]))
+        self.assertListEqual(self.sparse_drm.matrix.tolist(), 
+                             self.args[0].tolist())
+        self.assertListEqual(self.sparse_drm.to_dense().matrix.tolist(), 
+                             self.args[0].tolist())
+
+    def test_fold_spectrum(self):
+        func = PowerLaw().fit_eval
+        counts = self.sparse_drm.fold_spectrum(func, (0.01, -2.2))
+        self.assertTrue(np.allclose(counts, 
+                                    self.drm.fold_spectrum(func, (0.01, -2.2))))
+        mask = (np.arange(40) % 2 == 0)
+        counts = self.sparse_drm.fold_spectrum(func, (0.01, -2.2), 
+                                               channel_mask=mask)
+        self.assertTrue(np.allclose(counts, self.drm.fold_spectrum(func, 
+                                    (0.01, -2.2), channel_mask=mask)))
+
+    def test_effective_area(self):
+        self.assertTrue(np.allclose(self.sparse_drm.photon_effective_area().counts, 
+                                    self.drm.photon_effective_area().counts))
+        self.assertTrue(np.allclose(self.sparse_drm.channel_effective_area().counts, 
+                                    self.drm.channel_effective_area().counts))
+
+    def test_rebin(self):
+        for kwargs in ({'factor': 4}, {'edge_indices': [2, 10, 25, 40]}):
+            drm = self.sparse_drm.rebin(**kwargs)
+            self.assertIsInstance(drm, SparseResponseMatrix)
+            self.assertTrue(np.allclose(drm.matrix, 
+                                        self.drm.rebin(**kwargs).matrix))
+        with self.assertRaises(ValueError):
+            self.sparse_drm.rebin(factor=3)
+
+    def test_resample(self):
+        for kwargs in ({'num_photon_bins': 30}, {'num_photon_bins': 200},
+                       {'photon_bin_edges': np.geomspace(20.0, 400.0, 25)}):
+            drm = self.sparse_drm.resample(**kwargs)
+            self.assertIsInstance(drm, SparseResponseMatrix)
+            # the dense method fills zeros with a 1e-10 floor
+            self.assertTrue(np.allclose(drm.matrix, 
+                                        self.drm.resample(**kwargs).matrix, 
+                                        rtol=1e-7, atol=1e-8))
+            self.assertLess(drm.nnz, drm.num_ebins * drm.num_chans)
+
+    def test_groups(self):
+        ngrp, fchan, nchan, rows = self.sparse_drm.to_groups()
+        self.assertEqual(ngrp[5], 2)
+        self.assertEqual(ngrp.sum(), 61)
+        self.assertListEqual(fchan[5].tolist(), [0, 30])
+        
+        # variable-length rows
+        drm = SparseResponseMatrix.from_groups(np.array(rows, dtype=object), 
+                                               ngrp, 
+                                               np.array(fchan, dtype=object),
+                                               np.array(nchan, dtype=object),
+                                               *self.args[1:])
+        self.assertListEqual(drm.matrix.tolist(), self.args[0].tolist())
+        
+        # fixed-width rows covering the whole matrix, one-based channels
+        drm = SparseResponseMatrix.from_groups(self.args[0], np.ones(60), 
+                                               np.ones(60), np.full(60, 40),
+                                               *self.args[1:], first_chan=1)
+        self.assertListEqual(drm.matrix.tolist(), self.args[0].tolist())
+
+
+class TestBatRspSparse(unittest.TestCase):
+
+    def setUp(self):
+        self.args = make_drm()
+        self.this_path = TemporaryDirectory()
+        drm = SparseResponseMatrix(*self.args)
+        self.rsp = BatRsp.from_data(drm, filename='test.rsp', 
+                                    start_time=10.0, stop_time=20.0, 
+                                    headers=RspHeaders())
+
+    def tearDown(self):
+        self.this_path.cleanup()
+
+    def test_write(self):
+        self.rsp.write(self.this_path.name)
+        path = os.path.join(self.this_path.name, 'test.rsp')
+        
+        rsp = BatRsp.open(path, sparse=True)
+        self.assertIsInstance(rsp.drm, SparseResponseMatrix)
+        self.assertTrue(np.allclose(rsp.drm.matrix, self.args[0]))
+        self.assertEqual(rsp.headers['SPECRESP MATRIX']['NUMGRP'], 61)
+        
+        # the grouped rows are expanded for a dense open
+        rsp = BatRsp.open(path)
+        self.assertIsInstance(rsp.drm, ResponseMatrix)
+        self.assertNotIsInstance(rsp.drm, SparseResponseMatrix)
+        self.assertTrue(np.allclose(rsp.drm.matrix, self.args[0]))
+        rsp.write(self.this_path.name, filename='dense.rsp')
+        rsp = BatRsp.open(os.path.join(self.this_path.name, 'dense.rsp'), 
+                          sparse=True)
+        self.assertTrue(np.allclose(rsp.drm.matrix, self.args[0]))
+
+    def test_zero_copy(self):
+        path = os.path.join(self.this_path.name, 'test.rsp')
+        self.rsp.write(self.this_path.name)
+        
+        # written with variable-length rows, so the DRM is a read-only copy
+        rsp = BatRsp.open(path, zero_copy=True)
+        self.assertFalse(rsp.drm.matrix.flags.writeable)
+        
+        # a full row of channels in each row is mapped from the file
+        dense = BatRsp.open(path)
+        dense.write(self.this_path.name, filename='dense.rsp')
+        path = os.path.join(self.this_path.name, 'dense.rsp')
+        rsp = BatRsp.open(path, zero_copy=True)
+        self.assertIsInstance(rsp.drm.matrix.base, np.memmap)
+        self.assertFalse(rsp.drm.matrix.flags.writeable)
+        self.assertTrue(np.allclose(rsp.drm.matrix, self.args[0]))
+        with self.assertRaises(ValueError):
+            rsp.drm.matrix[0, 0] = 1.0
+        func = PowerLaw().fit_eval
+        self.assertTrue(np.allclose(rsp.fold_spectrum(func, (0.01, -2.2)).counts,
+                        dense.fold_spectrum(func, (0.01, -2.2)).counts))
+        
+        # a compressed file can't be mapped
+        with open(path, 'rb') as f_in, gzip.open(path + '.gz', 'wb') as f_out:
+            f_out.write(f_in.read())
+        rsp = BatRsp.open(path + '.gz', zero_copy=True)
+        self.assertNotIsInstance(rsp.drm.matrix.base, np.memmap)
+        self.assertFalse(rsp.drm.matrix.flags.writeable)
+        self.assertTrue(np.allclose(rsp.drm.matrix, self.args[0]))
+
+    def test_rebin_resample(self):
+        func = PowerLaw().fit_eval
+        rsp = self.rsp.rebin(factor=2)
+        self.assertIsInstance(rsp.drm, SparseResponseMatrix)
+        self.assertEqual(rsp.num_chans, 20)
+        rsp = self.rsp.resample(num_photon_bins=30)
+        self.assertIsInstance(rsp.drm, SparseResponseMatrix)
+        self.assertEqual(rsp.num_ebins, 30)
+        ebins = rsp.fold_spectrum(func, (0.01, -2.2), exposure=2.0)
+        self.assertEqual(ebins.size, 40)
+
+
+class TestBatRspWrite(unittest.TestCase):
+
+    def setUp(self):
+        self.args = make_drm()
+        self.this_path = TemporaryDirectory()
+        headers = RspHeaders()
+        headers['PRIMARY']['TRIGTIME'] = 100.0
+        headers['SPECRESP MATRIX']['TSTART'] = 90.0
+        headers['SPECRESP MATRIX']['TSTOP'] = 120.0
+        self.rsp = BatRsp.from_data(ResponseMatrix(*self.args), 
+                                    filename='test.rsp', headers=headers)
+        self.rsp._ngrp = np.ones(60, dtype=int)
+        self.rsp._fchan = np.ones(60, dtype=int)
+        self.rsp._nchan = np.full(60, 40)
+
+    def tearDown(self):
+        self.this_path.cleanup()
+
+    def test_write(self):
+        self.rsp.write(self.this_path.name)
+        path = os.path.join(self.this_path.name, 'test.rsp')
+        
+        # the same as the HDUs of the response, with valid checksums
+        with fits.open(path, checksum=True) as hdulist:
+            expected = self.rsp._build_hdulist()
+            self.assertEqual(len(hdulist), 3)
+            for hdu, expected_hdu in zip(hdulist, expected):
+                self.assertEqual(hdu.verify_checksum(), 1)
+                self.assertEqual(hdu.verify_datasum(), 1)
+                self.assertSetEqual(set(hdu.header.keys()), 
+                                    set(expected_hdu.header.keys()))
+                if hdu.data is not None:
+                    for name in hdu.columns.names:
+                        self.assertTrue(np.array_equal(hdu.data[name], 
+                                                   expected_hdu.data[name]))
+            self.assertEqual(hdulist['SPECRESP MATRIX'].header['TLMIN4'], 1)
+            self.assertEqual(hdulist['SPECRESP MATRIX'].header['TFORM6'], 
+                             '40E')
+            self.assertNotIn('TDIM6', hdulist['SPECRESP MATRIX'].header)
+            self.assertEqual(hdulist['EBOUNDS'].columns['E_MIN'].unit, 'keV')
+        
+        rsp = BatRsp.open(path, zero_copy=True)
+        self.assertTrue(np.allclose(rsp.drm.matrix, self.args[0]))
+        self.assertIsInstance(rsp.drm.matrix.base, np.memmap)
+        self.assertEqual(rsp.trigtime, 100.0)
+        self.assertEqual(rsp.tstart, -10.0)
+        
+        with self.assertRaises(OSError):
+            self.rsp.write(self.this_path.name)
+        # keywords are passed to astropy
+        self.rsp.write(self.this_path.name, overwrite=True, 
+                       output_verify='exception')
+        with self.assertRaises(TypeError):
+            self.rsp.write(self.this_path.name, overwrite=True, 
+                           not_a_keyword=True)
+
+    def test_write_gzip(self):
+        self.rsp.write(self.this_path.name, filename='test.rsp.gz')
+        self.rsp.write(self.this_path.name, filename='test.rsp.z', 
+                       compress=True, compresslevel=1)
+        for filename in ('test.rsp.gz', 'test.rsp.z'):
+            path = os.path.join(self.this_path.name, filename)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(2), b'\x1f\x8b')
+            with fits.open(path, checksum=True) as hdulist:
+                self.assertEqual(hdulist[1].verify_checksum(), 1)
+            rsp = BatRsp.open(path)
+            self.assertTrue(np.allclose(rsp.drm.matrix, self.args[0]))
+        
+        # a sparse DRM, with variable-length rows
+        rsp = BatRsp.from_data(SparseResponseMatrix(*self.args), 
+                               headers=RspHeaders())
+        rsp.write(self.this_path.name, filename='sparse.rsp.gz')
+        rsp = BatRsp.open(os.path.join(self.this_path.name, 'sparse.rsp.gz'))
+        self.assertTrue(np.allclose(rsp.drm.matrix, self.args[0]))
+
+    def test_write_rebinned(self):
+        # the channel groups are those of the rebinned DRM
+        rsp = self.rsp.rebin(factor=2)
+        rsp.write(self.this_path.name, filename='rebin.rsp')
+        rsp2 = BatRsp.open(os.path.join(self.this_path.name, 'rebin.rsp'))
+        self.assertEqual(rsp2.num_chans, 20)
+        self.assertTrue(np.all(rsp2._nchan == 20))
+        self.assertTrue(np.allclose(rsp2.drm.matrix, rsp.drm.matrix))
+
+
+class TestBatRspFold(unittest.TestCase):
+
+    def setUp(self):
+        self.args = make_drm()
+        self.rsp = BatRsp.from_data(ResponseMatrix(*self.args))
+        self.sparse_rsp = BatRsp.from_data(SparseResponseMatrix(*self.args))
+        self.func = PowerLaw().fit_eval
+        self.params = np.array([[0.01, -1.5], [0.01, -2.2], [0.1, -3.0]])
+        self.counts = np.array([self.rsp.fold_spectrum(self.func, params).counts
+                                for params in self.params])
+
+    def test_fold_spectra(self):
+        centroids = self.rsp.drm.photon_bin_centroids
+        photon_flux = np.array([self.func(params, centroids) \
+                                for params in self.params])
+        for rsp in (self.rsp, self.sparse_rsp):
+            counts = rsp.fold_spectra(photon_flux, exposure=2.0)
+            self.assertEqual(counts.shape, (3, 40))
+            self.assertTrue(np.allclose(counts, 2.0 * self.counts))
+            counts = rsp.fold_spectra(photon_flux[1])
+            self.assertTrue(np.allclose(counts, self.counts[1]))
+        
+        with self.assertRaises(ValueError):
+            self.rsp.fold_spectra(photon_flux[:, 1:])
+        with self.assertRaises(ValueError):
+            self.rsp.fold_spectra(photon_flux, exposure=[1.0, 2.0])
+        with self.assertRaises(ValueError):
+            self.rsp.fold_spectra(photon_flux, exposure=0.0)
+
+    def test_fold_model(self):
+        mask = (np.arange(40) < 20)
+        exposure = np.array([1.0, 2.0, 3.0])
+        for rsp in (self.rsp, self.sparse_rsp):
+            counts = rsp.fold_model(self.func, self.params, channel_mask=mask,
+                                    exposure=exposure)
+            self.assertTrue(np.allclose(counts, self.counts[:, mask] * \
+                                                exposure[:, np.newaxis]))
+        with self.assertRaises(ValueError):
+            self.rsp.fold_model(self.func, self.params[0])
+
+    def test_cache(self):
+        self.rsp.fold_model(self.func, self.params)
+        fold_matrix = self.rsp._fold_matrix()
+        self.assertIs(self.rsp._fold_matrix(), fold_matrix)
+        self.assertEqual(fold_matrix.dtype, np.float64)
+        self.assertTrue(fold_matrix.flags['C_CONTIGUOUS'])
+
+
+class TestBatRspSeries(unittest.TestCase):
+
+    def setUp(self):
+        matrix, emin, emax, chanlo, chanhi = make_drm()
+        self.matrix = matrix
+        self.rsps = []
+        for i in range(4):
+            drm = ResponseMatrix(matrix * (1.0 + 0.1 * i), emin, emax, chanlo,
+                                 chanhi)
+            self.rsps.append(BatRsp.from_data(drm, start_time=100.0 + 10.0 * i,
+                                              stop_time=110.0 + 10.0 * i,
+                                              trigger_time=100.0))
+        # out of order
+        self.series = BatRspSeries.from_rsps(self.rsps[::-1])
+
+    def test_attributes(self):
+        self.assertEqual(self.series.num_drms, 4)
+        self.assertEqual(self.series.num_ebins, 60)
+        self.assertEqual(self.series.num_chans, 40)
+        self.assertEqual(self.series.matrices().shape, (4, 60, 40))
+        self.assertEqual(self.series.trigtime, 100.0)
+        self.assertListEqual(self.series.tstart.tolist(), 
+                             [0.0, 10.0, 20.0, 30.0])
+        self.assertListEqual(self.series.tcent.tolist(), 
+                             [5.0, 15.0, 25.0, 35.0])
+        self.assertIs(self.series[0], self.rsps[0])
+
+    def test_interpolate_matrices(self):
+        times = [0.0, 5.0, 12.5, 35.0, 50.0]
+        matrices = self.series.interpolate_matrices(times)
+        self.assertEqual(matrices.shape, (5, 60, 40))
+        for scale, matrix in zip([1.0, 1.0, 1.075, 1.3, 1.3], matrices):
+            self.assertTrue(np.allclose(matrix, self.matrix * scale))
+        # same as the interpolation of a single time
+        self.assertTrue(np.allclose(matrices[2], 
+                                    self.series.interpolate(12.5).drm.matrix))
+
+    def test_rsp2_methods(self):
+        # the series and the inherited Rsp2 methods use the same times
+        for rsp, tstart in zip(self.series, self.series.tstart):
+            self.assertEqual(rsp.tstart, tstart)
+        for time in [-5.0, 5.0, 17.0, 31.0, 45.0]:
+            matrix = self.series.interpolate_matrices(time)[0]
+            self.assertTrue(np.allclose(matrix, 
+                                        self.series.interpolate(time).drm.matrix))
+            idx = self.series.drm_index((time, time))[0]
+            self.assertIs(self.series.nearest_drm(time), self.series[idx])
+            # at the center of a response, the interpolation is that response
+            tcent = self.series.tcent[idx]
+            self.assertTrue(np.allclose(
+                               self.series.interpolate_matrices(tcent)[0],
+                               self.series.nearest_drm(tcent).drm.matrix))
+        
+        # the average over the interval of one response is that response
+        matrices = self.series.average_matrices([(rsp.tstart, rsp.tstop) \
+                                                 for rsp in self.series])
+        for matrix, rsp in zip(matrices, self.series):
+            self.assertTrue(np.allclose(matrix, rsp.drm.matrix))
+
+    def test_average_matrices(self):
+        time_ranges = [(0.0, 10.0), (5.0, 15.0), (2.0, 38.0), (-20.0, -10.0), 
+                       (50.0, 60.0), (12.0, 12.0)]
+        matrices = self.series.average_matrices(time_ranges)
+        scales = [1.0, 1.05, 1.0 + 0.1 * (10.0 + 20.0 + 24.0) / 36.0, 1.0, 1.3,
+                  1.1]
+        for scale, matrix in zip(scales, matrices):
+            self.assertTrue(np.allclose(matrix, self.matrix * scale))
+        with self.assertRaises(ValueError):
+            self.series.average_matrices([(10.0, 0.0)])
+
+    def test_fold(self):
+        func = PowerLaw().fit_eval
+        time_ranges = np.array([(0.0, 10.0), (5.0, 15.0), (2.0, 38.0)])
+        params = np.array([[0.01, -1.5], [0.01, -2.2], [0.1, -3.0]])
+        for interpolate in (False, True):
+            if interpolate:
+                matrices = self.series.interpolate_matrices(
+                                                   time_ranges.mean(axis=1))
+            else:
+                matrices = self.series.average_matrices(time_ranges)
+            counts = self.series.fold_model(func, params, time_ranges, 
+                                            interpolate=interpolate,
+                                            exposure=[1.0, 2.0, 3.0])
+            self.assertEqual(counts.shape, (3, 40))
+            for i in range(3):
+                rsp = BatRsp.from_data(ResponseMatrix(matrices[i], 
+                                                      *make_drm()[1:]))
+                expected = rsp.fold_spectrum(func, params[i], 
+                                             exposure=i + 1.0).counts
+                self.assertTrue(np.allclose(counts[i], expected))
+        
+        # one set of parameters for all intervals
+        counts = self.series.fold_model(func, params[0], time_ranges)
+        self.assertEqual(counts.shape, (3, 40))
+        
+        # the same series with sparse DRMs
+        rsps = [BatRsp.from_data(SparseResponseMatrix(rsp.drm.matrix, 
+                                                      *make_drm()[1:]),
+                                 start_time=rsp.tstart, stop_time=rsp.tstop)
+                for rsp in self.rsps]
+        series = BatRspSeries.from_rsps(rsps)
+        self.assertTrue(np.allclose(series.fold_model(func, params, 
+                                                      time_ranges),
+                                    self.series.fold_model(func, params, 
+                                                           time_ranges)))
+        with self.assertRaises(ValueError):
+            self.series.fold_spectra(np.ones(10), time_ranges)
+
+    def test_open(self):
+        with TemporaryDirectory() as this_path:
+            paths = []
+            for i, rsp in enumerate(self.rsps):
+                headers = RspHeaders()
+                headers['PRIMARY']['TRIGTIME'] = 100.0
+                headers['SPECRESP MATRIX']['TSTART'] = 100.0 + 10.0 * i
+                headers['SPECRESP MATRIX']['TSTOP'] = 110.0 + 10.0 * i
+                rsp = BatRsp.from_data(rsp.drm, headers=headers)
+                rsp._fchan = np.zeros(60, dtype=int)
+                rsp._nchan = np.full(60, 40)
+                rsp._ngrp = np.ones(60, dtype=int)
+                paths.append(os.path.join(this_path, 'rsp{}.rsp'.format(i)))
+                rsp.write(this_path, filename='rsp{}.rsp'.format(i))
+            
+            series = BatRspSeries.open(paths[::-1])
+            self.assertListEqual(series.tstart.tolist(), 
+                                 [0.0, 10.0, 20.0, 30.0])
+            self.assertTrue(np.allclose(series.matrices(), 
+                                        self.series.matrices()))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            BatRspSeries.from_rsps([])
+        rsp = BatRsp.from_data(self.rsps[0].drm.rebin(factor=2), 
+                               start_time=0.0, stop_time=10.0)
+        with self.assertRaises(ValueError):
+            BatRspSeries.from_rsps([self.rsps[1], rsp])
+
+    def test_trigtimes(self):
+        # the times of a response with a different trigger time are converted
+        # to the trigger time of the first response
+        rsps = [BatRsp.from_data(rsp.drm, start_time=100.0 + 10.0 * i,
+                                 stop_time=110.0 + 10.0 * i, 
+                                 trigger_time=90.0 + 5.0 * i) \
+                for i, rsp in enumerate(self.rsps)]
+        series = BatRspSeries.from_rsps(rsps[::-1])
+        self.assertEqual(series.trigtime, 90.0)
+        self.assertListEqual(series.tstart.tolist(), [10.0, 20.0, 30.0, 40.0])
+        self.assertListEqual(series.tstop.tolist(), [20.0, 30.0, 40.0, 50.0])
+        self.assertListEqual([rsp.tstart for rsp in series], 
+                             [10.0, 15.0, 20.0, 25.0])
+        self.assertTrue(np.allclose(series.average_matrices([(10.0, 50.0)]),
+                                    self.series.average_matrices([(0.0, 40.0)])))
+        
+        # the order is by time, not by the times relative to each trigger
+        rsp = BatRsp.from_data(self.rsps[0].drm, start_time=50.0, 
+                               stop_time=60.0, trigger_time=0.0)
+        series = BatRspSeries.from_rsps([self.rsps[1], rsp])
+        self.assertEqual(series.trigtime, 0.0)
+        self.assertListEqual(series.tstart.tolist(), [50.0, 110.0])
+        self.assertIs(series[0], rsp)
+
+
+class TestBatRspGrid(unittest.TestCase):
+
+    def setUp(self):
+        matrix, emin, emax, chanlo, chanhi = make_drm()
+        self.matrix = matrix
+        self.az = [-20.0, 0.0, 20.0]
+        self.el = [-10.0, 10.0]
+        # the scale of each DRM is 1 + az/100 + el/1000
+        self.rsps = []
+        for az in self.az:
+            for el in self.el:
+                drm = ResponseMatrix(matrix * (1.0 + az / 100.0 + el / 1000.0),
+                                     emin, emax, chanlo, chanhi)
+                self.rsps.append(BatRsp.from_data(drm))
+        # the azimuths are wrapped
+        self.grid = BatRspGrid.from_rsps(self.rsps, [340.0, 0.0, 20.0], 
+                                         self.el)
+
+    def test_attributes(self):
+        self.assertListEqual(self.grid.az.tolist(), self.az)
+        self.assertListEqual(self.grid.el.tolist(), self.el)
+        self.assertEqual(self.grid.num_points, 6)
+        self.assertEqual(self.grid.num_ebins, 60)
+        self.assertEqual(self.grid.num_chans, 40)
+        self.assertEqual(self.grid.matrices.shape, (3, 2, 60, 40))
+        self.assertEqual(self.grid.matrices.dtype, np.float32)
+        self.assertEqual(self.grid.photon_bins.num_intervals, 60)
+        self.assertEqual(self.grid.ebounds.num_intervals, 40)
+        self.assertListEqual(self.grid.contains([350.0, 25.0, 0.0], 
+                                                [0.0, 0.0, 11.0]).tolist(),
+                             [True, False, False])
+
+    def test_interpolate(self):
+        az = np.array([-20.0, 355.0, 10.0, 20.0])
+        el = np.array([-10.0, 0.0, 5.0, 10.0])
+        drms = self.grid.interpolate(az, el)
+        self.assertEqual(drms.shape, (4, 60, 40))
+        for a, e, drm in zip([-20.0, -5.0, 10.0, 20.0], el, drms):
+            self.assertTrue(np.allclose(drm, self.matrix * \
+                                        (1.0 + a / 100.0 + e / 1000.0)))
+        self.assertEqual(self.grid.interpolate(0.0, 0.0).shape, (60, 40))
+        self.assertEqual(self.grid.interpolate(az.reshape(2, 2), 0.0).shape,
+                         (2, 2, 60, 40))
+        with self.assertRaises(ValueError):
+            self.grid.interpolate([0.0, 30.0], 0.0)
+
+    def test_cache(self):
+        self.grid.cache_size = 3
+        drms = self.grid.interpolate([1.0, 2.0, 3.0, 4.0], 0.0)
+        self.assertEqual(len(self.grid._cache), 3)
+        self.assertFalse((1.0, 0.0) in self.grid._cache)
+        # a cached DRM is returned from the cache
+        cached = self.grid._cache[(4.0, 0.0)]
+        self.assertFalse(cached.flags.writeable)
+        self.assertTrue(np.array_equal(self.grid.interpolate(4.0, 0.0), 
+                                       drms[3]))
+        self.assertEqual(next(reversed(self.grid._cache)), (4.0, 0.0))
+        
+        self.grid.cache_size = 1
+        self.assertEqual(len(self.grid._cache), 1)
+        self.grid.clear_cache()
+        self.assertEqual(len(self.grid._cache), 0)
+        with self.assertRaises(ValueError):
+            self.grid.cache_size = -1
+
+    def test_fold(self):
+        func = PowerLaw().fit_eval
+        params = (0.01, -2.0)
+        az = [-15.0, 5.0, 12.0]
+        el = [3.0, -8.0, 10.0]
+        counts = self.grid.fold_model(func, params, az, el, 
+                                      exposure=[1.0, 2.0, 3.0])
+        self.assertEqual(counts.shape, (3, 40))
+        for i in range(3):
+            expected = self.grid.to_rsp(az[i], el[i]).fold_spectrum(func, 
+                                                            params, 
+                                                            exposure=i + 1.0)
+            self.assertTrue(np.allclose(counts[i], expected.counts))
+        
+        # one spectrum for each direction
+        centroids = np.sqrt(make_drm()[1] * make_drm()[2])
+        photon_flux = np.stack([func(params, centroids)] * 3)
+        counts2 = self.grid.fold_spectra(photon_flux, az, el, 
+                                         exposure=[1.0, 2.0, 3.0])
+        self.assertTrue(np.allclose(counts2, counts))
+        
+        mask = np.zeros(40, dtype=bool)
+        mask[:10] = True
+        counts = self.grid.fold_model(func, params, 0.0, 0.0, 
+                                      channel_mask=mask)
+        self.assertEqual(counts.shape, (10,))
+        with self.assertRaises(ValueError):
+            self.grid.fold_spectra(np.ones(10), az, el)
+        with self.assertRaises(ValueError):
+            self.grid.fold_spectra(photon_flux[:2], az, el)
+        with self.assertRaises(ValueError):
+            self.grid.fold_model(func, params, az, el, exposure=[1.0, 2.0])
+
+    def test_interpolate_radec(self):
+        quat = np.array([0.1, -0.3, 0.2, 0.9])
+        quat /= np.linalg.norm(quat)
+        ra, dec = azel_to_radec([5.0, -12.0], [3.0, -7.0], quat)
+        drms = self.grid.interpolate_radec(ra, dec, quat)
+        self.assertTrue(np.allclose(drms, self.grid.interpolate([5.0, -12.0],
+                                                                [3.0, -7.0]), 
+                                    atol=1e-5))
+        with self.assertRaises(ValueError):
+            self.grid.interpolate_radec(ra, dec, np.stack([quat, quat]))
+
+    def test_to_rsp(self):
+        rsp = self.grid.to_rsp(10.0, 0.0)
+        self.assertIsInstance(rsp, BatRsp)
+        self.assertTrue(np.allclose(rsp.drm.matrix, self.matrix * 1.1))
+        self.assertEqual(rsp.headers['SPECRESP MATRIX']['DETCHANS'], 40)
+        with self.assertRaises(ValueError):
+            self.grid.to_rsp([0.0, 10.0], 0.0)
+
+    def test_write_open(self):
+        with TemporaryDirectory() as this_path:
+            self.grid.write(this_path, filename='grid.fits')
+            path = os.path.join(this_path, 'grid.fits')
+            
+            grid = BatRspGrid.open(path)
+            self.assertEqual(grid.filename, 'grid.fits')
+            self.assertListEqual(grid.az.tolist(), self.az)
+            self.assertListEqual(grid.el.tolist(), self.el)
+            self.assertTrue(np.array_equal(grid.matrices, self.grid.matrices))
+            self.assertEqual(grid.headers['SPECRESP GRID']['NUM_AZ'], 3)
+            self.assertEqual(grid.headers['SPECRESP GRID']['NUM_EL'], 2)
+            self.assertTrue(np.allclose(grid.photon_bins.low_edges(), 
+                                        self.grid.photon_bins.low_edges()))
+            
+            # the DRMs are a view of the file
+            grid = BatRspGrid.open(path, zero_copy=True)
+            self.assertFalse(grid.matrices.flags.writeable)
+            self.assertIsNotNone(grid.matrices.base)
+            self.assertTrue(np.array_equal(grid.matrices, self.grid.matrices))
+            self.assertTrue(np.allclose(grid.interpolate(7.0, 3.0), 
+                                        self.grid.interpolate(7.0, 3.0)))
+
+    def test_errors(self):
+        matrices = self.grid.matrices
+        edges = make_drm()[1:]
+        with self.assertRaises(ValueError):
+            BatRspGrid.from_data(matrices, [0.0, -20.0, 20.0], self.el, *edges)
+        with self.assertRaises(ValueError):
+            BatRspGrid.from_data(matrices[:1, :1], [0.0], [0.0], *edges)
+        with self.assertRaises(ValueError):
+            BatRspGrid.from_data(matrices, self.az, [0.0, 95.0], *edges)
+        with self.assertRaises(ValueError):
+            BatRspGrid.from_data(matrices, self.az, self.el, *edges[::-1])
+        with self.assertRaises(TypeError):
+            BatRspGrid.from_data(matrices, self.az, self.el, *edges, 
+                                 headers=RspHeaders())
+        with self.assertRaises(ValueError):
+            BatRspGrid.from_rsps(self.rsps[:5], self.az, self.el)
+        rsps = list(self.rsps)
+        rsps[1] = BatRsp.from_data(rsps[1].drm.rebin(factor=2))
+        with self.assertRaises(ValueError):
+            BatRspGrid.from_rsps(rsps, self.az, self.el)
@@ -0,0 +1,111 @@
+# CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT WITH UNLIMITED RIGHTS
+#
+# Contract No.: CA 80MSFC17M0022
+# Contractor Name: Universities Space Research Association
+# Contractor Address: 7178 Columbia Gateway Drive, Columbia, MD 21046
+#
+# Copyright 2017-2022 by Universities Space Research Association (USRA). All rights reserved.
+#
+# Developed by: William Cleveland and Adam Goldstein
+#               Universities Space Research Association
+#               Science and Technology Institute
+#               https://sti.usra.edu
+#
+# Developed by: Daniel Kocevski
+#               National Aeronautics and Space Administration (NASA)
+#               Marshall Space Flight Center
+#               Astrophysics Branch (ST-12)
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing permissions and limitations under the
+# License.
+#
+
+import unittest
+import numpy as np
+
+from gdt.missions.swift.poshist import SwiftSao
+from gdt.missions.swift.bat.visibility import *
+
+
+def rotating_sao():
+    """A fixed spacecraft position on the +X axis, with the boresight 
+    rotating from RA=0 through RA=359 deg at 1 deg/s and an SAA passage 
+    from 100-110 s."""
+    time = np.arange(360, dtype=float)
+    pos = np.tile([7000.0, 0.0, 0.0], (360, 1))
+    vel = np.tile([0.0, 7.5, 0.0], (360, 1))
+    angle = np.deg2rad(time) / 2.0
+    quat = np.stack((np.zeros(360), np.zeros(360), np.sin(angle), 
+                     np.cos(angle)), axis=1)
+    saa = np.zeros(360, dtype=np.int16)
+    saa[100:111] = 1
+    return SwiftSao.from_data(time, pos, vel, quat, saa=saa)
+
+
+class TestBatVisibility(unittest.TestCase):
+    
+    def setUp(self):
+        self.vis = BatVisibility.from_sao(rotating_sao(), fov_radius=30.5)
+        # the Earth is centered at RA=180 with a radius of ~65.7 deg
+        self.ra = np.array([0.0, 150.0, 100.0])
+        self.dec = np.zeros(3)
+    
+    def test_attributes(self):
+        self.assertEqual(self.vis.num_samples, 360)
+        self.assertEqual(self.vis.fov_radius, 30.5)
+        self.assertEqual(self.vis.earth_radius, 6378.137)
+        self.assertEqual(self.vis.time[-1], 359.0)
+    
+    def test_mask(self):
+        mask = self.vis.mask(self.ra, self.dec)
+        self.assertEqual(mask.shape, (360, 3))
+        self.assertTrue(mask[0, 0])
+        self.assertFalse(mask[0, 2])
+        self.assertFalse(mask[:, 1].any())
+        self.assertTrue(mask[90, 2])
+        self.assertFalse(mask[105, 2])
+    
+    def test_intervals(self):
+        gtis = self.vis.intervals(self.ra, self.dec)
+        self.assertEqual(len(gtis), 3)
+        self.assertListEqual(gtis[0].as_list(), [(0.0, 30.0), (330.0, 359.0)])
+        self.assertIsNone(gtis[1])
+        self.assertListEqual(gtis[2].as_list(), [(70.0, 99.0), (111.0, 130.0)])
+    
+    def test_intervals_blocks(self):
+        # the result does not depend on how the samples are split up
+        expected = [gti.as_list() if gti is not None else None \
+                    for gti in self.vis.intervals(self.ra, self.dec)]
+        for block_size in (1, 7, 100):
+            gtis = self.vis.intervals(self.ra, self.dec, block_size=block_size)
+            gtis = [gti.as_list() if gti is not None else None for gti in gtis]
+            self.assertListEqual(gtis, expected)
+    
+    def test_empty(self):
+        vis = BatVisibility(np.array([]), np.zeros((0, 3)), np.zeros((0, 4)))
+        self.assertEqual(vis.num_samples, 0)
+        self.assertListEqual(vis.intervals([10.0, 20.0], [20.0, 30.0]), 
+                             [None, None])
+        self.assertEqual(vis.mask(10.0, 20.0).shape, (0, 1))
+    
+    def test_errors(self):
+        sao = rotating_sao()
+        with self.assertRaises(ValueError):
+            BatVisibility.from_sao(sao, fov_radius=0.0)
+        with self.assertRaises(ValueError):
+            BatVisibility.from_sao(sao, earth_radius=-1.0)
+        with self.assertRaises(ValueError):
+            BatVisibility(np.arange(3), np.ones((2, 3)), np.ones((3, 4)))
+        with self.assertRaises(ValueError):
+            BatVisibility(np.arange(3), np.ones((3, 3)), np.ones((2, 4)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+#  CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT WITH UNLIMITED RIGHTS
+#
+#  Contract No.: CA 80MSFC17M0022
+#  Contractor Name: Universities Space Research Association
+#  Contractor Address: 7178 Columbia Gateway Drive, Columbia, MD 21046
+#
+#  Copyright 2017-2022 by Universities Space Research Association (USRA). All rights reserved.
+#
+#  Developed by: William Cleveland and Adam Goldstein
+#                Universities Space Research Association
+#                Science and Technology Institute
+#                https://sti.usra.edu
+#
+#  Developed by: Daniel Kocevski
+#                National Aeronautics and Space Administration (NASA)
+#                Marshall Space Flight Center
+#                Astrophysics Branch (ST-12)
+#
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+#   in compliance with the License. You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software distributed under the License
+#  is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+#  implied. See the License for the specific language governing permissions and limitations under the
+#  License.
+#
+"""Writers for small synthetic Swift files shared by the tests."""
+import numpy as np
+import astropy.io.fits as fits
+from gdt.core.data_primitives import ResponseMatrix
+from gdt.missions.swift.bat.headers import SaoHeaders, AttHeaders, RspHeaders
+from gdt.missions.swift.bat.response import BatRsp
+
+
+def write_sao(path, tstart=612353536.6006, num_rows=600):
+    """Write a small synthetic SAO file with 1-s sampling, a slowly rotating
+    attitude, a circular orbit and a single SAA passage in the middle."""
+    time = tstart + np.arange(num_rows, dtype=float)
+    # the orbit and attitude depend only on time, so overlapping files agree
+    dt = time - 612353536.6006
+    phase = 2.0 * np.pi * dt / 5760.0
+    pos = 6921.0 * np.stack((np.cos(phase), np.sin(phase),
+                             np.zeros(num_rows)), axis=1)
+    vel = 7.59 * np.stack((-np.sin(phase), np.cos(phase),
+                           np.zeros(num_rows)), axis=1)
+    angle = 0.5 * np.deg2rad(0.1) * dt
+    quat = np.stack((np.zeros(num_rows), np.zeros(num_rows), np.sin(angle),
+                     np.cos(angle)), axis=1)
+    saa = np.zeros(num_rows, dtype=np.int16)
+    saa[num_rows // 3: num_rows // 2] = 1
+    sun = np.zeros(num_rows, dtype=np.int16)
+    sun[num_rows // 4:] = 1
+
+    headers = SaoHeaders()
+    for hdr in headers:
+        hdr['TSTART'] = time[0]
+        hdr['TSTOP'] = time[-1]
+    cols = [fits.Column(name='TIME', format='D', unit='s', array=time),
+            fits.Column(name='POSITION', format='3E', unit='km', array=pos),
+            fits.Column(name='VELOCITY', format='3E', unit='km/s', array=vel),
+            fits.Column(name='QUATERNION', format='4E', array=quat),
+            fits.Column(name='SUNSHINE', format='I', array=sun),
+            fits.Column(name='SAA', format='I', array=saa)]
+    hdulist = fits.HDUList([fits.PrimaryHDU(header=headers['PRIMARY']),
+                            fits.BinTableHDU.from_columns(
+                                cols, header=headers['PREFILTER'])])
+    hdulist.writeto(path, overwrite=True)
+    return path
+
+
+def write_att(path, tstart=612353536.6006, num_rows=1200):
+    """Write a small synthetic attitude file with 0.5-s sampling, the same 
+    attitude as :func:`write_sao`, and a few duplicated rows."""
+    time = tstart + 0.5 * np.arange(num_rows, dtype=float)
+    time = np.sort(np.concatenate((time, time[[10, 500, 501]])))
+    dt = time - 612353536.6006
+    angle = 0.5 * np.deg2rad(0.1) * dt
+    quat = np.stack((np.zeros(time.size), np.zeros(time.size), np.sin(angle),
+                     np.cos(angle)), axis=1)
+    pointing = np.zeros((time.size, 3))
+    
+    headers = AttHeaders()
+    for hdr in headers:
+        hdr['TSTART'] = time[0]
+        hdr['TSTOP'] = time[-1]
+    cols = [fits.Column(name='TIME', format='D', unit='s', array=time),
+            fits.Column(name='POINTING', format='3D', unit='deg', 
+                        array=pointing),
+            fits.Column(name='QPARAM', format='4D', array=quat)]
+    acs = fits.BinTableHDU.from_columns(
+                  [fits.Column(name='TIME', format='D', array=time)])
+    acs.header['EXTNAME'] = 'ACS_DATA'
+    hdulist = fits.HDUList([fits.PrimaryHDU(header=headers['PRIMARY']),
+                            fits.BinTableHDU.from_columns(
+                                cols, header=headers['ATTITUDE']), acs])
+    hdulist.writeto(path, overwrite=True)
+    return path
+
+
+def write_rsp(path, tstart, scale=1.0, trigtime=612353536.6006):
+    """Write a BatRsp file with a diagonal 8x8 matrix, valid for the 10 s 
+    starting ``tstart`` seconds after the trigger time."""
+    edges = np.geomspace(15.0, 150.0, 9)
+    drm = ResponseMatrix(scale * np.eye(8), edges[:-1], edges[1:], 
+                         edges[:-1], edges[1:])
+    headers = RspHeaders()
+    for hdr in (headers['SPECRESP MATRIX'], headers['EBOUNDS']):
+        hdr['TSTART'] = trigtime + tstart
+        hdr['TSTOP'] = trigtime + tstart + 10.0
+    headers['PRIMARY']['TRIGTIME'] = trigtime
+    rsp = BatRsp.from_data(drm, start_time=trigtime + tstart, 
+                           stop_time=trigtime + tstart + 10.0,
+                           trigger_time=trigtime, headers=headers)
+    rsp.write(path.parent, filename=path.name, overwrite=True)
+    return path
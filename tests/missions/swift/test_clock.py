@@ -0,0 +1,152 @@
+#  CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT WITH UNLIMITED RIGHTS
+#
+#  Contract No.: CA 80MSFC17M0022
+#  Contractor Name: Universities Space Research Association
+#  Contractor Address: 7178 Columbia Gateway Drive, Columbia, MD 21046
+#
+#  Copyright 2017-2022 by Universities Space Research Association (USRA). All rights reserved.
+#
+#  Developed by: William Cleveland and Adam Goldstein
+#                Universities Space Research Association
+#                Science and Technology Institute
+#                https://sti.usra.edu
+#
+#  Developed by: Daniel Kocevski
+#                National Aeronautics and Space Administration (NASA)
+#                Marshall Space Flight Center
+#                Astrophysics Branch (ST-12)
+#
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+#   in compliance with the License. You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software distributed under the License
+#  is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+#  implied. See the License for the specific language governing permissions and limitations under the
+#  License.
+#
+import os
+import pytest
+import numpy as np
+import astropy.io.fits as fits
+from gdt.missions.swift.clock import SwiftClockCorrection
+from gdt.missions.swift.time import met_to_datetime64, met_to_unix, utc_to_met
+
+
+def write_clock(path, c0=(-20.0, 35.0, 50.0), units=('us', 'us/d', 'us/d**2')):
+    """Write a synthetic clock-correction table with three rows in the swco
+    layout: a constant offset in seconds and the polynomial coefficients in
+    microseconds, microseconds/day and microseconds/day**2."""
+    tstart = np.array([1.0e8, 2.0e8, 3.0e8])
+    cols = [fits.Column(name='TSTART', format='D', unit='s', array=tstart),
+            fits.Column(name='TSTOP', format='D', unit='s', 
+                        array=tstart + 1.0e8),
+            fits.Column(name='TOFFSET', format='D', unit='s', 
+                        array=[0.0, 1.0e-3, 0.0]),
+            fits.Column(name='C0', format='D', unit=units[0], array=c0),
+            fits.Column(name='C1', format='D', unit=units[1], 
+                        array=[0.0864, 0.1728, 0.0]),
+            fits.Column(name='C2', format='D', unit=units[2], 
+                        array=[0.0, 7.46496e-5, 0.0])]
+    hdulist = fits.HDUList([fits.PrimaryHDU(), 
+                            fits.BinTableHDU.from_columns(cols)])
+    hdulist.writeto(path, overwrite=True)
+    return path
+
+
+@pytest.fixture
+def clock_file(tmp_path):
+    return write_clock(tmp_path / 'swclockcor.fits')
+
+
+def test_open(clock_file):
+    clock = SwiftClockCorrection.open(clock_file)
+    assert clock.num_rows == 3
+    assert clock.time_range() == (1.0e8, 4.0e8)
+    assert clock.filename == 'swclockcor.fits'
+
+
+def test_correction(clock_file):
+    clock = SwiftClockCorrection.open(clock_file)
+    met = np.array([1.0e8, 1.5e8, 2.5e8, 3.9e8])
+    # 1 us/day is 1/86400 us/s, so C1 is 1e-6 and 2e-6 us/s, and C2 is 
+    # 1e-14 us/s**2
+    expected = np.array([-20.0, -20.0 + 50.0, 1000.0 + 35.0 + 100.0 + 25.0, 
+                         50.0])
+    assert clock.correction(met) == pytest.approx(expected * 1e-6)
+    assert clock.apply(met) == pytest.approx(met - expected * 1e-6, 
+                                             abs=1e-9, rel=0.0)
+    assert clock.correction(1.0e8) == pytest.approx(-20.0e-6)
+    assert clock.correction(2.0e8) == pytest.approx(1.035e-3)
+    
+    with pytest.raises(ValueError):
+        clock.correction([1.5e8, 4.5e8])
+    with pytest.raises(ValueError):
+        clock.correction(0.0)
+
+
+def test_cached(clock_file):
+    clock1 = SwiftClockCorrection.open(clock_file)
+    clock2 = SwiftClockCorrection.open(clock_file)
+    assert clock1.correction(1.5e8) == clock2.correction(1.5e8)
+    
+    # a modified file is read again
+    write_clock(clock_file, c0=(0.0, 0.0, 0.0))
+    stat = os.stat(clock_file)
+    os.utime(clock_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    clock3 = SwiftClockCorrection.open(clock_file)
+    assert clock3.correction(1.0e8) == 0.0
+
+
+def test_units(tmp_path):
+    # the same table with the polynomial in seconds
+    clock_file = write_clock(tmp_path / 'swclockcor_s.fits', 
+                             c0=(-20.0e-6, 35.0e-6, 50.0e-6),
+                             units=('s', 'us/d', 'us/d**2'))
+    clock = SwiftClockCorrection.open(clock_file)
+    assert clock.correction(2.5e8) == pytest.approx(1.16e-3)
+    
+    # units that are not times, or cannot be parsed, are an error
+    for units in [('us', 'us/d', 'us/d'), ('us', 'us', 'us/d**2'), 
+                  ('us', 'us/d', 'km'), ('microsecs', 'us/d', 'us/d**2'),
+                  (None, 'us/d', 'us/d**2')]:
+        clock_file = write_clock(tmp_path / 'swclockcor_bad.fits', 
+                                 units=units)
+        with pytest.raises(ValueError):
+            SwiftClockCorrection.open(clock_file)
+
+
+def test_missing_column(tmp_path):
+    cols = [fits.Column(name='TSTART', format='D', unit='s', array=[0.0]),
+            fits.Column(name='C0', format='D', unit='us', array=[0.0])]
+    hdulist = fits.HDUList([fits.PrimaryHDU(), 
+                            fits.BinTableHDU.from_columns(cols)])
+    hdulist.writeto(tmp_path / 'bad.fits')
+    with pytest.raises(ValueError):
+        SwiftClockCorrection.open(tmp_path / 'bad.fits')
+
+
+def test_from_data():
+    clock = SwiftClockCorrection.from_data([2.0, 0.0], [3.0, 2.0], [2.0, 0.0],
+                                           [1.0, 0.5], c1=[0.5, 1.0])
+    assert clock.correction([0.5, 2.5]).tolist() == [1.0, 3.25]
+    
+    with pytest.raises(ValueError):
+        SwiftClockCorrection.from_data([], [], [], [])
+    with pytest.raises(ValueError):
+        SwiftClockCorrection.from_data([0.0, 1.0], [1.0], [0.0, 1.0], 
+                                       [0.0, 0.0])
+
+
+def test_time_functions(clock_file):
+    clock = SwiftClockCorrection.open(clock_file)
+    met = np.array([1.5e8, 2.5e8])
+    corrected = clock.apply(met)
+    assert np.all(met_to_datetime64(met, clock=clock) == \
+                  met_to_datetime64(corrected))
+    assert met_to_unix(met, clock=clock) == pytest.approx(
+                                                met_to_unix(corrected))
+    utc = met_to_datetime64(met, clock=clock)
+    assert utc_to_met(utc, clock=clock) == pytest.approx(met, abs=1e-6, 
+                                                         rel=0.0)
@@ -0,0 +1,145 @@
+#  CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT WITH UNLIMITED RIGHTS
+#
+#  Contract No.: CA 80MSFC17M0022
+#  Contractor Name: Universities Space Research Association
+#  Contractor Address: 7178 Columbia Gateway Drive, Columbia, MD 21046
+#
+#  Copyright 2017-2022 by Universities Space Research Association (USRA). All rights reserved.
+#
+#  Developed by: William Cleveland and Adam Goldstein
+#                Universities Space Research Association
+#                Science and Technology Institute
+#                https://sti.usra.edu
+#
+#  Developed by: Daniel Kocevski
+#                National Aeronautics and Space Administration (NASA)
+#                Marshall Space Flight Center
+#                Astrophysics Branch (ST-12)
+#
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+#   in compliance with the License. You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software distributed under the License
+#  is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+#  implied. See the License for the specific language governing permissions and limitations under the
+#  License.
+#
+import pytest
+import numpy as np
+from astropy.coordinates import SkyCoord
+from gdt.core.coords import Quaternion
+from gdt.missions.swift.frame import *
+
+
+@pytest.fixture
+def quats():
+    rng = np.random.default_rng(42)
+    quat = rng.normal(size=(5, 4))
+    return quat / np.linalg.norm(quat, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def radec():
+    ra = np.array([0.0, 45.0, 100.0, 210.5, 359.0, 300.0])
+    dec = np.array([-89.0, -30.0, 0.0, 12.3, 60.0, 89.5])
+    return ra, dec
+
+
+def test_rotation_matrices(quats):
+    matrix = rotation_matrices(quats)
+    assert matrix.shape == (5, 3, 3)
+    expected = Quaternion(quats).rotation.as_matrix()
+    assert matrix == pytest.approx(expected)
+    assert rotation_matrices(Quaternion(quats)) == pytest.approx(expected)
+    
+    with pytest.raises(ValueError):
+        rotation_matrices(np.zeros((2, 3)))
+
+
+def test_radec_to_azel(quats, radec):
+    ra, dec = radec
+    az, el = radec_to_azel(ra, dec, quats)
+    assert az.shape == (5, 6)
+    assert el.shape == (5, 6)
+
+    coord = SkyCoord(ra, dec, unit='deg')
+    for i in range(quats.shape[0]):
+        frame = SwiftFrame(quaternion=Quaternion(quats[i]))
+        swift_coord = coord.transform_to(frame)
+        assert az[i] == pytest.approx(swift_coord.az.value, abs=1e-9)
+        assert el[i] == pytest.approx(swift_coord.el.value, abs=1e-9)
+
+    # a single attitude and position
+    az, el = radec_to_azel(ra[1], dec[1], quats[0])
+    assert az.shape == ()
+    assert az == pytest.approx(radec_to_azel(ra, dec, quats)[0][0, 1])
+
+
+def test_azel_to_radec(quats, radec):
+    az, el = radec
+    ra, dec = azel_to_radec(az, el, quats)
+    assert ra.shape == (5, 6)
+
+    for i in range(quats.shape[0]):
+        frame = SwiftFrame(quaternion=Quaternion(quats[i]))
+        coord = SkyCoord(az, el, frame=frame, unit='deg').icrs
+        assert ra[i] == pytest.approx(coord.ra.value, abs=1e-9)
+        assert dec[i] == pytest.approx(coord.dec.value, abs=1e-9)
+
+    # round trip
+    az2, el2 = radec_to_azel(ra[2], dec[2], quats[2])
+    assert el2 == pytest.approx(el, abs=1e-9)
+
+
+def test_frame_rotation_matrices(quats):
+    frame = SwiftFrame(quaternion=Quaternion(quats))
+    matrices = frame.rotation_matrices
+    assert matrices.shape == (5, 3, 3)
+    assert matrices == pytest.approx(rotation_matrices(quats))
+    
+    # computed once for each frame, and read-only
+    assert frame.rotation_matrices is matrices
+    assert not matrices.flags.writeable
+    assert radec_to_azel(10.0, 20.0, frame)[0] == \
+           pytest.approx(radec_to_azel(10.0, 20.0, quats)[0])
+    
+    # a copy with a new quaternion gets new matrices
+    new_frame = frame.replicate_without_data(quaternion=Quaternion(quats[::-1]))
+    assert new_frame.rotation_matrices is not matrices
+    assert new_frame.rotation_matrices == pytest.approx(matrices[::-1])
+    
+    # as does a frame realized with data
+    coord = frame.realize_frame(SkyCoord(10.0, 20.0, unit='deg').data)
+    assert coord.rotation_matrices is not matrices
+    assert coord.rotation_matrices == pytest.approx(matrices)
+
+
+def test_transform_round_trip(quats, radec):
+    ra, dec = radec
+    frame = SwiftFrame(quaternion=Quaternion(quats[0]))
+    swift_coord = SkyCoord(ra, dec, unit='deg').transform_to(frame)
+    assert swift_coord.shape == (6,)
+    az, el = radec_to_azel(ra, dec, quats[0])
+    assert swift_coord.az.deg == pytest.approx(az)
+    assert swift_coord.el.deg == pytest.approx(el)
+
+    icrs = swift_coord.icrs
+    assert icrs.ra.deg == pytest.approx(ra)
+    assert icrs.dec.deg == pytest.approx(dec)
+    
+    # one position for many attitudes
+    frame = SwiftFrame(quaternion=Quaternion(quats))
+    swift_coord = SkyCoord(ra[2], dec[2], unit='deg').transform_to(frame)
+    az, el = radec_to_azel(ra[2], dec[2], quats)
+    assert swift_coord.az.deg == pytest.approx(az)
+
+
+def test_radec_to_azel_frame(quats, radec):
+    ra, dec = radec
+    frame = SwiftFrame(quaternion=Quaternion(quats))
+    az, el = radec_to_azel(ra, dec, frame)
+    expected = radec_to_azel(ra, dec, quats)
+    assert az == pytest.approx(expected[0])
+    assert el == pytest.approx(expected[1])
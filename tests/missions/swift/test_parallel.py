@@ -0,0 +1,143 @@
+#  CONTAINS TECHNICAL DATA/COMPUTER SOFTWARE DELIVERED TO THE U.S. GOVERNMENT WITH UNLIMITED RIGHTS
+#
+#  Contract No.: CA 80MSFC17M0022
+#  Contractor Name: Universities Space Research Association
+#  Contractor Address: 7178 Columbia Gateway Drive, Columbia, MD 21046
+#
+#  Copyright 2017-2022 by Universities Space Research Association (USRA). All rights reserved.
+#
+#  Developed by: William Cleveland and Adam Goldstein
+#                Universities Space Research Association
+#                Science and Technology Institute
+#                https://sti.usra.edu
+#
+#  Developed by: Daniel Kocevski
+#                National Aeronautics and Space Administration (NASA)
+#                Marshall Space Flight Center
+#                Astrophysics Branch (ST-12)
+#
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+#   in compliance with the License. You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software distributed under the License
+#  is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+#  implied. See the License for the specific language governing permissions and limitations under the
+#  License.
+#
+import pickle
+import pytest
+import numpy as np
+from gdt.missions.swift.parallel import *
+from gdt.missions.swift.poshist import SwiftSao, SwiftAttitude
+from gdt.missions.swift.bat.response import BatRsp
+from .synthetic import write_sao, write_att, write_rsp
+
+
+@pytest.fixture
+def sao_files(tmp_path):
+    return [write_sao(tmp_path / 'sw0000000000{}sao.fits'.format(i), 
+                      tstart=612353536.6006 + 1000.0 * i, num_rows=100 + i) \
+            for i in range(6)]
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_open_many(sao_files, executor):
+    saos = open_many(SwiftSao, sao_files, workers=2, executor=executor, 
+                     max_in_flight=3)
+    assert len(saos) == len(sao_files)
+    for i, sao in enumerate(saos):
+        # in input order
+        assert sao.sao_column('TIME').size == 100 + i
+        assert sao.get_tstart() == pytest.approx(612353536.6006 + 1000.0 * i)
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_open_many_rsp(tmp_path, executor):
+    paths = [write_rsp(tmp_path / 'sw0000000000{}b.rsp'.format(i), 10.0 * i,
+                       scale=i + 1.0) for i in range(5)]
+    rsps = open_many(BatRsp, paths, workers=2, executor=executor, 
+                     max_in_flight=2)
+    assert len(rsps) == 5
+    for i, rsp in enumerate(rsps):
+        # in input order, and the matrices survive the trip from the worker
+        assert rsp.filename == paths[i].name
+        assert rsp.tstart == pytest.approx(10.0 * i)
+        assert rsp.drm.matrix == pytest.approx((i + 1.0) * np.eye(8))
+
+
+def test_open_many_failures(sao_files, tmp_path):
+    bad_file = tmp_path / 'not_a_fits_file.fits'
+    bad_file.write_text('not a FITS file')
+    paths = sao_files[:2] + [bad_file, tmp_path / 'missing.fits'] + \
+            sao_files[2:]
+    
+    with pytest.warns(RuntimeWarning, match='Could not open'):
+        saos = open_many(SwiftSao, paths, workers=2, executor='thread')
+    assert saos[2] is None
+    assert saos[3] is None
+    assert [sao.sao_column('TIME').size for sao in saos if sao is not None] == \
+           [100 + i for i in range(6)]
+
+
+def test_open_many_serial(sao_files):
+    saos = open_many(SwiftSao, sao_files, workers=1, lazy=True)
+    assert [sao.sao_column('TIME').size for sao in saos] == \
+           [100 + i for i in range(6)]
+
+
+def test_iter_open(sao_files):
+    # stopping early does not open the rest of the files
+    it = iter_open(SwiftSao, sao_files, workers=2, executor='thread', 
+                   max_in_flight=2)
+    sao = next(it)
+    assert sao.sao_column('TIME').size == 100
+    it.close()
+
+
+def test_errors(sao_files):
+    with pytest.raises(ValueError):
+        open_many(SwiftSao, sao_files, executor='fork')
+    with pytest.raises(ValueError):
+        open_many(SwiftSao, sao_files, workers=0)
+    with pytest.raises(ValueError):
+        open_many(SwiftSao, sao_files, max_in_flight=0)
+
+
+def test_pickle(sao_files, tmp_path):
+    # a lazy object only pickles the columns decoded so far and opens the 
+    # file again when unpickled
+    sao = SwiftSao.open(sao_files[0], lazy=True)
+    sao.sao_column('TIME')
+    sao2 = pickle.loads(pickle.dumps(sao))
+    assert sao2.filename == sao.filename
+    assert sao2.bytes_read == sao.bytes_read
+    assert np.all(sao2.sao_column('POSITION') == sao.sao_column('POSITION'))
+    assert sao2.bytes_read == sao.bytes_read
+    assert sao2.headers['PRIMARY']['TSTART'] == sao.headers['PRIMARY']['TSTART']
+    assert np.all(sao2.column(1, 'SAA') == sao.column(1, 'SAA'))
+    assert np.all(sao2.ndim_column(1, 'VELOCITY') == \
+                  sao.ndim_column(1, 'VELOCITY'))
+    sao2.close()
+    sao.close()
+    
+    # an object that is not lazy is pickled with all of its columns, and the
+    # file is not needed after unpickling
+    sao = SwiftSao.open(sao_files[1])
+    data = pickle.dumps(sao)
+    sao.close()
+    sao_files[1].unlink()
+    sao2 = pickle.loads(data)
+    assert sao2.headers['PRIMARY']['TSTART'] == sao.headers['PRIMARY']['TSTART']
+    assert sao2.get_column_names(1) == SwiftSao._columns
+    assert np.all(sao2.column(1, 'TIME') == sao.sao_column('TIME'))
+    assert np.all(sao2.ndim_column(1, 'QUATERNION') == \
+                  sao.sao_column('QUATERNION'))
+    assert sao2.in_saa(sao.sao_column('TIME')).sum() == \
+           sao.in_saa(sao.sao_column('TIME')).sum()
+    
+    att = SwiftAttitude.open(write_att(tmp_path / 'sw00000000000sat.fits'))
+    att2 = pickle.loads(pickle.dumps(att))
+    assert np.all(att2.quaternion == att.quaternion)
+    att.close()
@@ -26,19 +26,28 @@
 #  implied. See the License for the specific language governing permissions and limitations under the
 #  License.
 #
+import os
 import pytest
 import unittest
 import numpy as np
+import astropy.io.fits as fits
 from tempfile import TemporaryDirectory
 from gdt.core import data_path
 from gdt.core.coords import Quaternion
-from gdt.missions.swift.poshist import SwiftSao
+from gdt.missions.swift.bat.headers import SaoHeaders
+from gdt.missions.swift.poshist import SwiftSao, SwiftAttitude, SwiftSaoCache
+from .synthetic import write_sao, write_att
 
 
 @pytest.fixture
 def test_file():
     return data_path / 'swift-bat' / 'sw00974827000sao.fits.gz'
 
+
+@pytest.fixture
+def sao_file(tmp_path):
+    return write_sao(tmp_path / 'sw00000000000sao.fits')
+
 def test_get_spacecraft_frame(test_file):
     # if not test_file.exists():
     #     pytest.skip("test files aren't downloaded. run gdt-download-data.")
@@ -107,3 +116,381 @@ def test_get_spacecraft_states(test_file):
         state = states[1182]
         assert state['saa'] == False
         assert state['sun'] == False
+
+
+def test_ndim_column(sao_file):
+    with SwiftSao.open(sao_file) as sao:
+        pos = sao.ndim_column(1, 'POSITION')
+        assert pos.shape == (600, 3)
+        assert pos.dtype.isnative
+        assert pos.flags['C_CONTIGUOUS']
+
+        quat = sao.ndim_column(1, 'QUATERNION')
+        assert quat.shape == (600, 4)
+        assert quat.dtype.isnative
+
+        # same values as the raw FITS column
+        raw = sao.column(1, 'VELOCITY')
+        assert np.array_equal(sao.ndim_column(1, 'VELOCITY'), raw)
+
+
+def test_ndim_column_as_array(sao_file):
+    with SwiftSao.open(sao_file) as sao:
+        raw = sao.column(1, 'POSITION')
+        for i in range(3):
+            arr = sao.ndim_column_as_array(1, 'POSITION', i)
+            assert arr.dtype.isnative
+            assert np.array_equal(arr, [row[i] for row in raw])
+
+
+def test_sao_column(sao_file):
+    with SwiftSao.open(sao_file) as sao:
+        time = sao.sao_column('TIME')
+        assert time.dtype.isnative
+        assert time.tolist() == sao.column(1, 'TIME').tolist()
+        
+        stitched = SwiftSao.open_many([sao_file])
+        assert stitched.sao_column('QUATERNION').shape == (600, 4)
+
+
+def test_get_spacecraft_frame_synthetic(sao_file):
+    with SwiftSao.open(sao_file) as sao:
+        frame = sao.get_spacecraft_frame()
+        raw_pos = sao.column(1, 'POSITION')
+        raw_quat = sao.column(1, 'QUATERNION')
+
+    assert frame.obstime.size == 600
+    assert frame[0].obstime.swift == 612353536.6006
+    assert np.allclose(frame.obsgeoloc.xyz.to_value('km').T, raw_pos)
+    assert str(frame.obsgeovel.xyz.unit) == 'm / s'
+    assert frame[10].quaternion == Quaternion(raw_quat[10])
+
+
+def test_open_many(tmp_path):
+    # second file overlaps the last 100 s of the first; pass them out of order
+    file1 = write_sao(tmp_path / 'sw00000000001sao.fits', num_rows=300)
+    file2 = write_sao(tmp_path / 'sw00000000002sao.fits', 
+                      tstart=612353536.6006 + 200.0, num_rows=300)
+    sao = SwiftSao.open_many([file2, file1])
+
+    frame = sao.get_spacecraft_frame()
+    assert frame.obstime.size == 500
+    times = frame.obstime.swift
+    assert np.all(np.diff(times) > 0.0)
+    assert times[0] == 612353536.6006
+    assert sao.time_range() == (times[0], times[-1])
+
+    states = sao.get_spacecraft_states()
+    assert len(states) == 500
+
+    with SwiftSao.open(file1) as sao1:
+        assert np.array_equal(sao._sao_column('POSITION')[:300],
+                              sao1.ndim_column(1, 'POSITION'))
+
+
+def test_open_many_empty():
+    with pytest.raises(ValueError):
+        SwiftSao.open_many([])
+    with pytest.raises(ValueError):
+        SwiftSao.open_many(iter([]))
+
+
+def test_open_many_duplicates(tmp_path, sao_file):
+    # the same file twice, plus a file whose rows all fall inside the first
+    inner = write_sao(tmp_path / 'sw00000000003sao.fits', 
+                      tstart=612353536.6006 + 100.0, num_rows=50)
+    sao = SwiftSao.open_many([sao_file, inner, sao_file])
+    with SwiftSao.open(sao_file) as sao1:
+        for col_name in SwiftSao._columns:
+            assert np.array_equal(sao._sao_column(col_name),
+                                  sao1._sao_column(col_name))
+    assert sao.time_range() == sao1.time_range()
+
+
+def test_open_many_overlap_order(tmp_path):
+    # overlapping rows with the same time but different contents: the row 
+    # from the first file in the list is kept
+    file1 = write_sao(tmp_path / 'sw00000000001sao.fits', num_rows=300)
+    file2 = write_sao(tmp_path / 'sw00000000002sao.fits', 
+                      tstart=612353536.6006 + 200.0, num_rows=300)
+    with fits.open(file2, mode='update') as hdulist:
+        hdulist[1].data['SAA'][:] = 2
+    
+    sao = SwiftSao.open_many([file2, file1])
+    time = sao._sao_column('TIME')
+    assert np.unique(time).size == time.size == 500
+    saa = sao._sao_column('SAA')
+    assert np.all(saa[time >= 612353536.6006 + 200.0] == 2)
+    
+    sao = SwiftSao.open_many([file1, file2])
+    saa = sao._sao_column('SAA')
+    assert np.all(saa[200:300] != 2)
+    assert np.all(saa[300:] == 2)
+
+
+def test_open_many_kwargs(tmp_path):
+    # the options of open are applied to each file
+    file1 = write_sao(tmp_path / 'sw00000000001sao.fits', num_rows=300)
+    file2 = write_sao(tmp_path / 'sw00000000002sao.fits', 
+                      tstart=612353536.6006 + 200.0, num_rows=300)
+    expected = SwiftSao.open_many([file1, file2])
+    cache = SwiftSaoCache(tmp_path / 'cache')
+    for kwargs in ({'lazy': True}, {'cache': cache}, {'cache': cache}):
+        sao = SwiftSao.open_many([file1, file2], **kwargs)
+        for col_name in SwiftSao._columns:
+            assert np.array_equal(sao.sao_column(col_name),
+                                  expected.sao_column(col_name))
+    assert cache.num_entries == 2
+
+
+def test_open_many_single(sao_file):
+    sao = SwiftSao.open_many([sao_file])
+    with SwiftSao.open(sao_file) as sao1:
+        for col_name in SwiftSao._columns:
+            assert np.array_equal(sao._sao_column(col_name),
+                                  sao1._sao_column(col_name))
+
+
+def test_from_data():
+    time = np.arange(10.0)
+    pos = np.ones((10, 3))
+    quat = np.tile([0.0, 0.0, 0.0, 1.0], (10, 1))
+    sao = SwiftSao.from_data(time, pos, pos, quat)
+    assert sao.time_range() == (0.0, 9.0)
+    assert len(sao.get_spacecraft_states()) == 10
+
+    with pytest.raises(ValueError):
+        SwiftSao.from_data(time, pos[:5], pos, quat)
+    with pytest.raises(TypeError):
+        SwiftSao.from_data(time, pos, pos, quat, headers={})
+
+
+def test_frame_at(sao_file):
+    with SwiftSao.open(sao_file) as sao:
+        frame = sao.get_spacecraft_frame()
+        met = np.array([612353536.6006, 612353600.1, 612353836.25, 
+                        612354135.6006])
+        
+        one_frame = sao.frame_at(met)
+        assert type(one_frame).__name__ == 'SwiftFrame'
+        assert one_frame.obstime.size == 4
+        
+        # compare against the general-purpose interpolation of the full frame
+        ref = frame.at(one_frame.obstime)
+        assert np.allclose(one_frame.obsgeoloc.xyz.value, 
+                           ref.obsgeoloc.xyz.value, rtol=1e-6)
+        assert np.allclose(one_frame.obsgeovel.xyz.value, 
+                           ref.obsgeovel.xyz.value, rtol=1e-6)
+        for i in range(4):
+            assert one_frame.quaternion[i].equal_rotation(ref.quaternion[i])
+
+        # exact on the sampled rows
+        exact = sao.frame_at(612353546.6006)
+        assert exact.obstime.isscalar
+        assert np.allclose(exact.obsgeoloc.xyz.to_value('km'), 
+                           sao.ndim_column(1, 'POSITION')[10])
+        
+        with pytest.raises(ValueError):
+            sao.frame_at(612353536.0)
+
+
+def test_open_lazy(sao_file):
+    with SwiftSao.open(sao_file, lazy=True) as sao:
+        assert sao.bytes_read == 0
+        assert sao._headers is None
+
+        # only TIME, SUNSHINE and SAA are decoded
+        states = sao.get_spacecraft_states()
+        assert len(states) == 600
+        assert sao.bytes_read == 600 * (8 + 2 + 2)
+        
+        # cached on the second access
+        sao.get_spacecraft_states()
+        assert sao.bytes_read == 600 * (8 + 2 + 2)
+
+        # headers are parsed on first access
+        assert sao.get_tstart() == 612353536.6006
+        assert sao.headers['PREFILTER']['EXTNAME'] == 'PREFILTER'
+        
+        frame = sao.get_spacecraft_frame()
+        assert sao.bytes_read == 600 * (8 + 2 + 2 + 12 + 12 + 16)
+
+    with SwiftSao.open(sao_file) as sao:
+        assert np.array_equal(frame.obsgeoloc.xyz.value, 
+                              sao.get_spacecraft_frame().obsgeoloc.xyz.value)
+
+
+def test_state_index(sao_file):
+    # SAA from rows 200-299 and sunshine from row 150 onward
+    with SwiftSao.open(sao_file) as sao:
+        time = sao.column(1, 'TIME')
+        states = sao.get_spacecraft_states()
+
+        # sampled times agree with the flags
+        assert np.array_equal(sao.in_saa(time), states['saa'].astype(bool))
+        assert np.array_equal(sao.sunlit(time), states['sun'].astype(bool))
+        
+        # between samples, the state of the preceding sample is held
+        assert sao.in_saa(time[299] + 0.5)
+        assert not sao.in_saa(time[199] + 0.5)
+        
+        # outside of the file
+        assert not sao.sunlit(time[-1] + 1.0)
+        assert sao.sunlit(time[-1])
+        assert not sao.in_saa(time[0] - 1.0)
+
+        assert np.array_equal(sao.saa_during([time[0], time[250], time[310]],
+                                             [time[199], time[260], time[400]]),
+                              [False, True, False])
+        assert sao.saa_during(time[100], time[200])
+        assert not sao.saa_during(time[100], time[199] + 0.5)
+
+        gti = sao.good_intervals(time[0] - 10.0, time[-1] + 10.0)
+        assert gti.as_list() == [(time[0], time[200]), (time[300], time[-1])]
+        gti = sao.good_intervals(time[250], time[350])
+        assert gti.as_list() == [(time[300], time[350])]
+        assert sao.good_intervals(time[210], time[290]) is None
+
+
+def test_cache(sao_file, tmp_path):
+    cache = SwiftSaoCache(tmp_path / 'cache')
+    assert cache.num_entries == 0
+    
+    # first open decodes the file and stores it
+    with SwiftSao.open(sao_file, cache=cache) as sao:
+        frame = sao.get_spacecraft_frame()
+        tstart = sao.get_tstart()
+    assert cache.num_entries == 1
+    assert cache.size > 0
+
+    # second open is served from the cache
+    sao = SwiftSao.open(sao_file, cache=cache)
+    assert sao._hdulist is None
+    assert sao.filename == sao_file.name
+    assert sao.get_tstart() == tstart
+    assert sao.headers['PREFILTER']['EXTNAME'] == 'PREFILTER'
+    assert np.array_equal(sao.get_spacecraft_frame().obsgeoloc.xyz.value,
+                          frame.obsgeoloc.xyz.value)
+    assert np.array_equal(sao.in_saa(frame.obstime.swift), 
+                          sao.get_spacecraft_states()['saa'].astype(bool))
+    
+    # a modified file gets a new key
+    key = cache.key(sao_file)
+    write_sao(sao_file, num_rows=10)
+    os.utime(sao_file, ns=(0, 0))
+    assert cache.key(sao_file) != key
+    assert cache.get(sao_file) is None
+    
+    cache.clear()
+    assert cache.num_entries == 0
+
+
+def test_cache_eviction(tmp_path):
+    files = [write_sao(tmp_path / 'sw0000000000{}sao.fits'.format(i))
+             for i in range(3)]
+    cache = SwiftSaoCache(tmp_path / 'sizing')
+    SwiftSao.open(files[0], cache=cache).close()
+    entry_size = cache.size
+
+    # an entry larger than the cache is not kept
+    cache = SwiftSaoCache(tmp_path / 'small', max_bytes=1)
+    SwiftSao.open(files[0], cache=cache).close()
+    assert cache.num_entries == 0
+    
+    # room for two entries
+    cache = SwiftSaoCache(tmp_path / 'cache', max_bytes=2 * entry_size)
+    for i, file in enumerate(files):
+        SwiftSao.open(file, cache=cache).close()
+        os.utime(cache.directory / cache.key(file), (i, i))
+    assert cache.num_entries == 2
+    assert cache.get(files[0]) is None
+    assert cache.get(files[2]) is not None
+
+    with pytest.raises(ValueError):
+        SwiftSaoCache(tmp_path / 'cache', max_bytes=0)
+
+
+def test_attitude_open(tmp_path):
+    att_file = write_att(tmp_path / 'sw00000000000sat.fits')
+    with SwiftAttitude.open(att_file) as att:
+        assert att.num_rows == 1200
+        assert np.all(np.diff(att.time) > 0.0)
+        assert att.headers['ATTITUDE']['EXTNAME'] == 'ATTITUDE'
+        assert att.time_range() == (att.time[0], att.time[-1])
+        
+        frame = att.get_spacecraft_frame()
+        assert frame.shape == (1200,)
+        assert frame.quaternion.w == pytest.approx(att.quaternion.w)
+
+
+def test_attitude_resample(tmp_path):
+    att_file = write_att(tmp_path / 'sw00000000000sat.fits')
+    with SwiftAttitude.open(att_file) as att:
+        decimated = att.decimate(10)
+        assert decimated.num_rows == 120
+        assert decimated.time[1] - decimated.time[0] == pytest.approx(5.0)
+        
+        resampled = att.resample(2.0)
+        assert resampled.num_rows == 300
+        assert resampled.headers['PRIMARY']['TSTART'] == att.time[0]
+        
+        # a regular cadence between the samples is interpolated
+        resampled = att.resample(0.3, tstart=att.time[0] + 0.1)
+        dt = resampled.time - 612353536.6006
+        angle = 0.5 * np.deg2rad(0.1) * dt
+        assert resampled.quaternion.z == pytest.approx(np.sin(angle))
+        
+        with pytest.raises(ValueError):
+            att.decimate(0)
+        with pytest.raises(ValueError):
+            att.resample(0.0)
+        with pytest.raises(ValueError):
+            att.quaternion_at(att.time[-1] + 1.0)
+
+
+def test_attitude_from_data():
+    time = np.array([1.0, 0.0, 1.0, 2.0])
+    quat = np.tile([0.0, 0.0, 0.0, 1.0], (4, 1))
+    att = SwiftAttitude.from_data(time, quat)
+    assert att.time.tolist() == [0.0, 1.0, 2.0]
+    assert att.headers['PRIMARY']['TSTOP'] == 2.0
+    
+    with pytest.raises(ValueError):
+        SwiftAttitude.from_data(time, quat[:3])
+    with pytest.raises(TypeError):
+        SwiftAttitude.from_data(time, quat, headers=SaoHeaders())
+
+
+def test_sao_with_attitude(sao_file, tmp_path):
+    att_file = write_att(tmp_path / 'sw00000000000sat.fits')
+    with SwiftSao.open(sao_file) as sao, SwiftAttitude.open(att_file) as att:
+        time = sao.column(1, 'TIME')
+        mask = time <= att.time[-1]
+        sao = SwiftSao.from_data(time[mask], sao.column(1, 'POSITION')[mask],
+                                 sao.column(1, 'VELOCITY')[mask],
+                                 sao.column(1, 'QUATERNION')[mask])
+        frame = sao.get_spacecraft_frame(attitude=att)
+        expected = sao.get_spacecraft_frame()
+        assert frame.shape == expected.shape
+        assert frame.quaternion.z == pytest.approx(expected.quaternion.z,
+                                                   abs=1e-6)
+
+
+def test_sao_with_partial_attitude(sao_file, tmp_path):
+    # the attitude only covers the middle of the SAO file
+    att_file = write_att(tmp_path / 'sw00000000000sat.fits', 
+                         tstart=612353536.6006 + 100.0, num_rows=600)
+    with SwiftSao.open(sao_file) as sao, SwiftAttitude.open(att_file) as att:
+        tmin, tmax = att.time_range()
+        frame = sao.get_spacecraft_frame(attitude=att)
+        expected = sao.get_spacecraft_frame()
+        time = sao.sao_column('TIME')
+        assert frame.shape == expected.shape
+        
+        # outside of the attitude coverage, the SAO quaternions are kept
+        outside = (time < tmin) | (time > tmax)
+        assert outside.sum() == 600 - 300
+        assert np.array_equal(frame.quaternion.z[outside], 
+                              expected.quaternion.z[outside])
+        assert frame.quaternion.z[~outside] == \
+               pytest.approx(att.quaternion_at(time[~outside]).z)
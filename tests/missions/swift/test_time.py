@@ -30,8 +30,9 @@
 #
 
 import pytest
+import numpy as np
 from pathlib import Path
-from gdt.missions.swift.time import Time
+from gdt.missions.swift.time import *
 
 
 @pytest.fixture
@@ -62,3 +63,53 @@ def test_convert_utc_to_met(trigger_times):
     for trigger in trigger_times:
         t = Time(trigger['iso'], format='iso', scale='utc')
         assert t.swift == trigger['met']
+
+
+def test_met_to_datetime64(trigger_times):
+    met = np.array([trigger['met'] for trigger in trigger_times])
+    iso = np.array([trigger['iso'] for trigger in trigger_times], 
+                   dtype='datetime64[us]')
+    assert np.all(met_to_datetime64(met) == iso)
+    assert met_to_datetime64(met[0]) == iso[0]
+
+
+def test_utc_to_met(trigger_times):
+    met = np.array([trigger['met'] for trigger in trigger_times])
+    iso = [trigger['iso'] for trigger in trigger_times]
+    assert np.all(utc_to_met(iso) == met)
+    assert utc_to_met(iso[0]) == met[0]
+
+
+def test_met_to_unix():
+    # astropy spreads the leap second over the whole day for unix and jd, so
+    # compare a day either side of each leap second, and before the epoch
+    steps = np.array([157766400.0, 252460801.0, 362793602.0, 457401603.0,
+                      504921604.0])
+    met = np.concatenate(([-1.0e8, 0.0, 7.0e8], steps - 86401.5, 
+                          steps + 86400.25))
+    t = Time(met, format='swift')
+    assert met_to_unix(met) == pytest.approx(t.utc.unix, abs=1e-6, rel=0.0)
+    assert met_to_utc_jd(met) == pytest.approx(t.utc.jd, abs=1e-9, rel=0.0)
+
+
+def test_leap_seconds():
+    # the seconds either side of each leap second
+    steps = np.array([157766400.0, 252460801.0, 362793602.0, 457401603.0,
+                      504921604.0])
+    met = np.concatenate((steps - 1.5, steps + 1.25))
+    iso = Time(met, format='swift').utc.isot
+    assert np.all(met_to_datetime64(met) == iso.astype('datetime64[us]'))
+    assert utc_to_met(iso) == pytest.approx(met, abs=1e-6, rel=0.0)
+
+
+def test_met_to_iso():
+    rng = np.random.default_rng(0)
+    # include values exactly half way between milliseconds
+    met = np.concatenate((rng.uniform(-1.0e8, 1.0e9, 1000), 
+                          np.round(rng.uniform(0.0, 1.0e9, 1000), 3) + 0.0005,
+                          [0.0, 612353536.6006]))
+    t = Time(met, format='swift')
+    assert np.all(met_to_iso(met) == t.iso)
+    assert met_to_iso(met[-1]) == t[-1].iso
+    assert met_to_iso(met[:10], precision=0).tolist() == \
+           Time(met[:10], format='swift', precision=0).iso.tolist()